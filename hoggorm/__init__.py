@@ -17,3 +17,5 @@ from .pca import nipalsPCA
 from .pcr import nipalsPCR
 from .plsr1 import nipalsPLS1
 from .plsr2 import nipalsPLS2
+from .parallel import (executionContext, setExecutionContext, getExecutionContext)
+from .predictor import Predictor
@@ -0,0 +1,2085 @@
+# -*- coding: utf-8 -*-
+"""
+Numerical engines used by the model classes in hoggorm.
+
+Each engine takes an already pre-processed (centred or standardised) array
+and returns the arrays a model is built from. The exact PCA engines return
+the same scores and loadings as the NIPALS algorithm (up to floating point
+error), including the sign of each component, such that they can be used
+interchangeably. The randomized engine only approximates them.
+"""
+
+# Import necessary modules
+import warnings
+import numpy as np
+import numpy.linalg as npla
+
+
+PCA_ALGORITHMS = ["nipals", "svd", "eig", "randomized", "gram", "auto"]
+
+PCA_CV_ENGINES = ["refit", "downdate"]
+PCR_CV_ENGINES = PCA_CV_ENGINES + ["hatLOO"]
+
+# With algorithm "auto" the Gram engine is used when there are at least this
+# many times more variables than objects.
+GRAM_RATIO = 5
+
+# Default maximum number of NIPALS iterations per component
+NIPALS_MAX_ITER = 5000
+
+# Number of rows deflated at a time by deflate, which bounds its work array
+DEFLATE_BLOCK = 256
+
+# How the NIPALS engines represent the residuals, see Residuals
+DEFLATION_MODES = ["explicit", "implicit"]
+
+
+def workArray(arrX):
+    """
+    Returns a floating point copy of ``arrX`` that an engine may deflate in
+    place. Single precision input stays single precision.
+    """
+    return np.array(arrX, dtype=np.result_type(arrX.dtype, np.float32))
+
+
+def deflate(arrX, t, p, scale=None, block=DEFLATE_BLOCK):
+    """
+    Subtracts the rank one array ``t p'`` (times ``scale``) from ``arrX`` in
+    place. The outer product is formed for ``block`` rows at a time, such
+    that no array of the size of ``arrX`` is allocated. The result is the
+    same as ``arrX - scale * np.dot(t, np.transpose(p))``.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Array of shape (n, p) that is deflated.
+
+    t : numpy array
+        Scores of shape (n, 1).
+
+    p : numpy array
+        Loadings of shape (p, 1).
+
+    scale : numpy array or float, optional
+        Factor the outer product is multiplied with.
+
+    block : int, optional
+        Number of rows processed at a time.
+    """
+    numObj = np.shape(arrX)[0]
+    pT = np.transpose(p)
+    work = np.empty((min(block, numObj), np.shape(arrX)[1]), dtype=np.result_type(t, p))
+    for first in range(0, numObj, block):
+        rows = slice(first, min(first + block, numObj))
+        outer = work[:rows.stop - rows.start]
+        np.multiply(t[rows], pT, out=outer)
+        if scale is not None:
+            np.multiply(scale, outer, out=outer)
+        np.subtract(arrX[rows], outer, out=arrX[rows])
+
+
+class Residuals:
+    """
+    Residuals E = X - TP' of data X after removing the components found so
+    far, as used by the NIPALS engines.
+
+    With ``implicit = False`` the residuals are a working copy of X that is
+    deflated in place after each component. With ``implicit = True`` only X
+    itself and the scores and loadings are kept, and products with the
+    residuals are computed as Ev = Xv - T(P'v) and E'u = X'u - P(T'u). No
+    array of the size of X is then allocated, at the cost of one extra
+    product with the (thin) scores and loadings per iteration.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed data. Not modified.
+
+    numComp : int
+        Maximum number of components that are removed.
+
+    implicit : boolean, optional
+        Whether the residuals are represented implicitly (default False).
+    """
+
+    def __init__(self, arrX, numComp, implicit=False):
+        self.implicit = implicit
+        self.numComp = 0
+        if implicit:
+            self.arr = np.asarray(arrX, dtype=np.result_type(arrX.dtype, np.float32))
+            numObj, numVar = np.shape(self.arr)
+            self.arrT = np.empty((numObj, numComp), dtype=self.arr.dtype, order='F')
+            self.arrP = np.empty((numVar, numComp), dtype=self.arr.dtype, order='F')
+            self.arrXtT = np.empty((numVar, numComp), dtype=self.arr.dtype, order='F')
+            self.colSS = None
+        else:
+            self.arr = workArray(arrX)
+        self.dtype = self.arr.dtype
+        self.shape = np.shape(self.arr)
+
+    def _components(self):
+        return self.arrT[:, :self.numComp], self.arrP[:, :self.numComp]
+
+    def dot(self, v, out=None):
+        """
+        Returns the product Ev.
+        """
+        out = np.dot(self.arr, v, out=out)
+        if self.implicit and self.numComp > 0:
+            T, P = self._components()
+            out -= np.dot(T, np.dot(np.transpose(P), v))
+        return out
+
+    def tdot(self, u, out=None):
+        """
+        Returns the product E'u.
+        """
+        out = np.dot(np.transpose(self.arr), u, out=out)
+        if self.implicit and self.numComp > 0:
+            T, P = self._components()
+            out -= np.dot(P, np.dot(np.transpose(T), u))
+        return out
+
+    def column(self, col):
+        """
+        Returns column ``col`` of E.
+        """
+        if self.implicit and self.numComp > 0:
+            T, P = self._components()
+            return self.arr[:, col] - np.dot(T, P[col])
+        return self.arr[:, col]
+
+    def columnSumSq(self):
+        """
+        Returns the sums of squares of the columns of E.
+        """
+        if not self.implicit:
+            return np.sum(np.square(self.arr), axis=0)
+
+        # diag(E'E) = diag(X'X) - 2 diag(X'TP') + diag(PT'TP')
+        if self.colSS is None:
+            self.colSS = np.sum(np.square(self.arr), axis=0)
+        if self.numComp == 0:
+            return self.colSS
+        T, P = self._components()
+        XtT = self.arrXtT[:, :self.numComp]
+        return self.colSS - 2 * np.sum(P * XtT, axis=1) + \
+            np.sum(np.dot(P, np.dot(np.transpose(T), T)) * P, axis=1)
+
+    def deflate(self, t, p, scale=None):
+        """
+        Removes the component ``t p'`` (times ``scale``) from E.
+        """
+        if not self.implicit:
+            deflate(self.arr, t, p, scale)
+            return
+
+        assert self.numComp < np.shape(self.arrT)[1], ValueError('more components removed than allocated')
+        self.arrT[:, self.numComp] = t[:, 0]
+        self.arrP[:, self.numComp] = p[:, 0] if scale is None else (scale * p)[:, 0]
+        self.arrXtT[:, self.numComp] = np.dot(np.transpose(self.arr), t)[:, 0]
+        self.numComp += 1
+
+
+def cumulativeFits(arrT, arrL):
+    """
+    Yields the approximations T_a L_a' for a = 1, 2, ..., numComp. Each is
+    obtained by adding one rank one term to the previous one, such that the
+    cost grows linearly with the number of components. The same array is
+    updated in place and yielded each time, so copy it to keep it.
+
+    PARAMETERS
+    ----------
+    arrT : numpy array
+        Scores of shape (n, numComp).
+
+    arrL : numpy array
+        Loadings of shape (p, numComp).
+    """
+    fit = np.zeros((np.shape(arrT)[0], np.shape(arrL)[0]), dtype=np.result_type(arrT, arrL))
+    for ind in range(np.shape(arrT)[1]):
+        # Subtracting minus the outer product adds it in place
+        deflate(fit, arrT[:, ind:ind+1], arrL[:, ind:ind+1], scale=-1.0)
+        yield fit
+
+
+def corrLoadings(arrT, arr):
+    """
+    Returns the correlation between each column of the scores ``arrT`` and
+    each variable of ``arr``, as a p x numComp array. All correlations are
+    obtained from one product of the centred scores, scaled to unit length,
+    with ``arr``, after which each variable is divided by its length about
+    the mean. Variables without variance get NaN.
+
+    PARAMETERS
+    ----------
+    arrT : numpy array
+        Scores of shape (n, numComp).
+
+    arr : numpy array
+        Data of shape (n, p). Centred data, as held by the models, avoids
+        loss of precision when the means are large compared to the spread.
+    """
+    arrT = arrT - np.average(arrT, axis=0)
+    arrT = arrT / np.sqrt(np.sum(np.square(arrT), axis=0))
+
+    # The centred scores sum to zero, so the product is the same with and
+    # without centring arr, and no centred copy of arr is needed.
+    arrCorr = np.dot(np.transpose(arr), arrT)
+    varLength = np.sqrt(np.shape(arr)[0]) * np.std(arr, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        arrCorr /= varLength[:, np.newaxis]
+    arrCorr[varLength == 0] = np.nan
+    return arrCorr
+
+
+def alignSigns(arrX, arrT, arrP):
+    """
+    Flips the sign of components such that they match the sign NIPALS
+    would have produced.
+
+    NIPALS PCA starts each component from the first column of the residual
+    array and the power iterations never change the sign of the projection
+    onto that start vector. The converged score vector therefore always has
+    a positive inner product with the first column of ``arrX``. If the first
+    column holds only zeros, NIPALS starts from a centred index vector
+    instead and the same rule applies to that vector.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        The pre-processed array that was decomposed.
+
+    arrT : numpy array
+        Scores, one column per component.
+
+    arrP : numpy array
+        Loadings, one column per component.
+
+    RETURNS
+    -------
+    tuple
+        Scores and loadings with aligned signs.
+    """
+    if np.any(arrX[:, 0]):
+        ref = arrX[:, 0]
+    else:
+        ref_nonCent = np.arange(np.shape(arrX)[0])
+        ref = ref_nonCent - np.mean(ref_nonCent)
+
+    signs = np.sign(np.dot(ref, arrT))
+    signs[signs == 0] = 1
+
+    return arrT * signs, arrP * signs
+
+
+def pcaNipals(arrX, numComp, startLoadings=None, tol=None, max_iter=NIPALS_MAX_ITER, start="first",
+              extrapolation=None, reorthogonalise=0, deflation="explicit"):
+    """
+    Computes scores and loadings one component at a time with the NIPALS
+    algorithm, deflating ``arrX`` after each component.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed data.
+
+    numComp : int
+        Number of components to compute.
+
+    startLoadings : numpy array, optional
+        Loadings of a model of similar data, for example of all objects
+        when ``arrX`` is a cross validation training set. The iteration of
+        each component then starts from the best approximation of the
+        component within the span of these loadings (Rayleigh-Ritz). This
+        saves some iterations compared to starting from the first column,
+        about a third on the cheese data of the tests, as the rate of
+        convergence is unchanged. Signs are the same as without starting
+        loadings.
+
+    tol : float, optional
+        Relative tolerance. The iteration stops when the change of the score
+        vector is smaller than ``tol`` times its norm. By default the
+        iteration stops when the sum of squared changes is below 1e-8, which
+        depends on the scale of the data.
+
+    max_iter : int, optional
+        Maximum number of iterations per component (default 5000). A
+        RuntimeWarning is issued for each component that has not converged
+        by then.
+
+    start : str, optional
+        Starting score vector: ``"first"`` column of the residuals (default)
+        or the column with ``"maxVariance"``. Signs are the same for both.
+
+    extrapolation : str, optional
+        Accelerates the sequence of score vectors with ``"aitken"``
+        (geometric extrapolation from three successive iterates) or
+        ``"anderson"`` (Anderson mixing of the last five iterates). The
+        convergence test is always made on a plain NIPALS step.
+
+    reorthogonalise : int, optional
+        If positive, the loading is orthogonalised against the loadings of
+        earlier components every this many iterations and after convergence.
+        This keeps the components orthogonal when a loose tolerance leaves
+        some of the earlier components in the residuals.
+
+    deflation : str, optional
+        ``"explicit"`` (default) deflates a working copy of ``arrX``.
+        ``"implicit"`` never forms the residuals and computes products with
+        them from ``arrX`` and the components found so far, see
+        :class:`Residuals`.
+
+    RETURNS
+    -------
+    tuple
+        Scores T and loadings P as numpy arrays.
+    """
+    assert start in ["first", "maxVariance"], ValueError('start must be "first" or "maxVariance"')
+    assert extrapolation in [None, "aitken", "anderson"], ValueError('extrapolation must be None, "aitken" or "anderson"')
+    assert max_iter > 0, ValueError('max_iter must be a positive integer')
+    assert deflation in DEFLATION_MODES, ValueError('deflation must be one of ' + str(DEFLATION_MODES))
+
+    threshold = 1.0e-8
+    X_new = Residuals(arrX, numComp, implicit=deflation == "implicit")
+
+    # Collect scores and loadings in lists that will be later converted
+    # to arrays.
+    scoresList = []
+    loadingsList = []
+
+    # Work buffers reused by all iterations: the loading, two score vectors
+    # (current and new) and the squared differences.
+    numObj, numVar = X_new.shape
+    num = np.empty((numVar, 1), dtype=X_new.dtype)
+    tBufs = (np.empty((numObj, 1), dtype=X_new.dtype), np.empty((numObj, 1), dtype=X_new.dtype))
+    diff = np.empty((numObj, 1), dtype=X_new.dtype)
+
+    # Projections of the residuals onto the starting loadings. They are
+    # updated after each deflation rather than recomputed.
+    if startLoadings is not None:
+        projStart = X_new.dot(startLoadings)
+
+    # Compute number of principal components as specified by user
+    for j in range(numComp):
+
+        # Check if first column contains only zeros. If yes, then
+        # NIPALS will not converge and (npla.norm(num) will contain
+        # nan's). Rather put in other starting values.
+        firstCol = X_new.column(0)
+        if not np.any(firstCol):
+            X_repl_nonCent = np.arange(numObj)
+            X_repl = X_repl_nonCent - np.mean(X_repl_nonCent)
+            t = X_repl.reshape(-1,1)
+
+        else:
+            t = firstCol.reshape(-1,1)
+
+        # The cold start vector is kept for choosing the sign after
+        # convergence if the iteration starts elsewhere.
+        t_cold = None
+        if start == "maxVariance":
+            col = np.argmax(X_new.columnSumSq())
+            if col != 0:
+                maxCol = X_new.column(col)
+                if np.any(maxCol):
+                    t_cold = t
+                    t = maxCol.reshape(-1,1)
+
+        # Warm start from the dominant direction of the projections onto
+        # the starting loadings.
+        if startLoadings is not None:
+            z = npla.svd(projStart, full_matrices=False)[2][0]
+            t_warm = np.dot(projStart, z).reshape(-1,1)
+            if np.any(t_warm):
+                if t_cold is None:
+                    t_cold = t
+                t = t_warm
+
+        if reorthogonalise > 0 and j > 0:
+            P_prev = np.hstack(loadingsList)
+
+        # Iterate until score vector converges according to threshold
+        runs = 0
+        history = []
+        t_plain = None
+        rqFloor = 0.0
+        while 1:
+            runs = runs + 1
+            X_new.tdot(t, out=num)
+            denom = npla.norm(num)
+
+            # An extrapolated score vector is only accepted if its Rayleigh
+            # quotient is at least that of the plain iterate it replaced.
+            # Otherwise extrapolation could lead to a later component.
+            if extrapolation is not None and t is not t_plain and \
+                    denom**2 < rqFloor * np.sum(np.square(t)):
+                t = t_plain
+                history = []
+                X_new.tdot(t, out=num)
+                denom = npla.norm(num)
+
+            p = np.divide(num, denom, out=num)
+            if reorthogonalise > 0 and j > 0 and runs % reorthogonalise == 0:
+                p = p - np.dot(P_prev, np.dot(np.transpose(P_prev), p))
+                p = p / npla.norm(p)
+
+            # The new scores go to the buffer not holding the current ones
+            t_new = tBufs[1] if t is tBufs[0] else tBufs[0]
+            X_new.dot(p, out=t_new)
+
+            np.subtract(t, t_new, out=diff)
+            t = t_new
+            SS = np.sum(np.square(diff, out=diff))
+
+            # Check whether sum of squares is smaller than threshold. Break
+            # out of loop if true and start computation of next component.
+            if tol is None:
+                converged = SS < threshold
+            else:
+                converged = SS <= tol**2 * np.sum(np.square(t))
+
+            if converged or runs >= max_iter:
+                if not converged:
+                    warnings.warn('NIPALS did not converge for component ' + str(j + 1) +
+                                  ' within ' + str(max_iter) + ' iterations', RuntimeWarning)
+                if reorthogonalise > 0 and j > 0:
+                    p = p - np.dot(P_prev, np.dot(np.transpose(P_prev), p))
+                    p = p / npla.norm(p)
+                    t = X_new.dot(p)
+                if t_cold is not None and np.dot(np.transpose(t_cold), t) < 0:
+                    t = -t
+                    p = -p
+                scoresList.append(t.copy())
+                loadingsList.append(p.copy())
+                break
+
+            if extrapolation is not None:
+                # |Xp|^2 bounds the Rayleigh quotient of t = Xp from below
+                t_plain = t
+                rqFloor = np.sum(np.square(t))
+                t, history = _extrapolate(t.copy(), history, extrapolation)
+
+        # Peel off information explained by actual component and continue with
+        # decomposition on the residuals (X_new = E).
+        X_new.deflate(t, p)
+
+        if startLoadings is not None:
+            projStart = projStart - np.dot(t, np.dot(np.transpose(p), startLoadings))
+
+    return np.hstack(scoresList), np.hstack(loadingsList)
+
+
+def _extrapolate(t, history, method, depth=5):
+    """
+    Extrapolates a sequence of NIPALS score vectors. ``t`` is the latest
+    iterate and ``history`` the state returned by the previous call.
+    Returns the next starting vector and the updated state.
+    """
+    if method == "aitken":
+        # Geometric extrapolation assuming the error shrinks by a constant
+        # ratio, using three successive plain iterates.
+        history = history + [t]
+        if len(history) < 3:
+            return t, history
+        d1 = history[1] - history[0]
+        d2 = history[2] - history[1]
+        d1d1 = np.sum(np.square(d1))
+        ratio = np.sum(d2 * d1) / d1d1 if d1d1 > 0 else 0.0
+        if 0 < ratio < 1:
+            t = history[2] + ratio / (1 - ratio) * d2
+        return t, []
+
+    # Anderson mixing: the plain iterates g_k = G(t_k) and residuals
+    # f_k = g_k - t_k of the last steps are combined such that the
+    # linearised residual is smallest.
+    iterates, residuals, t_prev = history if history else ([], [], None)
+    if t_prev is None:
+        return t, ([], [], t)
+    iterates = (iterates + [t])[-(depth+1):]
+    residuals = (residuals + [t - t_prev])[-(depth+1):]
+    if len(residuals) > 1:
+        dF = np.hstack([residuals[k+1] - residuals[k] for k in range(len(residuals)-1)])
+        dG = np.hstack([iterates[k+1] - iterates[k] for k in range(len(iterates)-1)])
+        gamma = npla.lstsq(dF, residuals[-1], rcond=None)[0]
+        t_next = t - np.dot(dG, gamma)
+        if np.all(np.isfinite(t_next)) and np.any(t_next):
+            t = t_next
+    return t, (iterates, residuals, t)
+
+
+def pcaSVD(arrX, numComp):
+    """
+    Computes scores and loadings from one singular value decomposition of
+    ``arrX``.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed data.
+
+    numComp : int
+        Number of components to compute.
+
+    RETURNS
+    -------
+    tuple
+        Scores T and loadings P as numpy arrays.
+    """
+    U, s, Vt = npla.svd(arrX, full_matrices=False)
+    arrT = U[:, 0:numComp] * s[0:numComp]
+    arrP = np.transpose(Vt[0:numComp, :])
+
+    return alignSigns(arrX, arrT, arrP)
+
+
+def pcaEig(arrX, numComp):
+    """
+    Computes loadings from the eigendecomposition of the cross-product
+    (covariance) array X'X and scores from one projection T = XP.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed data.
+
+    numComp : int
+        Number of components to compute.
+
+    RETURNS
+    -------
+    tuple
+        Scores T and loadings P as numpy arrays.
+    """
+    eigVals, eigVecs = npla.eigh(np.dot(np.transpose(arrX), arrX))
+
+    # eigh returns eigenvalues in ascending order
+    order = np.argsort(eigVals)[::-1][0:numComp]
+    arrP = eigVecs[:, order]
+    arrT = np.dot(arrX, arrP)
+
+    return alignSigns(arrX, arrT, arrP)
+
+
+def pcaRandomized(arrX, numComp, oversampling=10, powerIter=2, seed=None):
+    """
+    Computes scores and loadings with a randomized truncated singular value
+    decomposition (Halko, Martinsson & Tropp, 2011). The range of ``arrX``
+    is sampled with a Gaussian test array of ``numComp + oversampling``
+    columns and refined with ``powerIter`` power iterations. Only the small
+    projected array is decomposed exactly.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed data.
+
+    numComp : int
+        Number of components to compute.
+
+    oversampling : int, optional
+        Number of extra random directions sampled beyond ``numComp``.
+
+    powerIter : int, optional
+        Number of power iterations used to sharpen the sampled range.
+
+    seed : int, optional
+        Seed of the random number generator. Use the same seed for
+        reproducible results.
+
+    RETURNS
+    -------
+    tuple
+        Scores T and loadings P as numpy arrays.
+    """
+    numObj, numVar = np.shape(arrX)
+    k = min(numComp + oversampling, numObj, numVar)
+
+    rng = np.random.RandomState(seed)
+    Omega = rng.standard_normal((numVar, k))
+
+    # Sample the range of X and re-orthonormalise between the power
+    # iterations to avoid loss of precision in the small singular values.
+    Q, R = npla.qr(np.dot(arrX, Omega))
+    for i in range(powerIter):
+        Z, R = npla.qr(np.dot(np.transpose(arrX), Q))
+        Q, R = npla.qr(np.dot(arrX, Z))
+
+    # Exact SVD of the small k x numVar array
+    Ub, s, Vt = npla.svd(np.dot(np.transpose(Q), arrX), full_matrices=False)
+    arrT = np.dot(Q, Ub[:, 0:numComp]) * s[0:numComp]
+    arrP = np.transpose(Vt[0:numComp, :])
+
+    return alignSigns(arrX, arrT, arrP)
+
+
+def pcaGram(arrX, numComp):
+    """
+    Computes scores from the eigendecomposition of the Gram array XX' and
+    recovers the loadings with one multiplication P = X'U / s. Only the
+    numObj x numObj Gram array is decomposed, which makes this engine very
+    fast for short and wide data (few objects, many variables).
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed data.
+
+    numComp : int
+        Number of components to compute.
+
+    RETURNS
+    -------
+    tuple
+        Scores T and loadings P as numpy arrays.
+    """
+    eigVals, eigVecs = npla.eigh(np.dot(arrX, np.transpose(arrX)))
+
+    # eigh returns eigenvalues in ascending order. Eigenvalues are squared
+    # singular values and may come out slightly negative for a rank
+    # deficient array.
+    order = np.argsort(eigVals)[::-1][0:numComp]
+    singVals = np.sqrt(np.clip(eigVals[order], 0, None))
+    U = eigVecs[:, order]
+
+    arrT = U * singVals
+    scale = np.zeros(np.shape(singVals))
+    scale[singVals > 0] = 1 / singVals[singVals > 0]
+    arrP = np.dot(np.transpose(arrX), U * scale)
+
+    return alignSigns(arrX, arrT, arrP)
+
+
+def chooseAlgorithm(arrX):
+    """
+    Returns the PCA algorithm used for ``algorithm = "auto"``: the Gram
+    engine for short and wide data and NIPALS otherwise.
+    """
+    numObj, numVar = np.shape(arrX)
+    if numVar >= GRAM_RATIO * numObj:
+        return "gram"
+    else:
+        return "nipals"
+
+
+def fitPCA(arrX, numComp, algorithm="nipals", startLoadings=None, **kargs):
+    """
+    Computes PCA scores and loadings of pre-processed data with the
+    requested algorithm.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed data.
+
+    numComp : int
+        Number of components to compute.
+
+    algorithm : str, optional
+        One of ``"nipals"`` (default), ``"svd"``, ``"eig"``,
+        ``"randomized"``, ``"gram"`` or ``"auto"``.
+
+    startLoadings : numpy array, optional
+        Loadings to warm start NIPALS from, see :func:`pcaNipals`. Ignored
+        by the other algorithms.
+
+    kargs : optional
+        Settings passed on to the chosen engine, for example
+        ``oversampling``, ``powerIter`` and ``seed`` for the randomized
+        engine.
+
+    RETURNS
+    -------
+    tuple
+        Scores T and loadings P as numpy arrays.
+    """
+    assert algorithm in PCA_ALGORITHMS, ValueError('algorithm must be one of ' + str(PCA_ALGORITHMS))
+
+    if algorithm == "auto":
+        algorithm = chooseAlgorithm(arrX)
+
+    if algorithm == "svd":
+        return pcaSVD(arrX, numComp, **kargs)
+    elif algorithm == "eig":
+        return pcaEig(arrX, numComp, **kargs)
+    elif algorithm == "randomized":
+        return pcaRandomized(arrX, numComp, **kargs)
+    elif algorithm == "gram":
+        return pcaGram(arrX, numComp, **kargs)
+    else:
+        return pcaNipals(arrX, numComp, startLoadings=startLoadings, **kargs)
+
+
+class PCADowndate:
+    """
+    Computes PCA models of cross validation training sets from the Gram
+    array XX' of the full data, without copying or re-centring the training
+    sets.
+
+    XX' is computed once. For each segment the Gram array of the training
+    set is obtained by deleting the rows and columns of the held out
+    objects and centred with the training set means. Its eigendecomposition
+    gives the scores, and the loadings follow from a single product with X.
+    The results are the same as with the ``"gram"`` algorithm on the
+    training set.
+
+    The data are shifted by the overall column means first, since training
+    set means are then small and centring by downdating does not lose
+    precision.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        X data as provided by the user.
+
+    Xstand : boolean, optional
+        Whether the training sets are standardised. Since the scaling
+        differs between segments, the scaled Gram array of each training
+        set must then be computed from X, which costs more than deleting
+        rows and columns.
+    """
+
+    def __init__(self, arrX, Xstand=False):
+        self.Xstand = Xstand
+        self.Xshift = np.average(arrX, axis=0)
+        self.arrX0 = arrX - self.Xshift
+
+        self.colSums = np.sum(self.arrX0, axis=0)
+        self.colSumsSq = np.sum(np.square(self.arrX0), axis=0)
+        if not self.Xstand:
+            self.K = np.dot(self.arrX0, np.transpose(self.arrX0))
+
+
+    def fold(self, train_index, numComp):
+        """
+        Computes the PCA model of one training set.
+
+        PARAMETERS
+        ----------
+        train_index : numpy array
+            Boolean array that is True for objects in the training set.
+
+        numComp : int
+            Number of components to compute.
+
+        RETURNS
+        -------
+        tuple
+            Column means of X, column standard deviations of X (None if X
+            is not standardised), scores T and loadings P of the training
+            set.
+        """
+        test_index = np.logical_not(train_index)
+        X_test0 = self.arrX0[test_index]
+        numTrain = np.sum(train_index)
+
+        mx = (self.colSums - np.sum(X_test0, axis=0)) / numTrain
+
+        if self.Xstand:
+            xVar = (self.colSumsSq - np.sum(np.square(X_test0), axis=0) - numTrain * np.square(mx)) / (numTrain - 1)
+            xStd = np.sqrt(xVar)
+            X_train_scaled = self.arrX0[train_index] / xStd
+            K = np.dot(X_train_scaled, np.transpose(X_train_scaled))
+        else:
+            xStd = None
+            K = self.K[np.ix_(train_index, train_index)]
+
+        # Centre the Gram array of the training set
+        rowMeans = np.average(K, axis=1)
+        K = K - rowMeans.reshape(-1, 1) - rowMeans.reshape(1, -1) + np.average(rowMeans)
+
+        eigVals, eigVecs = npla.eigh(K)
+        order = np.argsort(eigVals)[::-1][0:numComp]
+        singVals = np.sqrt(np.clip(eigVals[order], 0, None))
+        U = eigVecs[:, order]
+        scale = np.zeros(np.shape(singVals))
+        scale[singVals > 0] = 1 / singVals[singVals > 0]
+
+        # Eigenvectors of the centred Gram array sum to zero, such that
+        # the centring of X drops out of the loadings P = X'U / s.
+        V = np.zeros((np.shape(self.arrX0)[0], numComp))
+        V[train_index, :] = U * scale
+        arrP = np.dot(np.transpose(self.arrX0), V)
+        if self.Xstand:
+            arrP = arrP / xStd.reshape(-1, 1)
+        arrT = U * singVals
+
+        # Only the first column of the pre-processed training set is needed
+        # to align the signs with NIPALS.
+        firstCol = self.arrX0[train_index, 0] - mx[0]
+        arrT, arrP = alignSigns(firstCol.reshape(-1, 1), arrT, arrP)
+
+        return mx + self.Xshift, xStd, arrT, arrP
+
+
+def _topEig(arrK, numComp):
+    """
+    Returns the ``numComp`` largest eigenvalues (clipped at zero) and the
+    corresponding eigenvectors of the symmetric array ``arrK``.
+    """
+    eigVals, eigVecs = npla.eigh(arrK)
+    order = np.argsort(eigVals)[::-1][0:numComp]
+    return np.clip(eigVals[order], 0, None), eigVecs[:, order]
+
+
+def _safeInverse(vals):
+    """
+    Returns 1 / vals with zero where vals is zero.
+    """
+    inv = np.zeros(np.shape(vals))
+    inv[vals > 0] = 1 / vals[vals > 0]
+    return inv
+
+
+def _signs(arrRef, arrVecs):
+    """
+    Returns the signs that make each column of ``arrVecs`` point in the same
+    direction as the corresponding column of ``arrRef``.
+    """
+    signs = np.sign(np.sum(arrRef * arrVecs, axis=0))
+    signs[signs == 0] = 1
+    return signs
+
+
+def pcaEKF(arrX, numComp):
+    """
+    Computes element-wise cross validated predictions of a PCA model with
+    the scheme of Eastment & Krzanowski (1982), one variable at a time.
+
+    For every object i the right singular vectors V(-i) and singular values
+    s(-i) of X without row i are computed, and for every variable j the left
+    singular vectors U(-j) and singular values s(-j) of X without column j.
+    Element x_ij is then predicted from decompositions that have never seen
+    it
+
+        xhat_ij = sum_a u(-j)_ia sqrt(s(-j)_a) v(-i)_ja sqrt(s(-i)_a)
+
+    Each decomposition is one eigendecomposition of the smaller of XX' and
+    X'X, obtained from the cross-product of the full data by deleting a row
+    and column or by subtracting a rank-one term. The sign of each component
+    is aligned with the decomposition of the full data.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed data.
+
+    numComp : int
+        Number of components.
+
+    YIELDS
+    ------
+    tuple
+        For each variable j in turn, the index j and the cross validated
+        predictions of column j of the pre-processed data as an array of
+        shape (numObj, numComp). Column ``a`` holds the predictions with
+        ``a + 1`` components. Only the factors of the decompositions without
+        each row are kept, such that no array of the predictions of all
+        elements is formed.
+    """
+    numObj, numVar = np.shape(arrX)
+    allObj = np.arange(numObj)
+    allVar = np.arange(numVar)
+
+    # Reference decomposition of the full data for aligning signs
+    U, s, Vt = npla.svd(arrX, full_matrices=False)
+    U_ref = U[:, 0:numComp]
+    V_ref = np.transpose(Vt[0:numComp, :])
+
+    # rowFactors[i] = V(-i) sqrt(s(-i)). The factors U(-j) sqrt(s(-j)) of
+    # each column are combined with them as soon as they are computed.
+    rowFactors = np.zeros((numObj, numVar, numComp))
+
+    if numObj <= numVar:
+        K = np.dot(arrX, np.transpose(arrX))
+
+        for i in range(numObj):
+            keep = allObj != i
+            vals, U_i = _topEig(K[np.ix_(keep, keep)], numComp)
+            V_i = np.dot(np.transpose(arrX[keep]), U_i) * _safeInverse(np.sqrt(vals))
+            V_i = V_i * _signs(V_ref, V_i)
+            rowFactors[i] = V_i * vals**0.25
+
+        for j in range(numVar):
+            vals, U_j = _topEig(K - np.outer(arrX[:, j], arrX[:, j]), numComp)
+            U_j = U_j * _signs(U_ref, U_j)
+            yield j, np.cumsum(rowFactors[:, j, :] * U_j * vals**0.25, axis=1)
+
+    else:
+        C = np.dot(np.transpose(arrX), arrX)
+
+        for i in range(numObj):
+            vals, V_i = _topEig(C - np.outer(arrX[i, :], arrX[i, :]), numComp)
+            V_i = V_i * _signs(V_ref, V_i)
+            rowFactors[i] = V_i * vals**0.25
+
+        for j in range(numVar):
+            keep = allVar != j
+            vals, V_j = _topEig(C[np.ix_(keep, keep)], numComp)
+            U_j = np.dot(arrX[:, keep], V_j) * _safeInverse(np.sqrt(vals))
+            U_j = U_j * _signs(U_ref, U_j)
+            yield j, np.cumsum(rowFactors[:, j, :] * U_j * vals**0.25, axis=1)
+
+
+def scoreLeverages(arrT):
+    """
+    Computes the leverages of a least squares regression with intercept on
+    the first 0, 1, 2, ... columns of the orthogonal score array ``arrT``.
+
+    Since the score vectors are orthogonal and centred, the leverage of
+    object i for A components is
+
+        h_i(A) = 1/n + sum_a t_ia^2 / (t_a't_a),   a = 1 ... A
+
+    PARAMETERS
+    ----------
+    arrT : numpy array
+        Scores, one column per component.
+
+    RETURNS
+    -------
+    numpy array
+        Array of shape (numComp + 1, numObj). Row ``A`` holds the leverages
+        with ``A`` components.
+    """
+    numObj = np.shape(arrT)[0]
+    contrib = np.square(arrT) / np.sum(np.square(arrT), axis=0)
+    leverages = np.zeros((np.shape(arrT)[1] + 1, numObj))
+    leverages[0, :] = 1 / numObj
+    leverages[1:, :] = 1 / numObj + np.cumsum(np.transpose(contrib), axis=0)
+
+    return leverages
+
+
+PLS1_ALGORITHMS = ["nipals", "kernel", "bidiag"]
+PLS1_CV_ENGINES = ["refit", "downdate"]
+
+
+def pls1Nipals(arrX, vecy, numComp, deflation="explicit"):
+    """
+    Computes a PLS1 model one component at a time with the NIPALS algorithm,
+    deflating both ``arrX`` and ``vecy`` after each component.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed X data.
+
+    vecy : numpy array
+        Pre-processed y data.
+
+    numComp : int
+        Number of components to compute.
+
+    deflation : str, optional
+        ``"explicit"`` (default) deflates a working copy of ``arrX``.
+        ``"implicit"`` never forms the X residuals, see :class:`Residuals`.
+
+    RETURNS
+    -------
+    tuple
+        X scores T, X loading weights W, X loadings P and y loadings Q as
+        numpy arrays. Q has shape (1, numComp).
+    """
+    assert deflation in DEFLATION_MODES, ValueError('deflation must be one of ' + str(DEFLATION_MODES))
+
+    X_new = Residuals(arrX, numComp, implicit=deflation == "implicit")
+    y_new = workArray(vecy.reshape(-1, 1))
+
+    x_scoresList = []
+    x_loadingsList = []
+    y_loadingsList = []
+    x_loadingWeightsList = []
+
+    # Compute j number of components
+    for j in range(numComp):
+
+        # Module 7: STEP 1
+        w_num = X_new.tdot(y_new)
+        w_denom = npla.norm(w_num)
+        w = w_num / w_denom
+
+        # Module 7: STEP 2
+        t = X_new.dot(w)
+
+        # Module 7: STEP 3
+        # NOTE: c_hat (in Module 7 paper) = q (here in code) ==> Yloadings
+        q_num = np.dot(np.transpose(t), y_new)
+        q_denom = np.dot(np.transpose(t), t)
+        q = q_num / q_denom
+
+        # Module 7: STEP 4
+        p_num = X_new.tdot(t)
+        p_denom = np.dot(np.transpose(t), t)
+        p = p_num / p_denom
+
+        # Module 7: STEP 5
+        X_new.deflate(t, p)
+        y_new -= t*q
+
+        # Collect vectors t, p, q and w
+        x_scoresList.append(t.reshape(-1))
+        x_loadingsList.append(p.reshape(-1))
+        y_loadingsList.append(q.reshape(-1))
+        x_loadingWeightsList.append(w.reshape(-1))
+
+    # Construct T, W, P and Q from lists of vectors
+    arrT = np.array(np.transpose(x_scoresList))
+    arrW = np.array(np.transpose(x_loadingWeightsList))
+    arrP = np.array(np.transpose(x_loadingsList))
+    arrQ = np.array(np.transpose(y_loadingsList))
+
+    return arrT, arrW, arrP, arrQ
+
+
+def pls1KernelCovariance(XtX, Xty, numComp):
+    """
+    Kernel PLS1 on the cross-products X'X and X'y of pre-processed data.
+    Only X'y is deflated. The weights R = W inv(P'W), which give the scores
+    of the undeflated X as T = XR, are built with the recursion
+    r_j = w_j - sum_i (p_i'w_j) r_i.
+
+    PARAMETERS
+    ----------
+    XtX : numpy array
+        Cross-product X'X.
+
+    Xty : numpy array
+        Cross-product X'y with shape (numVar, 1).
+
+    numComp : int
+        Number of components to compute.
+
+    RETURNS
+    -------
+    tuple
+        X loading weights W, weights R, X loadings P and y loadings Q as
+        numpy arrays. Q has shape (1, numComp).
+    """
+    numVar = np.shape(XtX)[0]
+
+    arrW = np.zeros((numVar, numComp))
+    arrR = np.zeros((numVar, numComp))
+    arrP = np.zeros((numVar, numComp))
+    arrQ = np.zeros((1, numComp))
+
+    for j in range(numComp):
+        w = Xty / npla.norm(Xty)
+
+        # r_j = w_j - sum_i (p_i'w_j) r_i, such that X_{j-1} w_j = X r_j
+        r = w - np.dot(arrR[:, 0:j], np.dot(np.transpose(arrP[:, 0:j]), w))
+        XtXr = np.dot(XtX, r)
+        tt = np.dot(np.transpose(r), XtXr)
+
+        p = XtXr / tt
+        q = np.dot(np.transpose(r), Xty) / tt
+        Xty = Xty - p * q * tt
+
+        arrW[:, j] = w[:, 0]
+        arrR[:, j] = r[:, 0]
+        arrP[:, j] = p[:, 0]
+        arrQ[0, j] = q[0, 0]
+
+    return arrW, arrR, arrP, arrQ
+
+
+def pls1KernelGram(K, y, numComp):
+    """
+    Kernel PLS1 on the Gram array K = XX' of pre-processed data. K is
+    deflated with the projector on each new score vector.
+
+    PARAMETERS
+    ----------
+    K : numpy array
+        Gram array XX'.
+
+    y : numpy array
+        Pre-processed y with shape (numObj, 1).
+
+    numComp : int
+        Number of components to compute.
+
+    RETURNS
+    -------
+    tuple
+        X scores T, the y residuals before each component (one column per
+        component) and y loadings Q as numpy arrays. The loading weights
+        and loadings follow from W ~ X'Yres and P = X'T / diag(T'T).
+    """
+    numObj = np.shape(K)[0]
+    y_new = y.copy()
+
+    arrT = np.zeros((numObj, numComp))
+    arrYres = np.zeros((numObj, numComp))
+    arrQ = np.zeros((1, numComp))
+
+    for j in range(numComp):
+        Ky = np.dot(K, y_new)
+        t = Ky / np.sqrt(np.dot(np.transpose(y_new), Ky))
+        tt = np.dot(np.transpose(t), t)
+        q = np.dot(np.transpose(t), y_new) / tt
+
+        # K <- (I - tt'/t't) K (I - tt'/t't)
+        Kt = np.dot(K, t) / tt
+        tKt = np.dot(np.transpose(t), Kt) / tt
+        K = K - np.dot(t, np.transpose(Kt)) - np.dot(Kt, np.transpose(t)) + tKt * np.dot(t, np.transpose(t))
+
+        arrYres[:, j] = y_new[:, 0]
+        y_new = y_new - t * q
+
+        arrT[:, j] = t[:, 0]
+        arrQ[0, j] = q[0, 0]
+
+    return arrT, arrYres, arrQ
+
+
+def pls1Kernel(arrX, vecy, numComp, form="auto"):
+    """
+    Computes a PLS1 model with the kernel algorithm of Dayal & MacGregor
+    (1997). X is never deflated. Instead the algorithm works on one of two
+    small cross-product arrays:
+
+    covariance : X'X (numVar x numVar) and X'y. Only X'y is deflated and
+        the weights are expressed directly in terms of the original X
+        through R = W inv(P'W), built with a recursion.
+
+    gram : XX' (numObj x numObj) and y. The Gram array is deflated with the
+        projector on each new score vector, which suits short and wide data.
+
+    Both forms return the same arrays as :func:`pls1Nipals` up to floating
+    point error.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed X data.
+
+    vecy : numpy array
+        Pre-processed y data.
+
+    numComp : int
+        Number of components to compute.
+
+    form : str, optional
+        ``"covariance"``, ``"gram"`` or ``"auto"`` (default). With ``"auto"``
+        the Gram form is used when X has fewer rows than columns.
+
+    RETURNS
+    -------
+    tuple
+        X scores T, X loading weights W, X loadings P and y loadings Q as
+        numpy arrays. Q has shape (1, numComp).
+    """
+    assert form in ["auto", "covariance", "gram"], ValueError('form must be "auto", "covariance" or "gram"')
+
+    numObj, numVar = np.shape(arrX)
+    y = vecy.reshape(-1, 1)
+    if form == "auto":
+        if numObj < numVar:
+            form = "gram"
+        else:
+            form = "covariance"
+
+    if form == "covariance":
+        XtX = np.dot(np.transpose(arrX), arrX)
+        Xty = np.dot(np.transpose(arrX), y)
+        arrW, arrR, arrP, arrQ = pls1KernelCovariance(XtX, Xty, numComp)
+        arrT = np.dot(arrX, arrR)
+
+    else:
+        K = np.dot(arrX, np.transpose(arrX))
+        arrT, arrYres, arrQ = pls1KernelGram(K, y, numComp)
+
+        # Since each y residual is orthogonal to the previous scores,
+        # X_{j-1}'y_{j-1} = X'y_{j-1} and X_{j-1}'t_j = X't_j.
+        arrW = np.dot(np.transpose(arrX), arrYres)
+        arrW = arrW / npla.norm(arrW, axis=0)
+        arrP = np.dot(np.transpose(arrX), arrT) / np.sum(np.square(arrT), axis=0)
+
+    return arrT, arrW, arrP, arrQ
+
+
+def pls1Bidiag(arrX, vecy, numComp):
+    """
+    Computes a PLS1 model by Golub-Kahan bidiagonalisation of X started from
+    X'y (Manne, 1987; Eldén, 2004). X is never deflated. Each component takes
+    exactly one product with X and one with X', giving
+
+        X W = T_b B
+
+    with orthonormal W and T_b and upper bidiagonal B holding ``rho`` on the
+    diagonal and ``theta`` above it. The weights and scores are
+    re-orthogonalised against the previous ones to keep them orthonormal in
+    floating point. The NIPALS quantities then follow directly:
+
+        t_a = rho_a t_b,a
+        p_a = w_a + (theta_a+1 / rho_a) w_a+1
+        q_a = t_b,a'y / rho_a
+
+    The returned arrays are the same as from :func:`pls1Nipals` up to
+    floating point error.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed X data.
+
+    vecy : numpy array
+        Pre-processed y data.
+
+    numComp : int
+        Number of components to compute.
+
+    RETURNS
+    -------
+    tuple
+        X scores T, X loading weights W, X loadings P and y loadings Q as
+        numpy arrays. Q has shape (1, numComp).
+    """
+    numObj, numVar = np.shape(arrX)
+    y = vecy.reshape(-1)
+
+    # One more weight vector than components is computed, since the last
+    # loading needs w_A+1.
+    W = np.zeros((numVar, numComp + 1))
+    T_b = np.zeros((numObj, numComp))
+    rho = np.zeros(numComp)
+    theta = np.zeros(numComp + 1)
+
+    w = np.dot(np.transpose(arrX), y)
+    W[:, 0] = w / npla.norm(w)
+
+    for a in range(numComp):
+
+        # rho_a t_a = X w_a - theta_a t_a-1
+        t = np.dot(arrX, W[:, a])
+        if a > 0:
+            t = t - theta[a] * T_b[:, a-1]
+        t = t - np.dot(T_b[:, 0:a], np.dot(np.transpose(T_b[:, 0:a]), t))
+        rho[a] = npla.norm(t)
+        T_b[:, a] = t / rho[a]
+
+        # theta_a+1 w_a+1 = X't_a - rho_a w_a. The sign of theta is chosen
+        # such that the weights have the same sign as in NIPALS.
+        w = np.dot(np.transpose(arrX), T_b[:, a]) - rho[a] * W[:, a]
+        w = w - np.dot(W[:, 0:a+1], np.dot(np.transpose(W[:, 0:a+1]), w))
+        theta[a+1] = -npla.norm(w)
+        if theta[a+1] != 0:
+            W[:, a+1] = w / theta[a+1]
+
+    arrW = W[:, 0:numComp]
+    arrT = T_b * rho
+    arrP = arrW + W[:, 1:] * (theta[1:] / rho)
+    arrQ = (np.dot(y, T_b) / rho).reshape(1, -1)
+
+    return arrT, arrW, arrP, arrQ
+
+
+def pls1Weights(arrW, arrP):
+    """
+    Computes the weights R = W inv(P'W) of a PLS1 model, which give the
+    scores of pre-processed X data as T = XR, without inverting P'W.
+
+    For PLS1, P'W is upper bidiagonal with unit diagonal, which gives the
+    recurrence
+
+        r_1 = w_1,   r_a = w_a - (p_a-1'w_a) r_a-1
+
+    PARAMETERS
+    ----------
+    arrW : numpy array
+        X loading weights.
+
+    arrP : numpy array
+        X loadings.
+
+    RETURNS
+    -------
+    numpy array
+        Weights R of the same shape as ``arrW``. The first ``a`` columns
+        are the weights of the model with ``a`` components.
+    """
+    arrR = np.zeros(np.shape(arrW))
+
+    r = np.zeros(np.shape(arrW)[0])
+    for a in range(np.shape(arrW)[1]):
+        if a == 0:
+            r = arrW[:, 0]
+        else:
+            r = arrW[:, a] - np.dot(arrP[:, a-1], arrW[:, a]) * r
+        arrR[:, a] = r
+
+    return arrR
+
+
+def pls1Coefficients(arrW, arrP, arrQ):
+    """
+    Computes the PLS1 regression coefficients B = W inv(P'W) Q' for every
+    number of components at once, without inverting P'W. The weights
+    r_a come from :func:`pls1Weights` and
+
+        b_a = b_a-1 + r_a q_a
+
+    PARAMETERS
+    ----------
+    arrW : numpy array
+        X loading weights.
+
+    arrP : numpy array
+        X loadings.
+
+    arrQ : numpy array
+        y loadings with shape (1, numComp).
+
+    RETURNS
+    -------
+    numpy array
+        Regression coefficients, one column for each number of components.
+        Column ``a - 1`` holds the coefficients of the model with ``a``
+        components.
+    """
+    arrR = pls1Weights(arrW, arrP)
+    numVar, numComp = np.shape(arrW)
+    arrB = np.zeros((numVar, numComp))
+
+    b = np.zeros(numVar)
+    for a in range(numComp):
+        b = b + arrR[:, a] * arrQ[0, a]
+        arrB[:, a] = b
+
+    return arrB
+
+
+def fitPLS1(arrX, vecy, numComp, algorithm="nipals", **kargs):
+    """
+    Computes a PLS1 model of pre-processed data with the requested
+    algorithm.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed X data.
+
+    vecy : numpy array
+        Pre-processed y data.
+
+    numComp : int
+        Number of components to compute.
+
+    algorithm : str, optional
+        One of ``"nipals"`` (default), ``"kernel"`` or ``"bidiag"``.
+
+    kargs : optional
+        Settings passed on to the chosen engine, for example ``form`` for
+        the kernel engine.
+
+    RETURNS
+    -------
+    tuple
+        X scores T, X loading weights W, X loadings P and y loadings Q as
+        numpy arrays.
+    """
+    assert algorithm in PLS1_ALGORITHMS, ValueError('algorithm must be one of ' + str(PLS1_ALGORITHMS))
+
+    if algorithm == "kernel":
+        return pls1Kernel(arrX, vecy, numComp, **kargs)
+    elif algorithm == "bidiag":
+        return pls1Bidiag(arrX, vecy, numComp, **kargs)
+    else:
+        return pls1Nipals(arrX, vecy, numComp, **kargs)
+
+
+PLS2_ALGORITHMS = ["nipals", "simpls"]
+
+
+def pls2Nipals(arrX, arrY, numComp, startLoadings=None, deflation="explicit"):
+    """
+    Computes a PLS2 model one component at a time with the NIPALS algorithm.
+    For each component the Y scores are iterated until convergence, after
+    which both ``arrX`` and ``arrY`` are deflated.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed X data.
+
+    arrY : numpy array
+        Pre-processed Y data.
+
+    numComp : int
+        Number of components to compute.
+
+    startLoadings : numpy array, optional
+        Normalised Y loadings Q of a model of similar data, for example of
+        all objects when the data are a cross validation training set. The
+        iteration of each component then starts from the best approximation
+        of the Y loading within the span of these loadings (Rayleigh-Ritz).
+        This saves some iterations compared to starting from the first
+        column of Y, about a third on the cheese data of the tests, as the
+        rate of convergence is unchanged. Signs are the same as without
+        starting loadings.
+
+    deflation : str, optional
+        ``"explicit"`` (default) deflates working copies of ``arrX`` and
+        ``arrY``. ``"implicit"`` never forms the residuals, see
+        :class:`Residuals`.
+
+    RETURNS
+    -------
+    tuple
+        X scores T, X loading weights W, X loadings P, Y scores U,
+        normalised Y loadings Q, Y loadings Q_alt = Y'T / T'T and the
+        diagonal array C of score regression coefficients.
+    """
+    assert deflation in DEFLATION_MODES, ValueError('deflation must be one of ' + str(DEFLATION_MODES))
+
+    threshold = 1.0e-12
+
+    X_new = Residuals(arrX, numComp, implicit=deflation == "implicit")
+    Y_new = Residuals(arrY, numComp, implicit=deflation == "implicit")
+
+    # Work buffers reused by all iterations: X loading weights, X scores,
+    # Y loadings, two Y score vectors (current and new) and the squared
+    # differences.
+    numObj, numVar = X_new.shape
+    numYVar = Y_new.shape[1]
+    dtype = np.result_type(X_new.dtype, Y_new.dtype)
+    w_num = np.empty((numVar, 1), dtype=dtype)
+    t = np.empty((numObj, 1), dtype=dtype)
+    q_num = np.empty((numYVar, 1), dtype=dtype)
+    uBufs = (np.empty((numObj, 1), dtype=dtype), np.empty((numObj, 1), dtype=dtype))
+    diff = np.empty((numObj, 1), dtype=dtype)
+
+    x_scoresList = []
+    y_scoresList = []
+    x_loadingsList = []
+    y_loadingsList = []
+    y_loadingsList_alt = []
+    x_loadingWeightsList = []
+    coeffList = []
+
+    # Orthonormal basis of the starting Y loadings and the cross-products
+    # X'YQ of the residuals with it. The converged Y loading is the dominant
+    # right singular vector of X'Y. The cross-products are updated after
+    # each deflation rather than recomputed.
+    if startLoadings is not None:
+        startBasis = npla.qr(startLoadings)[0]
+        crossStart = X_new.tdot(Y_new.dot(startBasis))
+
+    # Compute number of principal components as specified by user
+    for j in range(numComp):
+
+        # Module 8: STEP 1
+        firstCol = Y_new.column(0)
+        if not np.any(firstCol):
+            Y_repl_nonCent = np.arange(numObj)
+            Y_repl = Y_repl_nonCent - np.mean(Y_repl_nonCent)
+            u_new = Y_repl.reshape(-1,1)
+
+        else:
+            u_new = firstCol.copy().reshape(-1,1)
+
+        # Warm start from the dominant direction of the cross-products with
+        # the starting loadings. The cold start vector is kept for choosing
+        # the sign after convergence.
+        u_cold = None
+        if startLoadings is not None:
+            z = npla.svd(crossStart, full_matrices=False)[2][0]
+            u_warm = Y_new.dot(np.dot(startBasis, z)).reshape(-1,1)
+            if np.any(u_warm):
+                u_cold = u_new
+                u_new = u_warm
+
+        # Iterate until Y score vector converges according to threshold
+        runs = 0
+        while 1:
+            runs = runs + 1
+
+            # Module 8: STEP 2
+            X_new.tdot(u_new, out=w_num)
+            w_denom = npla.norm(w_num)
+            w = np.divide(w_num, w_denom, out=w_num)
+
+            # Module 8: STEP 3
+            X_new.dot(w, out=t)
+
+            # Module 8: STEP 4
+            Y_new.tdot(t, out=q_num)
+            q_denom = npla.norm(q_num)
+            q = q_num / q_denom
+            q_denom_alt = np.dot(np.transpose(t), t)
+            q_alt = q_num / q_denom_alt
+
+            # Module 8: STEP 5
+            # The new Y scores go to the buffer not holding the current ones
+            u_old = u_new
+            u_new = uBufs[1] if u_old is uBufs[0] else uBufs[0]
+            Y_new.dot(q, out=u_new)
+
+            # Module 8: STEP 6
+            # Stop iteration when difference smaller than threshold or 100
+            # iterations are reached.
+            np.subtract(u_old, u_new, out=diff)
+            SS = np.sum(np.square(diff, out=diff))
+            if SS <= threshold or runs == 100:
+                break
+
+        # Choose the sign that the iteration from the cold start gives. That
+        # iteration converges to the dominant eigenvector of YY'XX', with the
+        # sign of the cold start vector projected onto the left eigenvector,
+        # which is proportional to t.
+        if u_cold is not None and np.dot(np.transpose(u_cold), t) < 0:
+            w, t, q, q_alt, u_new = -w, -t, -q, -q_alt, -u_new
+
+        # Module 8: STEP 7
+        c_num = np.dot(np.transpose(t), u_new)
+        c_denom = np.dot(np.transpose(t), t)
+        c = c_num / c_denom
+
+        # Module 8: STEP 8
+        p_num = X_new.tdot(t)
+        p_denom = np.dot(np.transpose(t), t)
+        p = p_num / p_denom
+
+        # X'Y of the residuals changes by -p t'Y, since X't vanishes after
+        # deflation
+        if startLoadings is not None:
+            Y_basis = Y_new.dot(startBasis)
+
+        # Module 8: STEP 9
+        X_new.deflate(t, p)
+        Y_new.deflate(t, q, scale=c)
+
+        if startLoadings is not None:
+            crossStart = crossStart - np.dot(p, np.dot(np.transpose(t), Y_basis))
+
+        # Collect vectors t, p, u, q, w and scalar c. Copies are stored,
+        # since the work buffers are overwritten by the next component.
+        x_scoresList.append(t.reshape(-1).copy())
+        x_loadingsList.append(p.reshape(-1))
+        y_scoresList.append(u_new.reshape(-1).copy())
+        y_loadingsList.append(q.reshape(-1))
+        y_loadingsList_alt.append(q_alt.reshape(-1))
+        x_loadingWeightsList.append(w.reshape(-1).copy())
+        coeffList.append(c.reshape(-1))
+
+    # Construct T, W, P, U, Q and C from lists of vectors
+    arrT = np.array(np.transpose(x_scoresList))
+    arrW = np.array(np.transpose(x_loadingWeightsList))
+    arrP = np.array(np.transpose(x_loadingsList))
+    arrU = np.array(np.transpose(y_scoresList))
+    arrQ = np.array(np.transpose(y_loadingsList))
+    arrQ_alt = np.array(np.transpose(y_loadingsList_alt))
+    arrC = np.eye(numComp) * np.array(np.transpose(coeffList))
+
+    return arrT, arrW, arrP, arrU, arrQ, arrQ_alt, arrC
+
+
+def pls2Simpls(arrX, arrY, numComp):
+    """
+    Computes a PLS2 model with the SIMPLS algorithm (de Jong, 1993). X is
+    not deflated. Each component takes one dominant eigenvector of the
+    small array S'S (or SS', whichever is smaller), where S = X'Y is the
+    cross-covariance. S is then deflated by projecting out the new X
+    loading. Y is deflated only to form the Y scores U and their signs,
+    it does not enter the weights.
+
+    The SIMPLS results are expressed as the NIPALS quantities of hoggorm.
+    The loading weights W are the orthonormalised SIMPLS weights, which
+    gives X_{a-1} w_a = t_a for the deflated X. Scores, loadings, Y scores,
+    Y loadings and C are scaled and signed as in :func:`pls2Nipals`. With a
+    single response the model is the same as NIPALS up to floating point
+    error. With several responses the first component is also the same,
+    while later components differ slightly, because SIMPLS maximises
+    covariance with the original rather than the deflated Y.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed X data.
+
+    arrY : numpy array
+        Pre-processed Y data.
+
+    numComp : int
+        Number of components to compute.
+
+    RETURNS
+    -------
+    tuple
+        X scores T, X loading weights W, X loadings P, Y scores U,
+        normalised Y loadings Q, Y loadings Q_alt = Y'T / T'T and the
+        diagonal array C of score regression coefficients.
+    """
+    numObj, numVar = np.shape(arrX)
+    numYvar = np.shape(arrY)[1]
+
+    S = np.dot(np.transpose(arrX), arrY)
+    Y_new = arrY
+
+    arrT = np.zeros((numObj, numComp))
+    arrW = np.zeros((numVar, numComp))
+    arrP = np.zeros((numVar, numComp))
+    arrU = np.zeros((numObj, numComp))
+    arrQ = np.zeros((numYvar, numComp))
+    arrQ_alt = np.zeros((numYvar, numComp))
+    coeffs = np.zeros(numComp)
+
+    # Orthonormal basis of the X loadings, used to deflate S
+    arrV = np.zeros((numVar, numComp))
+
+    for j in range(numComp):
+
+        # SIMPLS weight vector r is the dominant left singular vector of S
+        if numYvar <= numVar:
+            eigVals, eigVecs = npla.eigh(np.dot(np.transpose(S), S))
+            r = np.dot(S, eigVecs[:, -1])
+        else:
+            eigVals, eigVecs = npla.eigh(np.dot(S, np.transpose(S)))
+            r = eigVecs[:, -1]
+
+        t_s = np.dot(arrX, r)
+        t_s = t_s / npla.norm(t_s)
+        p_s = np.dot(np.transpose(arrX), t_s)
+
+        # NIPALS loading weight, score and loading
+        w = r - np.dot(arrW[:, 0:j], np.dot(np.transpose(arrW[:, 0:j]), r))
+        w = w / npla.norm(w)
+        k = np.dot(p_s, w)
+        t = t_s * k
+        p = p_s / k
+
+        q_num = np.dot(np.transpose(Y_new), t)
+        q = q_num / npla.norm(q_num)
+
+        # NIPALS starts iterating from the first column of the deflated Y
+        # (or a centred index vector if that column holds only zeros) and
+        # keeps the sign of the projection onto that start vector.
+        if np.any(Y_new[:, 0]):
+            sign = np.sign(q[0])
+        else:
+            Y_repl_nonCent = np.arange(numObj)
+            Y_repl = Y_repl_nonCent - np.mean(Y_repl_nonCent)
+            sign = np.sign(np.dot(Y_repl, np.dot(Y_new, q)))
+        if sign == 0:
+            sign = 1
+
+        w = w * sign
+        t = t * sign
+        p = p * sign
+        q = q * sign
+        u = np.dot(Y_new, q)
+        tt = np.dot(t, t)
+        q_alt = np.dot(np.transpose(Y_new), t) / tt
+
+        arrT[:, j] = t
+        arrW[:, j] = w
+        arrP[:, j] = p
+        arrU[:, j] = u
+        arrQ[:, j] = q
+        arrQ_alt[:, j] = q_alt
+        coeffs[j] = np.dot(t, u) / tt
+
+        # Deflate the cross-covariance and keep track of the Y residuals
+        # needed for the Y scores.
+        v = p_s - np.dot(arrV[:, 0:j], np.dot(np.transpose(arrV[:, 0:j]), p_s))
+        v = v / npla.norm(v)
+        arrV[:, j] = v
+        S = S - np.outer(v, np.dot(v, S))
+        Y_new = Y_new - np.outer(t, q_alt)
+
+    return arrT, arrW, arrP, arrU, arrQ, arrQ_alt, np.diag(coeffs)
+
+
+def fitPLS2(arrX, arrY, numComp, algorithm="nipals", startLoadings=None, **kargs):
+    """
+    Computes a PLS2 model of pre-processed data with the requested
+    algorithm.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        Pre-processed X data.
+
+    arrY : numpy array
+        Pre-processed Y data.
+
+    numComp : int
+        Number of components to compute.
+
+    algorithm : str, optional
+        One of ``"nipals"`` (default) or ``"simpls"``.
+
+    startLoadings : numpy array, optional
+        Y loadings to warm start NIPALS from, see :func:`pls2Nipals`.
+        Ignored by SIMPLS.
+
+    kargs : optional
+        Settings passed on to the chosen engine.
+
+    RETURNS
+    -------
+    tuple
+        X scores T, X loading weights W, X loadings P, Y scores U,
+        normalised Y loadings Q, Y loadings Q_alt and the diagonal array C.
+    """
+    assert algorithm in PLS2_ALGORITHMS, ValueError('algorithm must be one of ' + str(PLS2_ALGORITHMS))
+
+    if algorithm == "simpls":
+        return pls2Simpls(arrX, arrY, numComp, **kargs)
+    else:
+        return pls2Nipals(arrX, arrY, numComp, startLoadings=startLoadings, **kargs)
+
+
+class PLS1Downdate:
+    """
+    Computes PLS1 models of cross validation training sets from cross-products
+    of the full data, without copying, re-centring or deflating the training
+    sets.
+
+    The cross-products X'X and X'y (or the Gram array XX'), the column sums
+    and the sums of squares are computed once. For each segment the centred
+    (and optionally standardised) cross-products of the training set are
+    obtained by subtracting the contribution of the held out objects. The
+    model of the training set is then computed with kernel PLS1, which
+    gives the same loading weights, loadings and y loadings as NIPALS on
+    the training set up to floating point error.
+
+    The data are shifted by the overall column means first, since training
+    set means are then small and centring by downdating does not lose
+    precision.
+
+    PARAMETERS
+    ----------
+    arrX : numpy array
+        X data as provided by the user.
+
+    vecy : numpy array
+        y data as provided by the user.
+
+    form : str, optional
+        ``"covariance"`` downdates X'X and X'y, ``"gram"`` takes the training
+        part of XX'. ``"auto"`` (default) uses the Gram form when there are
+        fewer objects than variables. With standardised X the Gram form
+        must compute the scaled Gram array of each training set, since the
+        scaling differs between segments.
+    """
+
+    def __init__(self, arrX, vecy, form="auto"):
+        assert form in ["auto", "covariance", "gram"], ValueError('form must be "auto", "covariance" or "gram"')
+
+        numObj, numVar = np.shape(arrX)
+        if form == "auto":
+            if numObj < numVar:
+                form = "gram"
+            else:
+                form = "covariance"
+        self.form = form
+
+        self.Xshift = np.average(arrX, axis=0)
+        self.yShift = np.average(vecy)
+        self.arrX0 = arrX - self.Xshift
+        self.y0 = np.reshape(vecy, -1) - self.yShift
+
+        self.colSums = np.sum(self.arrX0, axis=0)
+        self.colSumsSq = np.sum(np.square(self.arrX0), axis=0)
+        self.ySum = np.sum(self.y0)
+        self.ySumSq = np.dot(self.y0, self.y0)
+
+        if self.form == "covariance":
+            self.XtX = np.dot(np.transpose(self.arrX0), self.arrX0)
+            self.Xty = np.dot(np.transpose(self.arrX0), self.y0)
+        else:
+            self.K = np.dot(self.arrX0, np.transpose(self.arrX0))
+
+
+    def fold(self, train_index, numComp, Xstand=False, ystand=False):
+        """
+        Computes the PLS1 model of one training set.
+
+        PARAMETERS
+        ----------
+        train_index : numpy array
+            Boolean array that is True for objects in the training set.
+
+        numComp : int
+            Number of components to compute.
+
+        Xstand : boolean, optional
+            Whether X of the training set is standardised.
+
+        ystand : boolean, optional
+            Whether y of the training set is standardised.
+
+        RETURNS
+        -------
+        tuple
+            Column means of X, column standard deviations of X (None if X
+            is not standardised), mean of y, standard deviation of y (None
+            if y is not standardised), X loading weights W, X loadings P and
+            y loadings Q of the training set.
+        """
+        test_index = np.logical_not(train_index)
+        X_test0 = self.arrX0[test_index]
+        y_test0 = self.y0[test_index]
+        numTrain = np.sum(train_index)
+
+        # Means and standard deviations of the training set from downdated
+        # sums
+        mx = (self.colSums - np.sum(X_test0, axis=0)) / numTrain
+        my = (self.ySum - np.sum(y_test0)) / numTrain
+
+        if Xstand:
+            xVar = (self.colSumsSq - np.sum(np.square(X_test0), axis=0) - numTrain * np.square(mx)) / (numTrain - 1)
+            xStd = np.sqrt(xVar)
+        else:
+            xStd = None
+
+        if ystand:
+            yVar = (self.ySumSq - np.dot(y_test0, y_test0) - numTrain * my**2) / (numTrain - 1)
+            yStd = np.sqrt(yVar)
+            yScale = yStd
+        else:
+            yStd = None
+            yScale = 1
+
+        if self.form == "covariance":
+            XtX = self.XtX - np.dot(np.transpose(X_test0), X_test0) - numTrain * np.outer(mx, mx)
+            Xty = self.Xty - np.dot(np.transpose(X_test0), y_test0) - numTrain * mx * my
+            if Xstand:
+                XtX = XtX / np.outer(xStd, xStd)
+                Xty = Xty / xStd
+            Xty = Xty / yScale
+
+            arrW, arrR, arrP, arrQ = pls1KernelCovariance(XtX, Xty.reshape(-1, 1), numComp)
+
+        else:
+            if Xstand:
+                X_train_scaled = self.arrX0[train_index] / xStd
+                K = np.dot(X_train_scaled, np.transpose(X_train_scaled))
+            else:
+                K = self.K[np.ix_(train_index, train_index)]
+
+            # Centre the Gram array of the training set
+            rowMeans = np.average(K, axis=1)
+            K = K - rowMeans.reshape(-1, 1) - rowMeans.reshape(1, -1) + np.average(rowMeans)
+            y = ((self.y0[train_index] - my) / yScale).reshape(-1, 1)
+
+            arrT, arrYres, arrQ = pls1KernelGram(K, y, numComp)
+
+            # The y residuals and the scores sum to zero over the training
+            # set, such that the centring of X drops out of X'Yres and X'T.
+            # Both are computed with a single product with the full data.
+            V = np.zeros((np.shape(self.arrX0)[0], 2 * numComp))
+            V[train_index, 0:numComp] = arrYres
+            V[train_index, numComp:] = arrT
+            XtV = np.dot(np.transpose(self.arrX0), V)
+            if Xstand:
+                XtV = XtV / xStd.reshape(-1, 1)
+
+            arrW = XtV[:, 0:numComp] / npla.norm(XtV[:, 0:numComp], axis=0)
+            arrP = XtV[:, numComp:] / np.sum(np.square(arrT), axis=0)
+
+        return mx + self.Xshift, xStd, my + self.yShift, yStd, arrW, arrP, arrQ
+
+
+# ===============================================================================
+#         Models of cross validation segments
+# ===============================================================================
+# The functions below compute the model of one cross validation segment. They
+# are module level functions, such that hoggorm.parallel can run them in
+# worker processes.
+
+def pcaSegment(train_index, test_index, arrX, numComp, Xstand, algorithm, algorithmOptions, downdater=None,
+               startLoadings=None):
+    """
+    Computes the PCA model of the training set of one cross validation
+    segment.
+
+    PARAMETERS
+    ----------
+    train_index, test_index : numpy array
+        Boolean arrays defining training and test set.
+
+    arrX : numpy array
+        X data as provided by the user.
+
+    numComp : int
+        Number of components to compute.
+
+    Xstand : boolean
+        Whether X of the training set is standardised.
+
+    algorithm : str
+        PCA algorithm, see :func:`fitPCA`.
+
+    algorithmOptions : dict
+        Settings passed on to the PCA algorithm.
+
+    downdater : PCADowndate, optional
+        If provided, the model is computed from the downdated Gram array
+        instead of refitting the training set.
+
+    startLoadings : numpy array, optional
+        Loadings of the model of all objects used to warm start NIPALS, see
+        :func:`pcaNipals`.
+
+    RETURNS
+    -------
+    tuple
+        Column means of the training set with shape (1, numVar), column
+        standard deviations (None if X is not standardised), scores T and
+        loadings P.
+    """
+    if downdater is not None:
+        X_train_mean, X_train_std, valT, valP = downdater.fold(train_index, numComp)
+        X_train_mean = X_train_mean.reshape(1,-1)
+        if X_train_std is not None:
+            X_train_std = X_train_std.reshape(1,-1)
+        return X_train_mean, X_train_std, valT, valP
+
+    X_train = arrX[train_index]
+
+    # Center or standardise X according to users choice
+    if Xstand:
+        X_train_mean = np.average(X_train, axis=0).reshape(1,-1)
+        X_train_std = np.std(X_train, axis=0, ddof=1).reshape(1,-1)
+        X_train_proc = (X_train - X_train_mean) / X_train_std
+    else:
+        X_train_mean = np.average(X_train, axis=0).reshape(1,-1)
+        X_train_std = None
+        X_train_proc = X_train - X_train_mean
+
+    valT, valP = fitPCA(X_train_proc, numComp, algorithm, startLoadings=startLoadings, **algorithmOptions)
+
+    return X_train_mean, X_train_std, valT, valP
+
+
+def pls1Segment(train_index, test_index, arrX, vecy, numComp, Xstand, ystand, algorithm, algorithmOptions, downdater=None):
+    """
+    Computes the PLS1 model of the training set of one cross validation
+    segment.
+
+    PARAMETERS
+    ----------
+    train_index, test_index : numpy array
+        Boolean arrays defining training and test set.
+
+    arrX, vecy : numpy array
+        X and y data as provided by the user.
+
+    numComp : int
+        Number of components to compute.
+
+    Xstand, ystand : boolean
+        Whether X and y of the training set are standardised.
+
+    algorithm : str
+        PLS1 algorithm, see :func:`fitPLS1`.
+
+    algorithmOptions : dict
+        Settings passed on to the PLS1 algorithm.
+
+    downdater : PLS1Downdate, optional
+        If provided, the model is computed from downdated cross-products
+        instead of refitting the training set. Training scores are then not
+        computed and returned as None.
+
+    RETURNS
+    -------
+    tuple
+        Column means of X, column standard deviations of X (None if X is
+        not standardised), mean of y, standard deviation of y (None if y is
+        not standardised), X scores T, X loading weights W, X loadings P
+        and y loadings Q of the training set.
+    """
+    if downdater is not None:
+        x_train_means, x_train_std, y_train_means, y_train_std, val_arrW, val_arrP, val_arrQ = \
+            downdater.fold(train_index, numComp, Xstand, ystand)
+        return x_train_means, x_train_std, y_train_means, y_train_std, None, val_arrW, val_arrP, val_arrQ
+
+    x_train = arrX[train_index]
+    y_train = vecy[train_index]
+
+    # Standardise X if requested by user, otherwise center X.
+    x_train_means = np.average(x_train, axis=0)
+    if Xstand:
+        x_train_std = np.std(x_train, axis=0, ddof=1)
+        X_new = (x_train - x_train_means) / x_train_std
+    else:
+        x_train_std = None
+        X_new = x_train - x_train_means
+
+    # Standardise y if requested by user, otherwise center y.
+    y_train_means = np.average(y_train)
+    if ystand:
+        y_train_std = np.std(y_train, ddof=1)
+        y_new = (y_train - y_train_means) / y_train_std
+    else:
+        y_train_std = None
+        y_new = y_train - y_train_means
+
+    val_arrT, val_arrW, val_arrP, val_arrQ = fitPLS1(X_new, y_new, numComp, algorithm, **algorithmOptions)
+
+    return x_train_means, x_train_std, y_train_means, y_train_std, val_arrT, val_arrW, val_arrP, val_arrQ
+
+
+def pls2Segment(train_index, test_index, arrX, arrY, numComp, Xstand, Ystand, algorithm, algorithmOptions,
+                startLoadings=None):
+    """
+    Computes the PLS2 model of the training set of one cross validation
+    segment.
+
+    PARAMETERS
+    ----------
+    train_index, test_index : numpy array
+        Boolean arrays defining training and test set.
+
+    arrX, arrY : numpy array
+        X and Y data as provided by the user.
+
+    numComp : int
+        Number of components to compute.
+
+    Xstand, Ystand : boolean
+        Whether X and Y of the training set are standardised.
+
+    algorithm : str
+        PLS2 algorithm, see :func:`fitPLS2`.
+
+    algorithmOptions : dict
+        Settings passed on to the PLS2 algorithm.
+
+    startLoadings : numpy array, optional
+        Normalised Y loadings of the model of all objects used to warm start
+        NIPALS, see :func:`pls2Nipals`.
+
+    RETURNS
+    -------
+    tuple
+        Column means of X, column standard deviations of X (None if X is
+        not standardised), column means of Y, column standard deviations of
+        Y (None if Y is not standardised), followed by T, W, P, U, Q, Q_alt
+        and C of the training set as returned by :func:`fitPLS2`.
+    """
+    x_train = arrX[train_index]
+    y_train = arrY[train_index]
+
+    x_train_means = np.average(x_train, axis=0)
+    if Xstand:
+        x_train_std = np.std(x_train, axis=0, ddof=1)
+        X_new = (x_train - x_train_means) / x_train_std
+    else:
+        x_train_std = None
+        X_new = x_train - x_train_means
+
+    y_train_means = np.average(y_train, axis=0)
+    if Ystand:
+        y_train_std = np.std(y_train, axis=0, ddof=1)
+        Y_new = (y_train - y_train_means) / y_train_std
+    else:
+        y_train_std = None
+        Y_new = y_train - y_train_means
+
+    return (x_train_means, x_train_std, y_train_means, y_train_std) + \
+        fitPLS2(X_new, Y_new, numComp, algorithm, startLoadings=startLoadings, **algorithmOptions)
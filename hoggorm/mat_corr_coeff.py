@@ -3,6 +3,7 @@
 
 import numpy
 import hoggorm.statTools as st
+import hoggorm.parallel as parallel
 
 
 def RVcoeff(dataList):
@@ -295,6 +296,7 @@ class SMI:
         self.Scores2 = Scores2
 
 
+    @parallel.honourContext
     def significance(self, **kargs):
         """
         Significance estimation for Similarity of Matrices Index (SMI)
@@ -302,7 +304,8 @@ class SMI:
         For each combination of components significance is estimated by sampling from a null distribution
         of no similarity, i.e. when the rows of one matrix is permuted B times and corresponding SMI values are
         computed. If the vector replicates is included, replicates will be kept together through
-        permutations.
+        permutations. The permutations run with the BLAS thread limit of the
+        current execution context (see ``hoggorm.executionContext``).
         
         PARAMETERS
         ----------
@@ -0,0 +1,479 @@
+# -*- coding: utf-8 -*-
+"""
+Running the models of cross validation segments in parallel.
+
+The models of the segments are independent of each other. With ``n_jobs``
+larger than one they are computed by a pool of worker processes. The data
+and settings that are the same for all segments are sent to each worker only
+once, when the worker starts. After that only the boolean train and test
+index arrays of a segment are sent to the workers and only the segment
+models are sent back. Results are always returned in segment order, such
+that parallel and serial runs give identical results.
+
+Arrays in the shared data (also those held as attributes of objects such as
+the downdating engines) are not pickled to the workers. They are placed
+once in shared memory, or in a memory-mapped temporary file where shared
+memory is not available, and the workers attach read-only views to them.
+Memory use thus stays close to one copy of the data, no matter how many
+workers are running.
+
+The execution context splits a budget of cores between worker processes and
+the threads of the BLAS library (OpenBLAS, MKL or BLIS) used by numpy within
+each process, such that the two levels of parallelism do not oversubscribe
+the machine. The model classes and ``SMI.significance`` honour it.
+
+>>> import hoggorm as ho
+>>> with ho.executionContext(cores=8, n_jobs=4):
+...     model = ho.nipalsPCA(arrX=myData, cvType=["loo"])
+
+Thread limits are applied with threadpoolctl if it is installed. Otherwise
+the thread setters of the BLAS libraries loaded in the process are called
+directly and the corresponding environment variables are set for new
+worker processes.
+"""
+
+# Import necessary modules
+import os
+import copy
+import ctypes
+import tempfile
+import functools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+try:
+    import threadpoolctl
+except ImportError:
+    threadpoolctl = None
+
+
+# Function and settings used by the current worker process
+_workerState = {}
+
+# Current execution context, see setExecutionContext
+_context = {'n_jobs': None, 'blasThreads': None}
+
+# Environment variables read by BLAS libraries when they are loaded
+BLAS_ENV_VARS = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "BLIS_NUM_THREADS"]
+
+# Names of thread getters and setters in BLAS libraries, by library
+_BLAS_THREAD_FUNCS = {
+    "openblas": [("openblas_get_num_threads", "openblas_set_num_threads"),
+                 ("openblas_get_num_threads64_", "openblas_set_num_threads64_"),
+                 ("scipy_openblas_get_num_threads", "scipy_openblas_set_num_threads"),
+                 ("scipy_openblas_get_num_threads64_", "scipy_openblas_set_num_threads64_")],
+    "mkl": [("MKL_Get_Max_Threads", "MKL_Set_Num_Threads")],
+    "blis": [("bli_thread_get_num_threads", "bli_thread_set_num_threads")],
+}
+
+
+# ===============================================================================
+#         Execution context
+# ===============================================================================
+
+def setExecutionContext(cores=None, n_jobs=None, blasThreads=None):
+    """
+    Sets how many worker processes are used for cross validation and how
+    many BLAS threads each process may use.
+
+    PARAMETERS
+    ----------
+    cores : int, optional
+        Total number of cores to use. If given, the settings not provided
+        are derived from it: with neither ``n_jobs`` nor ``blasThreads``
+        each core runs one worker with one BLAS thread, with ``n_jobs`` the
+        cores are divided among the workers and with ``blasThreads`` the
+        number of workers is the number of cores divided by the number of
+        threads.
+
+    n_jobs : int, optional
+        Number of worker processes used by models that are created without
+        an explicit ``n_jobs``, see :func:`numWorkers`.
+
+    blasThreads : int, optional
+        Number of BLAS threads in each process. If not given, BLAS is not
+        limited in serial runs, while the CPUs are divided among the worker
+        processes in parallel runs.
+
+    RETURNS
+    -------
+    dict
+        The previous execution context.
+    """
+    assert cores is None or cores > 0, ValueError('cores must be a positive integer')
+    assert blasThreads is None or blasThreads > 0, ValueError('blasThreads must be a positive integer')
+
+    if cores is not None:
+        if n_jobs is None and blasThreads is None:
+            n_jobs, blasThreads = cores, 1
+        elif blasThreads is None:
+            blasThreads = max(1, cores // numWorkers(n_jobs))
+        elif n_jobs is None:
+            n_jobs = max(1, cores // blasThreads)
+        else:
+            assert numWorkers(n_jobs) * blasThreads <= cores, ValueError('n_jobs times blasThreads exceeds cores')
+    else:
+        numWorkers(n_jobs)
+
+    previous = dict(_context)
+    _context['n_jobs'] = n_jobs
+    _context['blasThreads'] = blasThreads
+    return previous
+
+
+def getExecutionContext():
+    """
+    Returns a dictionary holding the current execution context.
+    """
+    return dict(_context)
+
+
+@contextlib.contextmanager
+def executionContext(cores=None, n_jobs=None, blasThreads=None):
+    """
+    Context manager setting the execution context for the code in its body,
+    see :func:`setExecutionContext` for the parameters. The previous context
+    is restored on exit.
+    """
+    previous = setExecutionContext(cores, n_jobs, blasThreads)
+    try:
+        yield getExecutionContext()
+    finally:
+        _context.update(previous)
+
+
+def resolveJobs(n_jobs):
+    """
+    Returns ``n_jobs`` if given, otherwise the number of workers of the
+    current execution context.
+    """
+    if n_jobs is None:
+        return _context['n_jobs']
+    return n_jobs
+
+
+def workerBlasThreads(workers):
+    """
+    Returns the number of BLAS threads for each of ``workers`` processes.
+    """
+    if _context['blasThreads'] is not None:
+        return _context['blasThreads']
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+# ===============================================================================
+#         BLAS thread limits
+# ===============================================================================
+
+_blasLibraries = None
+
+
+def _loadedBlasLibraries():
+    """
+    Returns (getter, setter) pairs of the BLAS libraries loaded in the
+    current process. The libraries are found from the memory map of the
+    process, which is only available on Linux.
+    """
+    global _blasLibraries
+    if _blasLibraries is not None:
+        return _blasLibraries
+
+    _blasLibraries = []
+    try:
+        with open('/proc/self/maps') as mapsFile:
+            paths = set(line.split()[-1] for line in mapsFile if '.so' in line)
+    except (IOError, OSError):
+        return _blasLibraries
+
+    for path in sorted(paths):
+        name = os.path.basename(path).lower()
+        for lib, funcs in _BLAS_THREAD_FUNCS.items():
+            if lib not in name:
+                continue
+            try:
+                cdll = ctypes.CDLL(path)
+            except OSError:
+                continue
+            for getName, setName in funcs:
+                if hasattr(cdll, getName) and hasattr(cdll, setName):
+                    _blasLibraries.append((getattr(cdll, getName), getattr(cdll, setName)))
+                    break
+    return _blasLibraries
+
+
+@contextlib.contextmanager
+def blasLimits(threads):
+    """
+    Context manager limiting the BLAS libraries of the current process to
+    ``threads`` threads. Does nothing if ``threads`` is None.
+    """
+    if threads is None:
+        yield
+        return
+
+    if threadpoolctl is not None:
+        with threadpoolctl.threadpool_limits(limits=threads, user_api='blas'):
+            yield
+        return
+
+    libraries = _loadedBlasLibraries()
+    previous = [getter() for getter, setter in libraries]
+    for getter, setter in libraries:
+        setter(threads)
+    try:
+        yield
+    finally:
+        for (getter, setter), num in zip(libraries, previous):
+            setter(num)
+
+
+@contextlib.contextmanager
+def _blasEnvironment(threads):
+    """
+    Sets the BLAS environment variables to ``threads``, such that BLAS
+    libraries loaded by new processes use that many threads.
+    """
+    previous = dict((var, os.environ.get(var)) for var in BLAS_ENV_VARS)
+    for var in BLAS_ENV_VARS:
+        os.environ[var] = str(threads)
+    try:
+        yield
+    finally:
+        for var, value in previous.items():
+            if value is None:
+                del os.environ[var]
+            else:
+                os.environ[var] = value
+
+
+def honourContext(method):
+    """
+    Decorator running ``method`` with the BLAS thread limit of the execution
+    context that is current when it is called.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kargs):
+        with blasLimits(_context['blasThreads']):
+            return method(*args, **kargs)
+    return wrapper
+
+
+def numWorkers(n_jobs):
+    """
+    Returns the number of worker processes requested by ``n_jobs``.
+
+    PARAMETERS
+    ----------
+    n_jobs : int or None
+        ``None`` or 1 runs in the current process. Negative values count
+        back from the number of CPUs, such that -1 uses all CPUs, -2 all
+        but one, etc.
+
+    RETURNS
+    -------
+    int
+        Number of worker processes (at least 1).
+    """
+    if n_jobs is None:
+        return 1
+
+    assert isinstance(n_jobs, int) and n_jobs != 0, ValueError('n_jobs must be None or a non-zero integer')
+
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    else:
+        return n_jobs
+
+
+class _SharedArray:
+    """
+    Picklable reference to an array placed in shared memory (``path`` is
+    None) or in a memory-mapped file.
+    """
+
+    def __init__(self, name, shape, dtype, path=None):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+        self.path = path
+
+    def attach(self):
+        """
+        Returns a read-only view of the array in the current process.
+        """
+        if self.path is None:
+            shm = shared_memory.SharedMemory(name=self.name)
+            # Keep the handle open for as long as the worker lives
+            _workerState.setdefault('handles', []).append(shm)
+            arr = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+        else:
+            arr = np.memmap(self.path, dtype=self.dtype, mode='r', shape=self.shape)
+        arr.flags.writeable = False
+        return arr
+
+
+class _SharedObject:
+    """
+    Picklable wrapper of a shallow copy of an object whose array attributes
+    have been replaced by :class:`_SharedArray` references.
+    """
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def attach(self):
+        """
+        Returns the object with its array attributes attached.
+        """
+        for key, value in vars(self.obj).items():
+            if isinstance(value, _SharedArray):
+                setattr(self.obj, key, value.attach())
+        return self.obj
+
+
+class _SharedStore:
+    """
+    Owns the shared memory blocks and memory-mapped files created for one
+    call of :func:`mapSegments` and releases them on exit.
+    """
+
+    def __init__(self):
+        self.blocks = []
+        self.paths = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        for shm in self.blocks:
+            shm.close()
+            shm.unlink()
+        for path in self.paths:
+            os.remove(path)
+        self.blocks = []
+        self.paths = []
+
+    def shareArray(self, arr):
+        """
+        Copies the array once to shared memory, or to a memory-mapped file
+        if shared memory is not available, and returns a reference to it.
+        """
+        if arr.nbytes == 0 or arr.dtype.hasobject:
+            return arr
+
+        if shared_memory is not None:
+            try:
+                shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+            except OSError:
+                shm = None
+            if shm is not None:
+                self.blocks.append(shm)
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+                return _SharedArray(shm.name, arr.shape, arr.dtype)
+
+        fd, path = tempfile.mkstemp(prefix='hoggorm_', suffix='.dat')
+        os.close(fd)
+        self.paths.append(path)
+        mm = np.memmap(path, dtype=arr.dtype, mode='w+', shape=arr.shape)
+        mm[...] = arr
+        mm.flush()
+        del mm
+        return _SharedArray(None, arr.shape, arr.dtype, path)
+
+    def share(self, value):
+        """
+        Returns a picklable version of ``value`` in which arrays, also
+        those held as attributes of an object, are shared.
+        """
+        if isinstance(value, np.ndarray):
+            return self.shareArray(value)
+
+        if hasattr(value, '__dict__') and not callable(value):
+            if any(isinstance(attr, np.ndarray) for attr in vars(value).values()):
+                obj = copy.copy(value)
+                for key, attr in vars(value).items():
+                    if isinstance(attr, np.ndarray):
+                        setattr(obj, key, self.shareArray(attr))
+                return _SharedObject(obj)
+
+        return value
+
+
+def _attach(value):
+    """
+    Resolves shared arrays and objects in a worker process.
+    """
+    if isinstance(value, (_SharedArray, _SharedObject)):
+        return value.attach()
+    return value
+
+
+def _initWorker(func, kargs, blasThreads):
+    """
+    Limits the BLAS threads of the worker process and stores the segment
+    function and the settings shared by all segments.
+    """
+    if threadpoolctl is not None:
+        threadpoolctl.threadpool_limits(limits=blasThreads, user_api='blas')
+    else:
+        for getter, setter in _loadedBlasLibraries():
+            setter(blasThreads)
+    _workerState['func'] = func
+    _workerState['kargs'] = {key: _attach(value) for key, value in kargs.items()}
+
+
+def _runSegment(segment):
+    """
+    Computes the model of one segment in a worker process.
+    """
+    train_index, test_index = segment
+    return _workerState['func'](train_index, test_index, **_workerState['kargs'])
+
+
+def mapSegments(func, segments, n_jobs=None, **kargs):
+    """
+    Calls ``func(train_index, test_index, **kargs)`` for each cross
+    validation segment and returns the results in segment order.
+
+    PARAMETERS
+    ----------
+    func : function
+        Module level function that computes the model of one segment.
+
+    segments : list
+        Pairs of boolean train and test index arrays as produced by the
+        iterators in hoggorm.cross_val.
+
+    n_jobs : int or None, optional
+        Number of worker processes, see :func:`numWorkers`. Each worker
+        uses the number of BLAS threads given by the execution context.
+
+    kargs : optional
+        Data and settings that are the same for all segments. When running
+        in worker processes, arrays are shared rather than copied, see the
+        module documentation.
+
+    RETURNS
+    -------
+    list
+        Results of ``func``, one for each segment.
+    """
+    segments = list(segments)
+    workers = min(numWorkers(n_jobs), len(segments))
+
+    if workers <= 1:
+        return [func(train_index, test_index, **kargs) for train_index, test_index in segments]
+
+    chunksize = max(1, len(segments) // (4 * workers))
+    blasThreads = workerBlasThreads(workers)
+    with _SharedStore() as store, _blasEnvironment(blasThreads):
+        sharedKargs = {key: store.share(value) for key, value in kargs.items()}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker,
+                                 initargs=(func, sharedKargs, blasThreads)) as executor:
+            return list(executor.map(_runSegment, segments, chunksize=chunksize))
@@ -2,9 +2,11 @@
 
 # Import necessary modules
 import numpy as np
-import numpy.linalg as npla
-import hoggorm.statTools as st
 import hoggorm.cross_val as cv
+import hoggorm.engines as eng
+import hoggorm.parallel as parallel
+import hoggorm.results as res
+import hoggorm.predictor as pred
 
 
 
@@ -52,6 +54,102 @@ class nipalsPCA:
 
         Sequence of lables. Must be same lenght as number of rows in ``arrX``. Leaves out objects with same lable.
 
+        ekf : element-wise cross validation of Eastment & Krzanowski. Each element of ``arrX`` is predicted from a decomposition without its row and a decomposition without its column, which validates the reconstruction of X. Requires one decomposition per object and one per variable. Pre-processing is computed once from all objects.
+            ``cvType = ["ekf"]``
+
+    algorithm : str, optional
+        Defines how scores and loadings are computed, both for the model and
+        for the models of each cross validation segment. All choices except
+        ``"randomized"`` give the same scores and loadings (including sign)
+        up to floating point error.
+
+        nipals : components are extracted one at a time by NIPALS (default)
+            ``algorithm = "nipals"``
+
+        svd : all components from one singular value decomposition of ``arrX``
+            ``algorithm = "svd"``
+
+        eig : all components from one eigendecomposition of the covariance array X'X
+            ``algorithm = "eig"``
+
+        randomized : randomized truncated SVD, suited when few components are computed from many variables. The result is an approximation whose accuracy depends on ``oversampling`` and ``powerIter``
+            ``algorithm = "randomized"``
+
+        gram : all components from one eigendecomposition of the Gram array XX', suited for few objects and many variables
+            ``algorithm = "gram"``
+
+        auto : ``"gram"`` if there are at least five times more variables than objects, otherwise ``"nipals"``
+            ``algorithm = "auto"``
+
+    algorithmOptions : dict, optional
+        Settings for the chosen algorithm. For ``algorithm = "randomized"``
+        these are ``oversampling`` (int, default 10), ``powerIter``
+        (int, default 2) and ``seed`` (int, default None). Provide a seed
+        for reproducible results.
+
+        For ``algorithm = "nipals"`` these are ``tol`` (float, relative
+        tolerance on the change of the scores, default None which uses the
+        absolute threshold 1e-8), ``max_iter`` (int, maximum iterations per
+        component, default 5000), ``start`` (``"first"`` column or column
+        with ``"maxVariance"``, default "first"), ``extrapolation`` (None,
+        ``"aitken"`` or ``"anderson"``, default None),
+        ``reorthogonalise`` (int, re-orthogonalise loadings against earlier
+        ones every this many iterations, default 0 for never) and
+        ``deflation`` (``"explicit"`` or ``"implicit"``, default
+        "explicit"). Extrapolation typically halves the number of
+        iterations. Use re-orthogonalisation together with a loose ``tol``.
+        Implicit deflation never forms the residual matrices, such that no
+        copy of the pre-processed data is needed during the fit.
+
+    cvEngine : str, optional
+        Defines how the models of the cross validation segments are computed.
+
+        refit : each training set is copied, pre-processed and decomposed with the chosen ``algorithm`` (default)
+            ``cvEngine = "refit"``
+
+        downdate : XX' is computed once and the centred Gram array of each training set is derived from it by deleting the held out objects. Scores come from its eigendecomposition and loadings from a single product with X. This gives the same results as ``"refit"`` up to floating point error and is much faster for few objects and many variables. Training sets are not copied, so the dictionaries returned by ``cvTrainAndTestData`` hold the test sets and the boolean ``train index`` only.
+            ``cvEngine = "downdate"``
+
+    warmStart : boolean, optional
+        If True, NIPALS in each cross validation segment starts from the
+        projection of the training set onto the loadings of the model of all
+        objects, instead of from the first column of X. The segment
+        models are the same up to the convergence threshold and need fewer
+        iterations (about a third fewer on the cheese data of the tests).
+        Only used with ``algorithm = "nipals"`` or ``"auto"`` (default False).
+
+    n_jobs : int, optional
+        Number of processes used for computing the models of the cross
+        validation segments. With 1 all segments are computed in the current
+        process. With -1 all CPUs are used, with -2 all but one, etc. If not
+        provided, the number of workers of the execution context is used,
+        which by default is 1 (see ``hoggorm.executionContext``). Results
+        are assembled in segment order and are identical to those of a
+        serial run.
+
+    cvPredictions : boolean, optional
+        Whether the validated predictions of X are kept (default True). The
+        validated statistics are accumulated as each cross validation
+        segment finishes and do not need them. With False, ``X_predVal``
+        is not available and memory use for validation is of the order of
+        numComp x p instead of numComp x n x p.
+
+    cvRetention : str, optional
+        What is kept of the cross validation segments.
+
+            ``cvRetention = "full"``
+            Copies of the training and test sets returned by
+            ``cvTrainAndTestData`` and the segment models (scores and loadings) in
+            ``val_arrTlist``, ``val_arrPlist``, etc. (default).
+
+            ``cvRetention = "indices"``
+            Only the index arrays of the segments. ``cvTrainAndTestData``
+            extracts the training and test sets from the input data when
+            an element is requested. The segment models are not kept.
+
+            ``cvRetention = "none"``
+            Nothing, ``cvTrainAndTestData`` is not available.
+
 
     RETURNS
     -------
@@ -88,6 +186,11 @@ class nipalsPCA:
     >>> model = ho.nipalsPCA(arrX=myData, cvType=["loo"])
     >>> model = ho.nipalsPCA(arrX=myData, cvType=["KFold", 4])
     >>> model = ho.nipalsPCA(arrX=myData, cvType=["lolo", [1, 2, 3, 4, 5, 6, 7, 1, 2, 3, 4, 5, 6, 7]])
+    >>> model = ho.nipalsPCA(arrX=myData, cvType=["loo"], algorithm="svd")
+    >>> model = ho.nipalsPCA(arrX=myData, numComp=3, algorithm="randomized", algorithmOptions={"seed": 1})
+    >>> model = ho.nipalsPCA(arrX=myData, cvType=["loo"], cvEngine="downdate")
+    >>> model = ho.nipalsPCA(arrX=myData, cvType=["ekf"])
+    >>> model = ho.nipalsPCA(arrX=myData, cvType=["loo"], n_jobs=-1)
 
     Examples of how to extract results from the PCA model.
 
@@ -97,7 +200,8 @@ class nipalsPCA:
 
     """
 
-    def __init__(self, arrX, numComp=None, Xstand=False, cvType=None):
+    @parallel.honourContext
+    def __init__(self, arrX, numComp=None, Xstand=False, cvType=None, algorithm="nipals", algorithmOptions=None, cvEngine="refit", warmStart=False, n_jobs=None, cvPredictions=True, cvRetention="full"):
         """
         On initialisation check how arrX and arrY are to be pre-processed
         (Xstand and Ystand are either True or False). Then check whether
@@ -116,6 +220,32 @@ class nipalsPCA:
         # Check whether cvType is provided. If NOT, then no cross validation
         # is carried out.
         self.cvType = cvType
+
+        # Algorithm used for computing scores and loadings
+        assert algorithm in eng.PCA_ALGORITHMS, ValueError('algorithm must be one of ' + str(eng.PCA_ALGORITHMS))
+        self.algorithm = algorithm
+        if algorithmOptions is None:
+            self.algorithmOptions = {}
+        else:
+            self.algorithmOptions = dict(algorithmOptions)
+
+        # Engine used for computing the models of the CV segments
+        assert cvEngine in eng.PCA_CV_ENGINES, ValueError('cvEngine must be one of ' + str(eng.PCA_CV_ENGINES))
+        self.cvEngine = cvEngine
+
+        # Warm start NIPALS in the CV segments from the full model
+        self.warmStart = warmStart
+
+        # Keep the validated predictions
+        self.cvPredictions = cvPredictions
+
+        # What to keep of the CV segments
+        assert cvRetention in res.CV_RETENTION, ValueError('cvRetention must be one of ' + str(res.CV_RETENTION))
+        self.cvRetention = cvRetention
+
+        # Number of processes used for cross validation
+        self.n_jobs = parallel.resolveJobs(n_jobs)
+        parallel.numWorkers(self.n_jobs)
         
         
         # Depict the number of components that are possible to compute based
@@ -133,6 +263,9 @@ class nipalsPCA:
         elif self.cvType[0] == "lolo":
             print("lolo")
             cvComb = cv.LeaveOneLabelOut(self.cvType[1])
+        elif self.cvType[0] == "ekf":
+            print("ekf")
+            cvComb = cv.LeaveOneOut(numObj)
         else:
             print('Requested form of cross validation is not available')
             pass
@@ -143,16 +276,18 @@ class nipalsPCA:
         # components that can be computed.
         segSizes = []
         for train_index, test_index in cvComb:
-            x_train, x_test = cv.split(train_index, test_index, self.arrX_input)
-            
             segSizes.append(numObj - sum(train_index))
         
         
         # Compute the max number of components based on only object size
         maxN = numObj - max(segSizes) - 1
         
-        # Choose whatever is smaller, number of variables or maxN
-        maxNumPC = min(np.shape(arrX)[1], maxN)
+        # Choose whatever is smaller, number of variables or maxN. With ekf
+        # also single variables are left out.
+        if self.cvType[0] == "ekf":
+            maxNumPC = min(np.shape(arrX)[1] - 1, maxN)
+        else:
+            maxNumPC = min(np.shape(arrX)[1], maxN)
         
         
         # Now set the number of components that is possible to compute.
@@ -182,85 +317,17 @@ class nipalsPCA:
             self.arrX = self.arrX_input - self.Xmeans
 
 
-        # Before PLS2 NIPALS algorithm starts initiate and lists in which
-        # results will be stored.
-        self.X_scoresList = []
-        self.X_loadingsList = []
-        self.X_loadingsWeightsList = []
-        self.coeffList = []
-        self.X_residualsList = [self.arrX]
-
-
-        # Collect residual matrices/arrays after each computed component
-        self.resids = {}
-        self.X_residualsDict = {}
-
-        # Collect predicted matrices/array Xhat after each computed component
-        self.calXhatDict_singPC = {}
-
-        # Collect explained variance in each component
-        self.calExplainedVariancesDict = {}
-        self.X_calExplainedVariancesList = []
-
-
         # ===============================================================================
-        #        Here the NIPALS PCA algorithm on X starts
+        #        Here the PCA algorithm on X starts
         # ===============================================================================
-        threshold = 1.0e-8
-        X_new = self.arrX.copy()
+        self.arrT, self.arrP = eng.fitPCA(self.arrX, self.numPC, self.algorithm, **self.algorithmOptions)
 
-        # Compute number of principal components as specified by user
-        for j in range(self.numPC):
+        # Residuals E after each component are computed from T and P when
+        # requested
+        self.X_residualsDict = res.ComponentResiduals(self.arrX, self.arrT, self.arrP, first=1)
 
-            # Check if first column contains only zeros. If yes, then
-            # NIPALS will not converge and (npla.norm(num) will contain
-            # nan's). Rather put in other starting values.
-            if not np.any(X_new[:, 0]):
-                X_repl_nonCent = np.arange(np.shape(X_new)[0])
-                X_repl = X_repl_nonCent - np.mean(X_repl_nonCent)
-                t = X_repl.reshape(-1,1)
-
-            else:
-                t = X_new[:,0].reshape(-1,1)
-
-            # Iterate until score vector converges according to threshold
-            while 1:
-                num = np.dot(np.transpose(X_new), t)
-                denom = npla.norm(num)
-
-                p = num / denom
-                t_new = np.dot(X_new, p)
-
-                diff = t - t_new
-                t = t_new.copy()
-                SS = np.sum(np.square(diff))
-
-                # Check whether sum of squares is smaller than threshold. Break
-                # out of loop if true and start computation of next component.
-                if SS < threshold:
-                    self.X_scoresList.append(t)
-                    self.X_loadingsList.append(p)
-                    break
-
-            # Peel off information explained by actual component and continue with
-            # decomposition on the residuals (X_new = E).
-            X_old = X_new.copy()
-            Xhat_j = np.dot(t, np.transpose(p))
-            X_new = X_old - Xhat_j
-
-            # Store residuals E and Xhat in their dictionaries
-            self.X_residualsDict[j+1] = X_new
-            self.calXhatDict_singPC[j+1] = Xhat_j
-
-            if self.Xstand:
-                self.calXhatDict_singPC[j+1] = (Xhat_j * self.Xstd) + self.Xmeans
-            else:
-                self.calXhatDict_singPC[j+1] = Xhat_j + self.Xmeans
-
-
-        # Collect scores and loadings for the actual component.
-        self.arrT = np.hstack(self.X_scoresList)
-        self.arrP = np.hstack(self.X_loadingsList)
+        # Correlation loadings are computed when first requested
+        self.arr_corrLoadings = None
 
 
         # ==============================================================================
@@ -270,127 +337,13 @@ class nipalsPCA:
 
         # ========== COMPUTATIONS FOR X ==========
         # ---------------------------------------------------------------------
-        # Create a list holding arrays of Xhat predicted calibration after each
-        # component. Xhat is computed with Xhat = T*P'
-        self.calXpredList = []
-
-        # Compute Xhat for 1 and more components (cumulatively).
-        for ind in range(1,self.numPC+1):
-
-            part_arrT = self.arrT[:,0:ind]
-            part_arrP = self.arrP[:,0:ind]
-            predXcal = np.dot(part_arrT, np.transpose(part_arrP))
-
-            if self.Xstand:
-                Xhat = (predXcal * self.Xstd) + self.Xmeans
-            else:
-                Xhat = predXcal + self.Xmeans
-            self.calXpredList.append(Xhat)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect all PRESSE for individual variables in a dictionary.
-        # Keys represent number of component.
-        self.PRESSEdict_indVar_X = {}
-
-        # Compute PRESS for calibration / estimation
-        PRESSE_0_indVar_X = np.sum(np.square(st.center(self.arrX_input)), axis=0)
-        self.PRESSEdict_indVar_X[0] = PRESSE_0_indVar_X
-
-        # Compute PRESS for each Xhat for 1, 2, 3, etc number of components
-        # and compute explained variance
-        for ind, Xhat in enumerate(self.calXpredList):
-            diffX = self.arrX_input - Xhat
-            PRESSE_indVar_X = np.sum(np.square(diffX), axis=0)
-            self.PRESSEdict_indVar_X[ind+1] = PRESSE_indVar_X
-
-        # Now store all PRESSE values into an array. Then compute MSEE and
-        # RMSEE.
-        self.PRESSEarr_indVar_X = np.array(list(self.PRESSEdict_indVar_X.values()))
-        self.MSEEarr_indVar_X = self.PRESSEarr_indVar_X / np.shape(self.arrX_input)[0]
-        self.RMSEEarr_indVar_X = np.sqrt(self.MSEEarr_indVar_X)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute explained variance for each variable in X using the
-        # MSEE for each variable. Also collect PRESSE, MSEE, RMSEE in
-        # their respective dictionaries for each variable. Keys represent
-        # now variables and NOT components as above with
-        # self.PRESSEdict_indVar_X
-        self.cumCalExplVarXarr_indVar = np.zeros(np.shape(self.MSEEarr_indVar_X))
-        MSEE_0_indVar_X = self.MSEEarr_indVar_X[0,:]
-
-        for ind, MSEE_indVar_X in enumerate(self.MSEEarr_indVar_X):
-            explVar = (MSEE_0_indVar_X - MSEE_indVar_X) / MSEE_0_indVar_X * 100
-            self.cumCalExplVarXarr_indVar[ind] = explVar
-
-        self.PRESSE_indVar_X = {}
-        self.MSEE_indVar_X = {}
-        self.RMSEE_indVar_X = {}
-        self.cumCalExplVarX_indVar = {}
-
-        for ind in range(np.shape(self.PRESSEarr_indVar_X)[1]):
-            self.PRESSE_indVar_X[ind] = self.PRESSEarr_indVar_X[:,ind]
-            self.MSEE_indVar_X[ind] = self.MSEEarr_indVar_X[:,ind]
-            self.RMSEE_indVar_X[ind] = self.RMSEEarr_indVar_X[:,ind]
-            self.cumCalExplVarX_indVar[ind] = self.cumCalExplVarXarr_indVar[:,ind]
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect total PRESSE across all variables in a dictionary. Also,
-        # compute total calibrated explained variance in X.
-        self.PRESSE_total_dict_X = {}
-        self.PRESSE_total_list_X = np.sum(self.PRESSEarr_indVar_X, axis=1)
-
-        for ind, PRESSE_X in enumerate(self.PRESSE_total_list_X):
-            self.PRESSE_total_dict_X[ind] = PRESSE_X
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect total MSEE across all variables in a dictionary. Also,
-        # compute total validated explained variance in X.
-        self.MSEE_total_dict_X = {}
-        self.MSEE_total_list_X = np.sum(self.MSEEarr_indVar_X, axis=1) / np.shape(self.arrX_input)[1]
-        MSEE_0_X = self.MSEE_total_list_X[0]
-
-        # Compute total cumulated calibrated explained variance in X
-        self.XcumCalExplVarList = []
-        if not self.Xstand:
-            for ind, MSEE_X in enumerate(self.MSEE_total_list_X):
-                perc = (MSEE_0_X - MSEE_X) / MSEE_0_X * 100
-                self.MSEE_total_dict_X[ind] = MSEE_X
-                self.XcumCalExplVarList.append(perc)
-        else:
-            self.XcumCalExplVarArr = np.average(self.cumCalExplVarXarr_indVar, axis=1)
-            self.XcumCalExplVarList = list(self.XcumCalExplVarArr)
-
-        # Construct list with total explained variance in X for each component
-        self.XcalExplVarList = []
-        for ind, item in enumerate(self.XcumCalExplVarList):
-            if ind == len(self.XcumCalExplVarList)-1:
-                break
-            explVarComp = self.XcumCalExplVarList[ind+1] - self.XcumCalExplVarList[ind]
-            self.XcalExplVarList.append(explVarComp)
-
-        # Construct a dictionary that holds predicted X (Xhat) from calibration
-        # for each number of components.
-        self.calXpredDict = {}
-        for ind, item in enumerate(self.calXpredList):
-            self.calXpredDict[ind+1] = item
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute total RMSEE and store values in a dictionary and list.
-        self.RMSEE_total_dict_X = {}
-        self.RMSEE_total_list_X = np.sqrt(self.MSEE_total_list_X)
-
-        for ind, RMSEE_X in enumerate(self.RMSEE_total_list_X):
-            self.RMSEE_total_dict_X[ind] = RMSEE_X
+        # Predicted X (Xhat) from calibration and the statistics for 0, 1,
+        # 2, etc number of components are computed when first requested, see
+        # results.CalibratedFits and results.ErrorStatistics.
+        self.calFitsX = res.CalibratedFits(self.arrX_input, self.arrT, self.arrP,
+                                           scale=self.Xstd if self.Xstand else None, offset=self.Xmeans)
+        self.calStatsX = res.ErrorStatistics(self.numPC, np.shape(self.arrX_input), standardised=self.Xstand,
+                                             source=self.calFitsX.press)
         # ---------------------------------------------------------------------
 
 
@@ -409,126 +362,78 @@ class nipalsPCA:
             elif self.cvType[0] == "lolo":
                 print("lolo")
                 cvComb = cv.LeaveOneLabelOut(self.cvType[1])
+            elif self.cvType[0] == "ekf":
+                print("ekf")
+                # Objects are not left out one segment at a time, see below.
+                cvComb = []
             else:
                 print('Requested form of cross validation is not available')
 
 
-            # Collect predicted x (i.e. xhat) for each CV segment in a
-            # dictionary according to number of component
-            self.valXpredDict = {}
-            for ind in range(1, self.numPC+1):
-                self.valXpredDict[ind] = np.zeros(np.shape(self.arrX_input))
+            # Accumulate the validation errors of each CV segment in the
+            # validated statistics. Predicted x (i.e. xhat) is collected in a
+            # dictionary according to number of component if requested.
+            self.valStatsX = res.ErrorStatistics(self.numPC, np.shape(self.arrX_input), standardised=self.Xstand)
+            self.valErrorsX = res.ValidationErrors(self.arrX_input, self.numPC, keep=self.cvPredictions,
+                                                   press=self.valStatsX.accumulator)
+            self.valXpredDict = self.valErrorsX.preds
 
 
             # Collect: validation X scores T, validation X loadings P,
             # validation Y scores U, validation Y loadings Q,
             # validation X loading weights W and scores regression coefficients C
-            # in lists for each component
-            self.val_arrTlist = []
-            self.val_arrPlist = []
-            self.val_arrQlist = []
-
-            # Collect train and test set in a dictionary for each component
-            self.cvTrainAndTestDataList = []
-            self.X_train_means_arr = np.zeros(np.shape(self.arrX_input))
-
-            # First devide into combinations of training and test sets
-            for train_index, test_index in cvComb:
-                X_train, X_test = cv.split(train_index, test_index, self.arrX_input)
-
-                subDict = {}
-                subDict['x train'] = X_train
-                subDict['x test'] = X_test
-                self.cvTrainAndTestDataList.append(subDict)
-
-                # -------------------------------------------------------------
-                # Center or standardise X according to users choice
+            # in lists for each component, if the segment models are kept
+            keepModels = self.cvRetention == "full"
+            self.val_arrTlist = [] if keepModels else None
+            self.val_arrPlist = [] if keepModels else None
+            self.val_arrQlist = [] if keepModels else None
+
+            # With downdating, the Gram array of the full data is computed
+            # once before looping over the segments.
+            if self.cvEngine == "downdate":
+                downdater = eng.PCADowndate(self.arrX_input, self.Xstand)
+            else:
+                downdater = None
+
+            # First devide into combinations of training and test sets. The
+            # models of the training sets are computed in segment order,
+            # possibly in parallel, before the results are assembled below.
+            segments = list(cvComb)
+            segModels = parallel.mapSegments(eng.pcaSegment, segments, n_jobs=self.n_jobs,
+                                             arrX=self.arrX_input, numComp=self.numPC,
+                                             Xstand=self.Xstand, algorithm=self.algorithm,
+                                             algorithmOptions=self.algorithmOptions,
+                                             startLoadings=self.arrP if self.warmStart else None,
+                                             downdater=downdater)
+
+            # Train and test set of each segment. Training sets are not
+            # copied with downdating.
+            segmentData = res.SegmentData(segments, [('x', self.arrX_input)],
+                                          train=[] if self.cvEngine == "downdate" else None)
+
+            for (train_index, test_index), segModel in zip(segments, segModels):
+                X_train_mean, X_train_std, valT, valP = segModel
+                X_test = self.arrX_input[test_index]
+
+                # Center or standardise X test using mean and STD from
+                # training set
                 if self.Xstand:
-                    X_train_mean = np.average(X_train, axis=0).reshape(1,-1)
-                    X_train_std = np.std(X_train, axis=0, ddof=1).reshape(1,-1)
-                    X_train_proc = (X_train - X_train_mean) / X_train_std
-
-                    # Standardise X test using mean and STD from training set
                     X_test_proc = (X_test - X_train_mean) / X_train_std
-
                 else:
-                    X_train_mean = np.average(X_train, axis=0).reshape(1,-1)
-                    X_train_proc = X_train - X_train_mean
-
-                    # Center X test using mean from training set
                     X_test_proc = X_test - X_train_mean
-                # -------------------------------------------------------------
-                self.X_train_means_arr[test_index,] = X_train_mean
-
-
-                # Here the NIPALS PCA algorithm starts
-                # ------------------------------------
-                threshold = 1.0e-8
-                X_new = X_train_proc.copy()
-
-                # Collect scores and loadings in lists that will be later converted
-                # to arrays.
-                scoresList = []
-                loadingsList = []
-
-                # Compute number of principal components as specified by user
-                for j in range(self.numPC):
-
-                    # Check if first column contains only zeros. If yes, then
-                    # NIPALS will not converge and (npla.norm(num) will contain
-                    # nan's). Rather put in other starting values.
-                    if not np.any(X_new[:, 0]):
-                        X_repl_nonCent = np.arange(np.shape(X_new)[0])
-                        X_repl = X_repl_nonCent - np.mean(X_repl_nonCent)
-                        t = X_repl.reshape(-1,1)
-
-                    else:
-                        t = X_new[:,0].reshape(-1,1)
-
-                    # Iterate until score vector converges according to threshold
-                    while 1:
-                        num = np.dot(np.transpose(X_new), t)
-                        denom = npla.norm(num)
-
-                        p = num / denom
-                        t_new = np.dot(X_new, p)
-
-                        diff = t - t_new
-                        t = t_new.copy()
-                        SS = np.sum(np.square(diff))
-
-                        # Check whether sum of squares is smaller than threshold. Break
-                        # out of loop if true and start computation of next component.
-                        if SS < threshold:
-                            scoresList.append(t)
-                            loadingsList.append(p)
-                            break
-
-                    # Peel off information explained by actual component and continue with
-                    # decomposition on the residuals (X_new = E).
-                    X_old = X_new.copy()
-                    Xhat_j = np.dot(t, np.transpose(p))
-                    X_new = X_old - Xhat_j
+                self.valErrorsX.add(0, test_index, X_train_mean)
 
-                # Collect X scores and X loadings for the actual component.
-                valT = np.hstack(scoresList)
-                valP = np.hstack(loadingsList)
-
-                self.val_arrTlist.append(valT)
-                self.val_arrPlist.append(valP)
+                if keepModels:
+                    self.val_arrTlist.append(valT)
+                    self.val_arrPlist.append(valP)
 
 
                 # Compute the scores for the left out object
                 projT = np.dot(X_test_proc, valP)
-                dims = np.shape(projT)[1]
 
                 # Construct validated predicted X first for one component,
-                # then two, three, etc
-                for ind in range(0, dims):
-
-                    part_projT = projT[:, 0:ind+1]
-                    part_valP = valP[:, 0:ind+1]
-                    valPredX_proc = np.dot(part_projT, np.transpose(part_valP))
+                # then two, three, etc, adding one component at a time
+                for ind, valPredX_proc in enumerate(eng.cumulativeFits(projT, valP)):
 
 
                     # Depending on preprocessing re-process in same manner
@@ -538,16 +443,31 @@ class nipalsPCA:
                     else:
                         valPredX = valPredX_proc + X_train_mean
 
-                    self.valXpredDict[ind+1][test_index, :] = valPredX
+                    self.valErrorsX.add(ind+1, test_index, valPredX)
+
+            # Keep the training and test sets of the segments, either as
+            # copies or as index arrays they are extracted from on request.
+            if self.cvRetention == "full":
+                self.cvTrainAndTestDataList = list(segmentData)
+            elif self.cvRetention == "indices":
+                self.cvTrainAndTestDataList = segmentData
+            else:
+                self.cvTrainAndTestDataList = None
 
 
-            # Put all predicitons into an array that corresponds to the
-            # original array
-            self.valXpredList = []
-            valPreds = self.valXpredDict.values()
-            for preds in valPreds:
-                pc_arr = np.vstack(preds)
-                self.valXpredList.append(pc_arr)
+            # Element-wise cross validation. The elements are predicted one
+            # variable at a time from the pre-processed data, using models
+            # that never saw the element.
+            if self.cvType[0] == "ekf":
+                self.valErrorsX.add(0, None, self.Xmeans)
+
+                for var, valPredX_proc in eng.pcaEKF(self.arrX, self.numPC):
+                    if self.Xstand:
+                        valPredX = (valPredX_proc * self.Xstd[var]) + self.Xmeans[var]
+                    else:
+                        valPredX = valPredX_proc + self.Xmeans[var]
+
+                    self.valErrorsX.addColumn(var, valPredX)
 
 
             # ==============================================================================
@@ -555,108 +475,9 @@ class nipalsPCA:
             # ==============================================================================
 
             # ========== Computations for X ==========
-            # -----------------------------------------------------------------
-            # Compute PRESSCV (PRediction Error Sum of Squares) for cross
-            # validation
-            self.valXpredList = self.valXpredDict.values()
-
-            # Collect all PRESSCV in a dictionary. Keys represent number of
-            # component.
-            self.PRESSCVdict_indVar_X = {}
-
-            # First compute PRESSCV for zero components
-            self.PRESSCV_0_indVar_X = np.sum(np.square(self.arrX_input - self.X_train_means_arr), axis=0)
-            self.PRESSCVdict_indVar_X[0] = self.PRESSCV_0_indVar_X
-
-            # Compute PRESSCV for each Yhat for 1, 2, 3, etc number of
-            # components and compute explained variance
-            for ind, Xhat in enumerate(self.valXpredList):
-                # diffX = self.arrX_input - Xhat
-                diffX = self.arrX_input - Xhat
-                PRESSCV_indVar_X = np.sum(np.square(diffX), axis=0)
-                self.PRESSCVdict_indVar_X[ind+1] = PRESSCV_indVar_X
-
-            # Now store all PRESSCV values into an array. Then compute MSECV
-            # and RMSECV.
-            self.PRESSCVarr_indVar_X = np.array(list(self.PRESSCVdict_indVar_X.values()))
-            self.MSECVarr_indVar_X = self.PRESSCVarr_indVar_X / np.shape(self.arrX_input)[0]
-            self.RMSECVarr_indVar_X = np.sqrt(self.MSECVarr_indVar_X)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute explained variance for each variable in X using the
-            # MSEP for each variable. Also collect PRESSCV, MSECV, RMSECV in
-            # their respective dictionaries for each variable. Keys represent
-            # now variables and NOT components as above with
-            # self.PRESSCVdict_indVar
-            self.cumValExplVarXarr_indVar = np.zeros(np.shape(self.MSECVarr_indVar_X))
-            MSECV_0_indVar_X = self.MSECVarr_indVar_X[0,:]
-
-            for ind, MSECV_indVar_X in enumerate(self.MSECVarr_indVar_X):
-                explVar = (MSECV_0_indVar_X - MSECV_indVar_X) / MSECV_0_indVar_X * 100
-                self.cumValExplVarXarr_indVar[ind] = explVar
-
-            self.PRESSCV_indVar_X = {}
-            self.MSECV_indVar_X = {}
-            self.RMSECV_indVar_X = {}
-            self.cumValExplVarX_indVar = {}
-
-            for ind in range(np.shape(self.PRESSCVarr_indVar_X)[1]):
-                self.PRESSCV_indVar_X[ind] = self.PRESSCVarr_indVar_X[:,ind]
-                self.MSECV_indVar_X[ind] = self.MSECVarr_indVar_X[:,ind]
-                self.RMSECV_indVar_X[ind] = self.RMSECVarr_indVar_X[:,ind]
-                self.cumValExplVarX_indVar[ind] = self.cumValExplVarXarr_indVar[:,ind]
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total PRESSCV across all variables in a dictionary.
-            self.PRESSCV_total_dict_X = {}
-            self.PRESSCV_total_list_X = np.sum(self.PRESSCVarr_indVar_X, axis=1)
-
-            for ind, PRESSCV_X in enumerate(self.PRESSCV_total_list_X):
-                self.PRESSCV_total_dict_X[ind] = PRESSCV_X
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total MSECV across all variables in a dictionary. Also,
-            # compute total validated explained variance in X.
-            self.MSECV_total_dict_X = {}
-            self.MSECV_total_list_X = np.sum(self.MSECVarr_indVar_X, axis=1) / np.shape(self.arrX_input)[1]
-            MSECV_0_X = self.MSECV_total_list_X[0]
-
-            # Compute total validated explained variance in X
-            self.XcumValExplVarList = []
-            if not self.Xstand:
-                for ind, MSECV_X in enumerate(self.MSECV_total_list_X):
-                    perc = (MSECV_0_X - MSECV_X) / MSECV_0_X * 100
-                    self.MSECV_total_dict_X[ind] = MSECV_X
-                    self.XcumValExplVarList.append(perc)
-            else:
-                self.XcumValExplVarArr = np.average(self.cumValExplVarXarr_indVar, axis=1)
-                self.XcumValExplVarList = list(self.XcumValExplVarArr)
-
-            # Construct list with total validated explained variance in X in
-            # each component
-            self.XvalExplVarList = []
-            for ind, item in enumerate(self.XcumValExplVarList):
-                if ind == len(self.XcumValExplVarList)-1:
-                    break
-                explVarComp = self.XcumValExplVarList[ind+1] - self.XcumValExplVarList[ind]
-                self.XvalExplVarList.append(explVarComp)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute total RMSECV and store values in a dictionary and list.
-            self.RMSECV_total_dict_X = {}
-            self.RMSECV_total_list_X = np.sqrt(self.MSECV_total_list_X)
-
-            for ind, RMSECV_X in enumerate(self.RMSECV_total_list_X):
-                self.RMSECV_total_dict_X[ind] = RMSECV_X
-            # -----------------------------------------------------------------
+            # The PRESSCV (PRediction Error Sum of Squares) were accumulated
+            # segment by segment. The validated statistics are computed from
+            # them when first requested.
 
 
     def modelSettings(self):
@@ -668,6 +489,13 @@ class nipalsPCA:
         self.settings = {}
         self.settings['numComp'] = self.numPC
         self.settings['Xstand'] = self.Xstand
+        self.settings['algorithm'] = self.algorithm
+        self.settings['algorithmOptions'] = self.algorithmOptions
+        self.settings['cvEngine'] = self.cvEngine
+        self.settings['warmStart'] = self.warmStart
+        self.settings['cvPredictions'] = self.cvPredictions
+        self.settings['cvRetention'] = self.cvRetention
+        self.settings['n_jobs'] = self.n_jobs
         self.settings['arrX'] = self.arrX_input
         self.settings['analysed arrX'] = self.arrX
 
@@ -705,22 +533,11 @@ class nipalsPCA:
         correlation loadings for component 2, etc.
         """
 
-        # Creates empty matrix for correlation loadings
-        arr_corrLoadings = np.zeros((np.shape(self.arrT)[1],
-                                     np.shape(self.arrP)[0]), float)
-
-        # Compute correlation loadings:
-        # For each component in score matrix
-        for PC in range(np.shape(self.arrT)[1]):
-            PCscores = self.arrT[:, PC]
-
-            # For each variable/attribute in original matrix (not meancentered)
-            for var in range(np.shape(self.arrX)[1]):
-                origVar = self.arrX[:, var]
-                corrs = np.corrcoef(PCscores, origVar)
-                arr_corrLoadings[PC, var] = corrs[0, 1]
-
-        self.arr_corrLoadings = np.transpose(arr_corrLoadings)
+        # Computed once from one product of the normalised scores and data,
+        # see engines.corrLoadings
+        if self.arr_corrLoadings is None:
+            self.arr_corrLoadings = eng.corrLoadings(self.arrT, self.arrX)
+            self.arr_corrLoadings.flags.writeable = False
 
         return self.arr_corrLoadings
 
@@ -729,6 +546,8 @@ class nipalsPCA:
         """
         Returns a dictionary holding arrays of residuals for array X after
         each computed component. Dictionary key represents order of component.
+        The residuals are computed when accessed, see
+        :class:`hoggorm.results.ComponentResiduals`.
         """
         return self.X_residualsDict
 
@@ -739,7 +558,7 @@ class nipalsPCA:
         each component. First number in list is for component 1, second number
         for component 2, etc.
         """
-        return self.XcalExplVarList
+        return list(self.calStatsX.explVar)
 
 
     def X_cumCalExplVar_indVar(self):
@@ -749,7 +568,7 @@ class nipalsPCA:
         components, second row represents one component, third row represents
         two components, etc. Columns represent variables.
         """
-        return self.cumCalExplVarXarr_indVar
+        return self.calStatsX.cumExplVar_indVar
 
 
     def X_cumCalExplVar(self):
@@ -758,7 +577,7 @@ class nipalsPCA:
         for array X after each component. First number represents zero
         components, second number represents component 1, etc.
         """
-        return self.XcumCalExplVarList
+        return list(self.calStatsX.cumExplVar)
 
 
     def X_predCal(self):
@@ -767,7 +586,7 @@ class nipalsPCA:
         calibration after each computed component. Dictionary key represents
         order of component.
         """
-        return self.calXpredDict
+        return self.calFitsX.predictions()
 
 
     def X_PRESSE_indVar(self):
@@ -777,7 +596,7 @@ class nipalsPCA:
         is PRESSE for zero components, second row for component 1, third row
         for component 2, etc.
         """
-        return self.PRESSEarr_indVar_X
+        return self.calStatsX.PRESS_indVar
 
 
     def X_PRESSE(self):
@@ -787,7 +606,7 @@ class nipalsPCA:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSE_total_list_X
+        return self.calStatsX.PRESS
 
 
     def X_MSEE_indVar(self):
@@ -797,7 +616,7 @@ class nipalsPCA:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEEarr_indVar_X
+        return self.calStatsX.MSE_indVar
 
 
     def X_MSEE(self):
@@ -807,7 +626,7 @@ class nipalsPCA:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEE_total_list_X
+        return self.calStatsX.MSE
 
 
     def X_RMSEE_indVar(self):
@@ -817,7 +636,7 @@ class nipalsPCA:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEEarr_indVar_X
+        return self.calStatsX.RMSE_indVar
 
 
     def X_RMSEE(self):
@@ -827,7 +646,7 @@ class nipalsPCA:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEE_total_list_X
+        return self.calStatsX.RMSE
 
 
     def X_valExplVar(self):
@@ -836,7 +655,7 @@ class nipalsPCA:
         each component. First number in list is for component 1, second number
         for component 2, third number for component 3, etc.
         """
-        return self.XvalExplVarList
+        return list(self.valStatsX.explVar)
 
 
     def X_cumValExplVar_indVar(self):
@@ -846,7 +665,7 @@ class nipalsPCA:
         zero components, second row represents component 1, third row for
         compnent 2, etc. Columns represent variables.
         """
-        return self.cumValExplVarXarr_indVar
+        return self.valStatsX.cumExplVar_indVar
 
 
     def X_cumValExplVar(self):
@@ -854,15 +673,16 @@ class nipalsPCA:
         Returns a list holding the cumulative validated explained variance
         for array X after each component.
         """
-        return self.XcumValExplVarList
+        return list(self.valStatsX.cumExplVar)
 
 
     def X_predVal(self):
         """
         Returns a dictionary holding the predicted arrays Xhat from
         validation after each computed component. Dictionary key represents
-        order of component.
+        order of component. Only available with ``cvPredictions = True``.
         """
+        assert self.valXpredDict is not None, ValueError('validated predictions are only kept with cvPredictions=True')
         return self.valXpredDict
 
 
@@ -873,7 +693,7 @@ class nipalsPCA:
         row is PRESSCV for zero components, second row for component 1, third
         row for component 2, etc.
         """
-        return self.PRESSCVarr_indVar_X
+        return self.valStatsX.PRESS_indVar
 
 
     def X_PRESSCV(self):
@@ -883,7 +703,7 @@ class nipalsPCA:
         PRESSEV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSCV_total_list_X
+        return self.valStatsX.PRESS
 
 
     def X_MSECV_indVar(self):
@@ -892,7 +712,7 @@ class nipalsPCA:
         cross validation. First row is MSECV for zero components, second row
         for component 1, etc.
         """
-        return self.MSECVarr_indVar_X
+        return self.valStatsX.MSE_indVar
 
 
     def X_MSECV(self):
@@ -902,7 +722,7 @@ class nipalsPCA:
         MSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSECV_total_list_X
+        return self.valStatsX.MSE
 
 
     def X_RMSECV_indVar(self):
@@ -912,7 +732,7 @@ class nipalsPCA:
         RMSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSECVarr_indVar_X
+        return self.valStatsX.RMSE_indVar
 
 
     def X_RMSECV(self):
@@ -922,7 +742,7 @@ class nipalsPCA:
         RMSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSECV_total_list_X
+        return self.valStatsX.RMSE
 
 
     def X_scores_predict(self, Xnew, numComp=None):
@@ -952,11 +772,21 @@ class nipalsPCA:
         return projT
 
 
+    def freeze(self):
+        """
+        Returns an immutable predictor for new X data, which holds only the
+        means, scales and loadings. It does not refer to the training data,
+        see hoggorm.predictor.Predictor.
+        """
+        return pred.Predictor(self.Xmeans, self.Xstd if self.Xstand else None, self.arrP)
+
+
     def cvTrainAndTestData(self):
         """
         Returns a list consisting of dictionaries holding training and test
-        sets.
+        sets. Not available with ``cvRetention = "none"``.
         """
+        assert self.cvTrainAndTestDataList is not None, ValueError('training and test sets are not kept with cvRetention="none"')
         return self.cvTrainAndTestDataList
 
 
@@ -3,8 +3,11 @@
 # Import necessary modules
 import numpy as np
 import numpy.linalg as npla
-import hoggorm.statTools as st
 import hoggorm.cross_val as cv
+import hoggorm.engines as eng
+import hoggorm.parallel as parallel
+import hoggorm.results as res
+import hoggorm.predictor as pred
 
 
 
@@ -63,6 +66,104 @@ class nipalsPCR:
 
             Sequence of lables. Must be same lenght as number of rows in ``arrX`` and ``arrY``. Leaves out objects with same lable.
 
+    algorithm : str, optional
+        Defines how scores and loadings of the PCA-part of PCR are computed,
+        both for the model and for the models of each cross validation
+        segment. All choices except ``"randomized"`` give the same scores and
+        loadings (including sign) up to floating point error.
+
+        nipals : components are extracted one at a time by NIPALS (default)
+            ``algorithm = "nipals"``
+
+        svd : all components from one singular value decomposition of ``arrX``
+            ``algorithm = "svd"``
+
+        eig : all components from one eigendecomposition of the covariance array X'X
+            ``algorithm = "eig"``
+
+        randomized : randomized truncated SVD, suited when few components are computed from many variables. The result is an approximation whose accuracy depends on ``oversampling`` and ``powerIter``
+            ``algorithm = "randomized"``
+
+        gram : all components from one eigendecomposition of the Gram array XX', suited for few objects and many variables
+            ``algorithm = "gram"``
+
+        auto : ``"gram"`` if there are at least five times more variables than objects, otherwise ``"nipals"``
+            ``algorithm = "auto"``
+
+    algorithmOptions : dict, optional
+        Settings for the chosen algorithm. For ``algorithm = "randomized"``
+        these are ``oversampling`` (int, default 10), ``powerIter``
+        (int, default 2) and ``seed`` (int, default None). Provide a seed
+        for reproducible results.
+
+        For ``algorithm = "nipals"`` these are ``tol`` (float, relative
+        tolerance on the change of the scores, default None which uses the
+        absolute threshold 1e-8), ``max_iter`` (int, maximum iterations per
+        component, default 5000), ``start`` (``"first"`` column or column
+        with ``"maxVariance"``, default "first"), ``extrapolation`` (None,
+        ``"aitken"`` or ``"anderson"``, default None),
+        ``reorthogonalise`` (int, re-orthogonalise loadings against earlier
+        ones every this many iterations, default 0 for never) and
+        ``deflation`` (``"explicit"`` or ``"implicit"``, default
+        "explicit"). Extrapolation typically halves the number of
+        iterations. Use re-orthogonalisation together with a loose ``tol``.
+        Implicit deflation never forms the residual matrices, such that no
+        copy of the pre-processed data is needed during the fit.
+
+    cvEngine : str, optional
+        Defines how the models of the cross validation segments are computed.
+
+        refit : each training set is copied, pre-processed and decomposed with the chosen ``algorithm`` (default)
+            ``cvEngine = "refit"``
+
+        downdate : XX' is computed once and the centred Gram array of each training set is derived from it by deleting the held out objects. Scores come from its eigendecomposition and loadings from a single product with X. This gives the same results as ``"refit"`` up to floating point error and is much faster for few objects and many variables. Training sets are not copied, so the dictionaries returned by ``cvTrainAndTestData`` hold the test sets and the boolean ``train index`` only.
+            ``cvEngine = "downdate"``
+
+        hatLOO : APPROXIMATE leave one out cross validation that keeps the PCA model of all objects fixed. Each leave one out residual follows in closed form as e_i / (1 - h_ii), where h_ii is the leverage of object i on the scores (including the intercept). Nothing is refitted, so this is very fast, but the uncertainty of the PCA decomposition itself is not validated and the results are somewhat optimistic compared to ``"refit"``. This applies to X as well as Y: all validated results of both, such as ``X_predVal``, ``X_PRESSCV``, ``X_MSECV``, ``X_cumValExplVar`` and their Y counterparts, are hat-matrix approximations. Requires ``cvType = ["loo"]``. Use for screening.
+            ``cvEngine = "hatLOO"``
+
+    warmStart : boolean, optional
+        If True, NIPALS in each cross validation segment starts from the
+        projection of the training set onto the X loadings of the model of all
+        objects, instead of from the first column of X. The segment
+        models are the same up to the convergence threshold and need fewer
+        iterations (about a third fewer on the cheese data of the tests).
+        Only used with ``algorithm = "nipals"`` or ``"auto"`` (default False).
+
+    n_jobs : int, optional
+        Number of processes used for computing the models of the cross
+        validation segments. With 1 all segments are computed in the current
+        process. With -1 all CPUs are used, with -2 all but one, etc. If not
+        provided, the number of workers of the execution context is used,
+        which by default is 1 (see ``hoggorm.executionContext``). Results
+        are assembled in segment order and are identical to those of a
+        serial run.
+
+    cvPredictions : boolean, optional
+        Whether the validated predictions of X and Y are kept (default
+        True). The validated statistics are accumulated as each cross
+        validation segment finishes and do not need them. With False,
+        ``X_predVal`` and ``Y_predVal`` are not available and memory use
+        for validation is of the order of numComp x p instead of
+        numComp x n x p.
+
+    cvRetention : str, optional
+        What is kept of the cross validation segments.
+
+            ``cvRetention = "full"``
+            Copies of the training and test sets returned by
+            ``cvTrainAndTestData`` and the segment models (X scores and
+            loadings, Y loadings) in ``val_arrTlist``, ``val_arrPlist``,
+            etc. (default).
+
+            ``cvRetention = "indices"``
+            Only the index arrays of the segments. ``cvTrainAndTestData``
+            extracts the training and test sets from the input data when
+            an element is requested. The segment models are not kept.
+
+            ``cvRetention = "none"``
+            Nothing, ``cvTrainAndTestData`` is not available.
+
 
     RETURNS
     -------
@@ -93,6 +194,10 @@ class nipalsPCR:
     >>> model = ho.nipalsPCR(arrX=my_X_data, arrY=my_Y_data, cvType=["loo"])
     >>> model = ho.nipalsPCR(arrX=my_X_data, arrY=my_Y_data, cvType=["KFold", 7])
     >>> model = ho.nipalsPCR(arrX=my_X_data, arrY=my_Y_data, cvType=["lolo", [1, 2, 3, 4, 5, 6, 7, 1, 2, 3, 4, 5, 6, 7]])
+    >>> model = ho.nipalsPCR(arrX=my_X_data, arrY=my_Y_data, numComp=3, algorithm="randomized", algorithmOptions={"seed": 1})
+    >>> model = ho.nipalsPCR(arrX=my_X_data, arrY=my_Y_data, cvType=["loo"], cvEngine="downdate")
+    >>> model = ho.nipalsPCR(arrX=my_X_data, arrY=my_Y_data, cvType=["loo"], cvEngine="hatLOO")
+    >>> model = ho.nipalsPCR(arrX=my_X_data, arrY=my_Y_data, cvType=["loo"], n_jobs=-1)
 
     Examples of how to extract results from the PCR model.
 
@@ -104,7 +209,8 @@ class nipalsPCR:
 
     """
 
-    def __init__(self, arrX, arrY, numComp=None, Xstand=False, Ystand=False, cvType=None):
+    @parallel.honourContext
+    def __init__(self, arrX, arrY, numComp=None, Xstand=False, Ystand=False, cvType=None, algorithm="nipals", algorithmOptions=None, cvEngine="refit", warmStart=False, n_jobs=None, cvPredictions=True, cvRetention="full"):
         """
         On initialisation check how arrX and arrY are to be pre-processed
         (parameters Xstand and Ystand are either True or False). Then check
@@ -124,6 +230,34 @@ class nipalsPCR:
         # Check whether cvType is provided. If NOT, then no cross validation
         # is carried out.
         self.cvType = cvType
+
+        # Algorithm used for computing scores and loadings
+        assert algorithm in eng.PCA_ALGORITHMS, ValueError('algorithm must be one of ' + str(eng.PCA_ALGORITHMS))
+        self.algorithm = algorithm
+        if algorithmOptions is None:
+            self.algorithmOptions = {}
+        else:
+            self.algorithmOptions = dict(algorithmOptions)
+
+        # Engine used for computing the models of the CV segments
+        assert cvEngine in eng.PCR_CV_ENGINES, ValueError('cvEngine must be one of ' + str(eng.PCR_CV_ENGINES))
+        if cvEngine == "hatLOO":
+            assert self.cvType is not None and self.cvType[0] == "loo", ValueError('cvEngine "hatLOO" requires cvType = ["loo"]')
+        self.cvEngine = cvEngine
+
+        # Warm start NIPALS in the CV segments from the full model
+        self.warmStart = warmStart
+
+        # Keep the validated predictions
+        self.cvPredictions = cvPredictions
+
+        # What to keep of the CV segments
+        assert cvRetention in res.CV_RETENTION, ValueError('cvRetention must be one of ' + str(res.CV_RETENTION))
+        self.cvRetention = cvRetention
+
+        # Number of processes used for cross validation
+        self.n_jobs = parallel.resolveJobs(n_jobs)
+        parallel.numWorkers(self.n_jobs)
         
         
         # Depict the number of components that are possible to compute based
@@ -151,9 +285,6 @@ class nipalsPCR:
         # components that can be computed.
         segSizes = []
         for train_index, test_index in cvComb:
-            x_train, x_test = cv.split(train_index, test_index, self.arrX_input)
-            y_train, y_test = cv.split(train_index, test_index, self.arrY_input)
-            
             segSizes.append(numObj - sum(train_index))
         
         
@@ -202,89 +333,17 @@ class nipalsPCR:
             self.arrY = self.arrY_input - self.Ymeans
 
 
-        # Before PLS2 NIPALS algorithm starts initiate and lists in which
-        # results will be stored.
-        self.X_scoresList = []
-        self.Y_scoresList = []
-        self.X_loadingsList = []
-        self.Y_loadingsList = []
-        self.X_loadingsWeightsList = []
-        self.coeffList = []
-        self.Y_residualsList = [self.arrY]
-        self.X_residualsList = [self.arrX]
-
-
-        # Collect residual matrices/arrays after each computed PC
-        self.resids = {}
-        self.X_residualsDict = {}
-
-        # Collect predicted matrices/array Xhat after each computed PC
-        self.calXhatDict_singPC = {}
-
-        # Collect explained variance in each PC
-        self.calExplainedVariancesDict = {}
-        self.X_calExplainedVariancesList = []
-
-
         # ===============================================================================
-        #        Here the NIPALS PCA algorithm on X starts
+        #        Here the PCA algorithm on X starts
         # ===============================================================================
-        threshold = 1.0e-8
-        X_new = self.arrX.copy()
-
-        # Compute number of principal components as specified by user
-        for j in range(self.numPC):
-
-            # Check if first column contains only zeros. If yes, then
-            # NIPALS will not converge and (npla.norm(num) will contain
-            # nan's). Rather put in other starting values.
-            if not np.any(X_new[:, 0]):
-                X_repl_nonCent = np.arange(np.shape(X_new)[0])
-                X_repl = X_repl_nonCent - np.mean(X_repl_nonCent)
-                t = X_repl.reshape(-1,1)
-
-            else:
-                t = X_new[:,0].reshape(-1,1)
+        self.arrT, self.arrP = eng.fitPCA(self.arrX, self.numPC, self.algorithm, **self.algorithmOptions)
 
-            # Iterate until score vector converges according to threshold
-            while 1:
-                num = np.dot(np.transpose(X_new), t)
-                denom = npla.norm(num)
+        # Residuals E after each PC are computed from T and P when requested
+        self.X_residualsDict = res.ComponentResiduals(self.arrX, self.arrT, self.arrP, first=1)
 
-                p = num / denom
-                t_new = np.dot(X_new, p)
-
-                diff = t - t_new
-                t = t_new.copy()
-                SS = np.sum(np.square(diff))
-
-                # Check whether sum of squares is smaller than threshold. Break
-                # out of loop if true and start computation of next PC.
-                if SS < threshold:
-                    self.X_scoresList.append(t)
-                    self.X_loadingsList.append(p)
-                    break
-
-            # Peel off information explained by actual componentand continue with
-            # decomposition on the residuals (X_new = E).
-            X_old = X_new.copy()
-            Xhat_j = np.dot(t, np.transpose(p))
-            X_new = X_old - Xhat_j
-
-            # Store residuals E and Xhat in their dictionaries
-            self.X_residualsDict[j+1] = X_new
-            self.calXhatDict_singPC[j+1] = Xhat_j
-
-            if self.Xstand:
-                self.calXhatDict_singPC[j+1] = (Xhat_j * self.Xstd) + self.Xmeans
-
-            else:
-                self.calXhatDict_singPC[j+1] = Xhat_j + self.Xmeans
-
-
-        # Collect scores and loadings for the actual PC.
-        self.arrT = np.hstack(self.X_scoresList)
-        self.arrP = np.hstack(self.X_loadingsList)
+        # Correlation loadings are computed when first requested
+        self.arr_corrLoadings = None
+        self.arr_YcorrLoadings = None
 
         # Compute Y loadings by using MLR (see Module 6, Equ. 6.8 ++)
         term_1 = npla.inv(np.dot(np.transpose(self.arrT), self.arrT))
@@ -299,264 +358,34 @@ class nipalsPCR:
 
         # ========== COMPUTATIONS FOR X ==========
         # ---------------------------------------------------------------------
-        # Create a list holding arrays of Xhat predicted calibration after each
-        # component. Xhat is computed with Xhat = T*P'
-        self.calXpredList = []
-
-        # Compute Xhat for 1 and more components (cumulatively).
-        for ind in range(1,self.numPC+1):
-
-            part_arrT = self.arrT[:,0:ind]
-            part_arrP = self.arrP[:,0:ind]
-            predXcal = np.dot(part_arrT, np.transpose(part_arrP))
-
-            if self.Xstand:
-                Xhat = (predXcal * self.Xstd) + self.Xmeans
-            else:
-                Xhat = predXcal + self.Xmeans
-            self.calXpredList.append(Xhat)
+        # Predicted X (Xhat) from calibration and the statistics for 0, 1,
+        # 2, etc number of components are computed when first requested, see
+        # results.CalibratedFits and results.ErrorStatistics.
+        self.calFitsX = res.CalibratedFits(self.arrX_input, self.arrT, self.arrP,
+                                           scale=self.Xstd if self.Xstand else None, offset=self.Xmeans)
+        self.calStatsX = res.ErrorStatistics(self.numPC, np.shape(self.arrX_input), standardised=self.Xstand,
+                                             source=self.calFitsX.press)
         # ---------------------------------------------------------------------
 
 
-        # ---------------------------------------------------------------------
-        # Collect all PRESSE for individual variables in a dictionary.
-        # Keys represent number of component.
-        self.PRESSEdict_indVar_X = {}
-
-        # Compute PRESS for calibration / estimation
-        PRESSE_0_indVar_X = np.sum(np.square(st.center(self.arrX_input)), axis=0)
-        self.PRESSEdict_indVar_X[0] = PRESSE_0_indVar_X
-
-        # Compute PRESS for each Xhat for 1, 2, 3, etc number of components
-        # and compute explained variance
-        for ind, Xhat in enumerate(self.calXpredList):
-            diffX = self.arrX_input - Xhat
-            PRESSE_indVar_X = np.sum(np.square(diffX), axis=0)
-            self.PRESSEdict_indVar_X[ind+1] = PRESSE_indVar_X
-
-        # Now store all PRESSE values into an array. Then compute MSEE and
-        # RMSEE.
-        self.PRESSEarr_indVar_X = np.array(list(self.PRESSEdict_indVar_X.values()))
-        self.MSEEarr_indVar_X = self.PRESSEarr_indVar_X / np.shape(self.arrX_input)[0]
-        self.RMSEEarr_indVar_X = np.sqrt(self.MSEEarr_indVar_X)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute explained variance for each variable in X using the
-        # MSEP for each variable. Also collect PRESSE, MSEE, RMSEE in
-        # their respective dictionaries for each variable. Keys represent
-        # now variables and NOT components as above with
-        # self.PRESSEdict_indVar_X
-        self.cumCalExplVarXarr_indVar = np.zeros(np.shape(self.MSEEarr_indVar_X))
-        MSEE_0_indVar_X = self.MSEEarr_indVar_X[0,:]
-
-        for ind, MSEE_indVar_X in enumerate(self.MSEEarr_indVar_X):
-            explVar = (MSEE_0_indVar_X - MSEE_indVar_X) / MSEE_0_indVar_X * 100
-            self.cumCalExplVarXarr_indVar[ind] = explVar
-
-        self.PRESSE_indVar_X = {}
-        self.MSEE_indVar_X = {}
-        self.RMSEE_indVar_X = {}
-        self.cumCalExplVarX_indVar = {}
-
-        for ind in range(np.shape(self.PRESSEarr_indVar_X)[1]):
-            self.PRESSE_indVar_X[ind] = self.PRESSEarr_indVar_X[:,ind]
-            self.MSEE_indVar_X[ind] = self.MSEEarr_indVar_X[:,ind]
-            self.RMSEE_indVar_X[ind] = self.RMSEEarr_indVar_X[:,ind]
-            self.cumCalExplVarX_indVar[ind] = self.cumCalExplVarXarr_indVar[:,ind]
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect total PRESSE across all variables in a dictionary. Also,
-        # compute total calibrated explained variance in Y.
-        self.PRESSE_total_dict_X = {}
-        self.PRESSE_total_list_X = np.sum(self.PRESSEarr_indVar_X, axis=1)
-
-        for ind, PRESSE_X in enumerate(self.PRESSE_total_list_X):
-            self.PRESSE_total_dict_X[ind] = PRESSE_X
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect total MSEE across all variables in a dictionary. Also,
-        # compute total validated explained variance in X.
-        self.MSEE_total_dict_X = {}
-        self.MSEE_total_list_X = np.sum(self.MSEEarr_indVar_X, axis=1) / np.shape(self.arrX_input)[1]
-        MSEE_0_X = self.MSEE_total_list_X[0]
-
-        # Compute total calibrated explained variance in X
-        self.XcumCalExplVarList = []
-        if not self.Xstand:
-            for ind, MSEE_X in enumerate(self.MSEE_total_list_X):
-                perc = (MSEE_0_X - MSEE_X) / MSEE_0_X * 100
-                self.MSEE_total_dict_X[ind] = MSEE_X
-                self.XcumCalExplVarList.append(perc)
-        else:
-            self.XcumCalExplVarArr = np.average(self.cumCalExplVarXarr_indVar, axis=1)
-            self.XcumCalExplVarList = list(self.XcumCalExplVarArr)
-
-        # Construct list with total validated explained variance in X
-        self.XcalExplVarList = []
-        for ind, item in enumerate(self.XcumCalExplVarList):
-            if ind == len(self.XcumCalExplVarList)-1:
-                break
-            explVarComp = self.XcumCalExplVarList[ind+1] - self.XcumCalExplVarList[ind]
-            self.XcalExplVarList.append(explVarComp)
-
-        # Construct a dictionary that holds predicted X (Xhat) from calibration
-        # for each number of components.
-        self.calXpredDict = {}
-        for ind, item in enumerate(self.calXpredList):
-            self.calXpredDict[ind+1] = item
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute total RMSEE and store values in a dictionary and list.
-        self.RMSEE_total_dict_X = {}
-        self.RMSEE_total_list_X = np.sqrt(self.MSEE_total_list_X)
-
-        for ind, RMSEE_X in enumerate(self.RMSEE_total_list_X):
-            self.RMSEE_total_dict_X[ind] = RMSEE_X
-        # ---------------------------------------------------------------------
-
-
-
         # ========== COMPUTATIONS FOR Y ============
         # ---------------------------------------------------------------------
-        # Create a list holding arrays of Yhat predicted calibration after each
-        # component. Yhat is computed with Yhat = T*Chat*Q'
-        self.calYpredList = []
-
-        for ind in range(1, self.numPC+1):
-
-            x_scores = self.arrT[:,0:ind]
-            y_loadings = self.arrQ[:,0:ind]
-            # c_regrCoeff = self.arrC[0:ind,0:ind]
-
-            # Depending on whether Y was standardised or not compute Yhat
-            # accordingly.
-            if self.Ystand:
-                Yhat_stand = np.dot(x_scores, np.transpose(y_loadings))
-                Yhat = (Yhat_stand * self.Ystd.reshape(1,-1)) + self.Ymeans.reshape(1,-1)
-            else:
-                Yhat = np.dot(x_scores, np.transpose(y_loadings)) + self.Ymeans.reshape(1,-1)
-            self.calYpredList.append(Yhat)
-
-            # Compute Y residuals and store in list
-            self.Y_residualsList.append(self.arrY - Yhat)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect all PRESSE for individual variables in a dictionary.
-        # Keys represent number of component.
-        self.PRESSEdict_indVar = {}
-
-        # Compute PRESS for calibration / estimation
-        PRESSE_0_indVar = np.sum(np.square(st.center(self.arrY_input)), axis=0)
-        self.PRESSEdict_indVar[0] = PRESSE_0_indVar
-
-        # Compute PRESS for each Yhat for 1, 2, 3, etc number of components
-        # and compute explained variance
-        for ind, Yhat in enumerate(self.calYpredList):
-            diffY = self.arrY_input - Yhat
-            PRESSE_indVar = np.sum(np.square(diffY), axis=0)
-            self.PRESSEdict_indVar[ind+1] = PRESSE_indVar
-
-        # Now store all PRESSE values into an array. Then compute MSEE and
-        # RMSEE.
-        self.PRESSEarr_indVar = np.array(list(self.PRESSEdict_indVar.values()))
-        self.MSEEarr_indVar = self.PRESSEarr_indVar / np.shape(self.arrY_input)[0]
-        self.RMSEEarr_indVar = np.sqrt(self.MSEEarr_indVar)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute explained variance for each variable in Y using the
-        # MSEP for each variable. Also collect PRESSE, MSEE, RMSEE in
-        # their respective dictionaries for each variable. Keys represent
-        # now variables and NOT components as above with
-        # self.PRESSEdict_indVar
-        self.cumCalExplVarYarr_indVar = np.zeros(np.shape(self.MSEEarr_indVar))
-        MSEE_0_indVar = self.MSEEarr_indVar[0,:]
-
-        for ind, MSEE_indVar in enumerate(self.MSEEarr_indVar):
-            explVar = (MSEE_0_indVar - MSEE_indVar) / MSEE_0_indVar * 100
-            self.cumCalExplVarYarr_indVar[ind] = explVar
-
-        self.PRESSE_indVar = {}
-        self.MSEE_indVar = {}
-        self.RMSEE_indVar = {}
-        self.cumCalExplVarY_indVar = {}
-
-        for ind in range(np.shape(self.PRESSEarr_indVar)[1]):
-            self.PRESSE_indVar[ind] = self.PRESSEarr_indVar[:,ind]
-            self.MSEE_indVar[ind] = self.MSEEarr_indVar[:,ind]
-            self.RMSEE_indVar[ind] = self.RMSEEarr_indVar[:,ind]
-            self.cumCalExplVarY_indVar[ind] = self.cumCalExplVarYarr_indVar[:,ind]
+        # Predicted Y (Yhat) from calibration and the statistics for 0, 1,
+        # 2, etc number of components are computed when first requested, see
+        # results.CalibratedFits and results.ErrorStatistics.
+        self.calFitsY = res.CalibratedFits(self.arrY_input, self.arrT, self.arrQ,
+                                           scale=self.Ystd.reshape(1,-1) if self.Ystand else None, offset=self.Ymeans.reshape(1,-1))
+        self.calStatsY = res.ErrorStatistics(self.numPC, np.shape(self.arrY_input), standardised=self.Ystand,
+                                             source=self.calFitsY.press)
+
+        # Y residuals F after each component are computed from T and Q when
+        # requested, as the difference between Y and Yhat
+        self.Y_residualsDict = res.ComponentResiduals(self.arrY, self.arrT, self.arrQ,
+                                                      scale=self.Ystd.reshape(1,-1) if self.Ystand else None,
+                                                      offset=self.Ymeans.reshape(1,-1))
         # ---------------------------------------------------------------------
 
 
-        # ---------------------------------------------------------------------
-        # Collect total PRESSE across all variables in a dictionary. Also,
-        # compute total calibrated explained variance in Y.
-        self.PRESSE_total_dict = {}
-        self.PRESSE_total_list = np.sum(self.PRESSEarr_indVar, axis=1)
-
-        for ind, PRESSE in enumerate(self.PRESSE_total_list):
-            self.PRESSE_total_dict[ind] = PRESSE
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect total MSEE across all variables in a dictionary. Also,
-        # compute total calibrated explained variance in Y.
-        self.MSEE_total_dict = {}
-        self.MSEE_total_list = np.sum(self.MSEEarr_indVar, axis=1) / np.shape(self.arrY_input)[1]
-        MSEE_0 = self.MSEE_total_list[0]
-
-        # Compute total calibrated explained variance in Y
-        self.YcumCalExplVarList = []
-        if not self.Ystand:
-            for ind, MSEE in enumerate(self.MSEE_total_list):
-                perc = (MSEE_0 - MSEE) / MSEE_0 * 100
-                self.MSEE_total_dict[ind] = MSEE
-                self.YcumCalExplVarList.append(perc)
-        else:
-            self.YcumCalExplVarArr = np.average(self.cumCalExplVarYarr_indVar, axis=1)
-            self.YcumCalExplVarList = list(self.YcumCalExplVarArr)
-
-        # Construct list with total validated explained variance in Y
-        self.YcalExplVarList = []
-        for ind, item in enumerate(self.YcumCalExplVarList):
-            if ind == len(self.YcumCalExplVarList)-1:
-                break
-            explVarComp = self.YcumCalExplVarList[ind+1] - self.YcumCalExplVarList[ind]
-            self.YcalExplVarList.append(explVarComp)
-
-        # Construct a dictionary that holds predicted Y (Yhat) from calibration
-        # for each number of components.
-        self.calYpredDict = {}
-        for ind, item in enumerate(self.calYpredList):
-            self.calYpredDict[ind+1] = item
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute total RMSEP and store values in a dictionary and list.
-        self.RMSEE_total_dict = {}
-        self.RMSEE_total_list = np.sqrt(self.MSEE_total_list)
-
-        for ind, RMSEE in enumerate(self.RMSEE_total_list):
-            self.RMSEE_total_dict[ind] = RMSEE
-        # ---------------------------------------------------------------------
-
-
-
-
         # ==============================================================================
         #         From here cross validation procedure starts
         # ==============================================================================
@@ -565,7 +394,11 @@ class nipalsPCR:
 
             if self.cvType[0] == "loo":
                 print("loo")
-                cvComb = cv.LeaveOneOut(numObj)
+                if self.cvEngine == "hatLOO":
+                    # No models are refitted, see below.
+                    cvComb = []
+                else:
+                    cvComb = cv.LeaveOneOut(numObj)
             elif self.cvType[0] == "KFold":
                 print("KFold")
                 cvComb = cv.KFold(numObj, k=self.cvType[1])
@@ -576,67 +409,63 @@ class nipalsPCR:
                 print('Requested form of cross validation is not available')
 
 
-            # Collect predicted y (i.e. yhat) for each CV segment in a
-            # dictionary according to nubmer of PC
-            self.valYpredDict = {}
-            for ind in range(1, self.numPC+1):
-                self.valYpredDict[ind] = np.zeros(np.shape(self.arrY_input))
-
-            # Collect predicted x (i.e. xhat) for each CV segment in a
-            # dictionary according to number of PC
-            self.valXpredDict = {}
-            for ind in range(1, self.numPC+1):
-                self.valXpredDict[ind] = np.zeros(np.shape(self.arrX_input))
-
-            # Collect train and test set in dictionaries for each componentand put
-            # them in this list.
-            self.cvTrainAndTestDataList = []
-
+            # Accumulate the validation errors of each CV segment in the
+            # validated statistics. Predicted y and x (i.e. yhat and xhat) are
+            # collected in dictionaries according to number of PC if
+            # requested.
+            self.valStatsY = res.ErrorStatistics(self.numPC, np.shape(self.arrY_input), standardised=self.Ystand)
+            self.valErrorsY = res.ValidationErrors(self.arrY_input, self.numPC, keep=self.cvPredictions,
+                                                   press=self.valStatsY.accumulator)
+            self.valYpredDict = self.valErrorsY.preds
+            self.valStatsX = res.ErrorStatistics(self.numPC, np.shape(self.arrX_input), standardised=self.Xstand)
+            self.valErrorsX = res.ValidationErrors(self.arrX_input, self.numPC, keep=self.cvPredictions,
+                                                   press=self.valStatsX.accumulator)
+            self.valXpredDict = self.valErrorsX.preds
 
             # Collect: validation X scores T, validation X loadings P,
             # validation Y scores U, validation Y loadings Q,
             # validation X loading weights W and scores regression coefficients C
-            # in lists for each PC
-            self.val_arrTlist = []
-            self.val_arrPlist = []
-            self.val_arrQlist = []
-
-            # Collect train and test set in a dictionary for each component
-            self.cvTrainAndTestDataList = []
-            self.X_train_means_list = np.zeros(np.shape(self.arrX_input))
-            self.Y_train_means_list = np.zeros(np.shape(self.arrY_input))
-
-            # First devide into combinations of training and test sets
-            for train_index, test_index in cvComb:
-                X_train, X_test = cv.split(train_index, test_index, self.arrX_input)
-                Y_train, Y_test = cv.split(train_index, test_index, self.arrY_input)
-
-                subDict = {}
-                subDict['x train'] = X_train
-                subDict['x test'] = X_test
-                subDict['y train'] = Y_train
-                subDict['y test'] = Y_test
-                self.cvTrainAndTestDataList.append(subDict)
-
-
-                # -------------------------------------------------------------
-                # Center or standardise X according to users choice
+            # in lists for each PC, if the segment models are kept
+            keepModels = self.cvRetention == "full"
+            self.val_arrTlist = [] if keepModels else None
+            self.val_arrPlist = [] if keepModels else None
+            self.val_arrQlist = [] if keepModels else None
+
+            # With downdating, the Gram array of the full data is computed
+            # once before looping over the segments.
+            if self.cvEngine == "downdate":
+                downdater = eng.PCADowndate(self.arrX_input, self.Xstand)
+            else:
+                downdater = None
+
+            # First devide into combinations of training and test sets. The
+            # PCA models of the training sets are computed in segment order,
+            # possibly in parallel, before the results are assembled below.
+            segments = list(cvComb)
+            segModels = parallel.mapSegments(eng.pcaSegment, segments, n_jobs=self.n_jobs,
+                                             arrX=self.arrX_input, numComp=self.numPC,
+                                             Xstand=self.Xstand, algorithm=self.algorithm,
+                                             algorithmOptions=self.algorithmOptions,
+                                             startLoadings=self.arrP if self.warmStart else None,
+                                             downdater=downdater)
+
+            # Train and test sets of each segment. Training sets of X are
+            # not copied with downdating.
+            segmentData = res.SegmentData(segments, [('x', self.arrX_input), ('y', self.arrY_input)],
+                                          train=['y'] if self.cvEngine == "downdate" else None)
+
+            for (train_index, test_index), segModel in zip(segments, segModels):
+                X_train_mean, X_train_std, valT, valP = segModel
+                Y_train = self.arrY_input[train_index]
+                X_test = self.arrX_input[test_index]
+
+                # Center or standardise X test using mean and STD from
+                # training set
                 if self.Xstand:
-                    X_train_mean = np.average(X_train, axis=0).reshape(1,-1)
-                    X_train_std = np.std(X_train, axis=0, ddof=1).reshape(1,-1)
-                    X_train_proc = (X_train - X_train_mean) / X_train_std
-
-                    # Standardise X test using mean and STD from training set
                     X_test_proc = (X_test - X_train_mean) / X_train_std
-
                 else:
-                    X_train_mean = np.average(X_train, axis=0).reshape(1,-1)
-                    X_train_proc = X_train - X_train_mean
-
-                    # Center X test using mean from training set
                     X_test_proc = X_test - X_train_mean
-                # -------------------------------------------------------------
-                self.X_train_means_list[test_index,] = X_train_mean
+                self.valErrorsX.add(0, test_index, X_train_mean)
 
 
                 # -------------------------------------------------------------
@@ -649,86 +478,25 @@ class nipalsPCR:
                     Y_train_mean = np.average(Y_train, axis=0)
                     Y_train_proc = Y_train - Y_train_mean
                 # -------------------------------------------------------------
-                self.Y_train_means_list[test_index,] = Y_train_mean
-
-
-                # Here the NIPALS PCA algorithm starts
-                # ------------------------------------
-                threshold = 1.0e-8
-                X_new = X_train_proc.copy()
-
-                # Collect scores and loadings in lists that will be later converted
-                # to arrays.
-                scoresList = []
-                loadingsList = []
-
-                # Compute number of principal components as specified by user
-                for j in range(self.numPC):
-
-                    # Check if first column contains only zeros. If yes, then
-                    # NIPALS will not converge and (npla.norm(num) will contain
-                    # nan's). Rather put in other starting values.
-                    if not np.any(X_new[:, 0]):
-                        X_repl_nonCent = np.arange(np.shape(X_new)[0])
-                        X_repl = X_repl_nonCent - np.mean(X_repl_nonCent)
-                        t = X_repl.reshape(-1,1)
-
-                    else:
-                        t = X_new[:,0].reshape(-1,1)
-
-                    # Iterate until score vector converges according to threshold
-                    while 1:
-                        num = np.dot(np.transpose(X_new), t)
-                        denom = npla.norm(num)
-
-                        p = num / denom
-                        t_new = np.dot(X_new, p)
-
-                        diff = t - t_new
-                        t = t_new.copy()
-                        SS = np.sum(np.square(diff))
-
-                        # Check whether sum of squares is smaller than threshold. Break
-                        # out of loop if true and start computation of next PC.
-                        if SS < threshold:
-                            scoresList.append(t)
-                            loadingsList.append(p)
-                            break
-
-                    # Peel off information explained by actual component and continue with
-                    # decomposition on the residuals (X_new = E).
-                    X_old = X_new.copy()
-                    Xhat_j = np.dot(t, np.transpose(p))
-                    X_new = X_old - Xhat_j
-
-                # Collect X scores and X loadings for the actual PC.
-                valT = np.hstack(scoresList)
-                valP = np.hstack(loadingsList)
-
-                self.val_arrTlist.append(valT)
-                self.val_arrPlist.append(valP)
+                self.valErrorsY.add(0, test_index, Y_train_mean)
 
                 # Compute Y loadings
                 term_1 = npla.inv(np.dot(np.transpose(valT),valT))
                 term_2 = np.dot(np.transpose(valT),Y_train_proc)
                 valQ = np.transpose(np.dot(term_1,term_2))
-                self.val_arrQlist.append(valQ)
+
+                if keepModels:
+                    self.val_arrTlist.append(valT)
+                    self.val_arrPlist.append(valP)
+                    self.val_arrQlist.append(valQ)
 
                 # Compute the scores for the left out object
                 projT = np.dot(X_test_proc, valP)
-                dims = np.shape(projT)[1]
 
                 # Construct validated predicted X first for one component,
-                # then two, three, etc
-                for ind in range(0, dims):
-
-                    # part_projT = projT[:,0:ind+1].reshape(1,-1)
-                    part_projT = projT[:,0:ind+1]
-                    part_valP = valP[:,0:ind+1]
-                    valPredX_proc = np.dot(part_projT, np.transpose(part_valP))
-
-                    part_valQ = valQ[:,0:ind+1]
-                    valPredY_proc = np.dot(part_projT, np.transpose(part_valQ))
+                # then two, three, etc, adding one component at a time
+                cumFits = zip(eng.cumulativeFits(projT, valP), eng.cumulativeFits(projT, valQ))
+                for ind, (valPredX_proc, valPredY_proc) in enumerate(cumFits):
 
                     # Depending on preprocessing re-process in same manner
                     # in order to get values that compare to original values.
@@ -737,249 +505,53 @@ class nipalsPCR:
                     else:
                         valPredX = valPredX_proc + X_train_mean
 
-                    self.valXpredDict[ind+1][test_index,] = valPredX
+                    self.valErrorsX.add(ind+1, test_index, valPredX)
 
                     if self.Ystand:
                         valPredY = (valPredY_proc * Y_train_std) + Y_train_mean
                     else:
                         valPredY = valPredY_proc + Y_train_mean
 
-                    self.valYpredDict[ind+1][test_index,] = valPredY
+                    self.valErrorsY.add(ind+1, test_index, valPredY)
 
+            # Keep the training and test sets of the segments, either as
+            # copies or as index arrays they are extracted from on request.
+            if self.cvRetention == "full":
+                self.cvTrainAndTestDataList = list(segmentData)
+            elif self.cvRetention == "indices":
+                self.cvTrainAndTestDataList = segmentData
+            else:
+                self.cvTrainAndTestDataList = None
 
 
-            # Put all predicitons into an array that corresponds to the
-            # original variable
-            self.valXpredList = []
-            valPreds = self.valXpredDict.values()
-            for preds in valPreds:
-                pc_arr = np.vstack(preds)
-                self.valXpredList.append(pc_arr)
+            # Approximate leave one out from the calibration residuals. With
+            # the PCA model fixed, Xhat and Yhat are least squares fits on
+            # the scores and the leave one out residuals are e / (1 - h).
+            if self.cvEngine == "hatLOO":
+                leverages = eng.scoreLeverages(self.arrT).reshape(self.numPC + 1, -1, 1)
 
+                resX_0 = self.arrX_input - self.Xmeans
+                resY_0 = self.arrY_input - self.Ymeans
+                self.valErrorsX.add(0, None, self.arrX_input - resX_0 / (1 - leverages[0]))
+                self.valErrorsY.add(0, None, self.arrY_input - resY_0 / (1 - leverages[0]))
 
-            # Put all predicitons into an array that corresponds to the
-            # original variable
-            self.valYpredList = []
-            valPreds = self.valYpredDict.values()
-            for preds in valPreds:
-                pc_arr = np.vstack(preds)
-                self.valYpredList.append(pc_arr)
+                # The calibrated fits are generated one component at a time,
+                # such that they are not all held in memory.
+                cumFits = zip(self.calFitsX._fits(), self.calFitsY._fits())
+                for ind, (calPredX, calPredY) in enumerate(cumFits):
+                    resX = np.subtract(self.arrX_input, calPredX, out=calPredX)
+                    resY = np.subtract(self.arrY_input, calPredY, out=calPredY)
+                    self.valErrorsX.add(ind+1, None, self.arrX_input - resX / (1 - leverages[ind+1]))
+                    self.valErrorsY.add(ind+1, None, self.arrY_input - resY / (1 - leverages[ind+1]))
 
 
             # ==============================================================================
             # From here VALIDATED explained variance is computed
             # ==============================================================================
 
-            # ========== Computations for X ==========
-            # -----------------------------------------------------------------
-            # Compute PRESSCV (PRediction Error Sum of Squares) for cross
-            # validation
-            self.valXpredList = self.valXpredDict.values()
-
-            # Collect all PRESS in a dictionary. Keys represent number of
-            # component.
-            self.PRESSCVdict_indVar_X = {}
-
-            # First compute PRESSCV for zero components
-            self.PRESSCV_0_indVar_X = np.sum(np.square(self.arrX_input-self.X_train_means_list), axis=0)
-            self.PRESSCVdict_indVar_X[0] = self.PRESSCV_0_indVar_X
-
-            # Compute PRESSCV for each Yhat for 1, 2, 3, etc number of
-            # components and compute explained variance
-            for ind, Xhat in enumerate(self.valXpredList):
-                # diffX = self.arrX_input - Xhat
-                diffX = self.arrX_input - Xhat
-                PRESSCV_indVar_X = np.sum(np.square(diffX), axis=0)
-                self.PRESSCVdict_indVar_X[ind+1] = PRESSCV_indVar_X
-
-            # Now store all PRESSCV values into an array. Then compute MSECV
-            # and RMSECV.
-            self.PRESSCVarr_indVar_X = np.array(list(self.PRESSCVdict_indVar_X.values()))
-            self.MSECVarr_indVar_X = self.PRESSCVarr_indVar_X / np.shape(self.arrX_input)[0]
-            self.RMSECVarr_indVar_X = np.sqrt(self.MSECVarr_indVar_X)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute explained variance for each variable in X using the
-            # MSEP for each variable. Also collect PRESS, MSECV, RMSECV in
-            # their respective dictionaries for each variable. Keys represent
-            # now variables and NOT components as above with
-            # self.PRESSdict_indVar
-            self.cumValExplVarXarr_indVar = np.zeros(np.shape(self.MSECVarr_indVar_X))
-            MSECV_0_indVar_X = self.MSECVarr_indVar_X[0,:]
-
-            for ind, MSECV_indVar_X in enumerate(self.MSECVarr_indVar_X):
-                explVar = (MSECV_0_indVar_X - MSECV_indVar_X) / MSECV_0_indVar_X * 100
-                self.cumValExplVarXarr_indVar[ind] = explVar
-
-            self.PRESSCV_indVar_X = {}
-            self.MSECV_indVar_X = {}
-            self.RMSECV_indVar_X = {}
-            self.cumValExplVarX_indVar = {}
-
-            for ind in range(np.shape(self.PRESSCVarr_indVar_X)[1]):
-                self.PRESSCV_indVar_X[ind] = self.PRESSCVarr_indVar_X[:,ind]
-                self.MSECV_indVar_X[ind] = self.MSECVarr_indVar_X[:,ind]
-                self.RMSECV_indVar_X[ind] = self.RMSECVarr_indVar_X[:,ind]
-                self.cumValExplVarX_indVar[ind] = self.cumValExplVarXarr_indVar[:,ind]
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total PRESSCV across all variables in a dictionary.
-            self.PRESSCV_total_dict_X = {}
-            self.PRESSCV_total_list_X = np.sum(self.PRESSCVarr_indVar_X, axis=1)
-
-            for ind, PRESSCV_X in enumerate(self.PRESSCV_total_list_X):
-                self.PRESSCV_total_dict_X[ind] = PRESSCV_X
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total MSECV across all variables in a dictionary. Also,
-            # compute total validated explained variance in X.
-            self.MSECV_total_dict_X = {}
-            self.MSECV_total_list_X = np.sum(self.MSECVarr_indVar_X, axis=1) / np.shape(self.arrX_input)[1]
-            MSECV_0_X = self.MSECV_total_list_X[0]
-
-            # Compute total validated explained variance in X
-            self.XcumValExplVarList = []
-            if not self.Xstand:
-                for ind, MSECV_X in enumerate(self.MSECV_total_list_X):
-                    perc = (MSECV_0_X - MSECV_X) / MSECV_0_X * 100
-                    self.MSECV_total_dict_X[ind] = MSECV_X
-                    self.XcumValExplVarList.append(perc)
-            else:
-                self.XcumValExplVarArr = np.average(self.cumValExplVarXarr_indVar, axis=1)
-                self.XcumValExplVarList = list(self.XcumValExplVarArr)
-
-            # Construct list with total validated explained variance in X in
-            # each component
-            self.XvalExplVarList = []
-            for ind, item in enumerate(self.XcumValExplVarList):
-                if ind == len(self.XcumValExplVarList)-1:
-                    break
-                explVarComp = self.XcumValExplVarList[ind+1] - self.XcumValExplVarList[ind]
-                self.XvalExplVarList.append(explVarComp)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute total RMSECV and store values in a dictionary and list.
-            self.RMSECV_total_dict_X = {}
-            self.RMSECV_total_list_X = np.sqrt(self.MSECV_total_list_X)
-
-            for ind, RMSECV_X in enumerate(self.RMSECV_total_list_X):
-                self.RMSECV_total_dict_X[ind] = RMSECV_X
-            # -----------------------------------------------------------------
-
-
-
-            # ========== Computations for Y ==========
-            # -----------------------------------------------------------------
-            # Compute PRESSCV (PRediction Error Sum of Squares) for cross
-            # validation
-            self.valYpredList = self.valYpredDict.values()
-
-            # Collect all PRESS in a dictionary. Keys represent number of
-            # component.
-            self.PRESSdict_indVar = {}
-
-            # First compute PRESSCV for zero components
-            self.PRESSCV_0_indVar = np.sum(np.square(self.arrY_input-self.Y_train_means_list), axis=0)
-            self.PRESSdict_indVar[0] = self.PRESSCV_0_indVar
-
-            # Compute PRESSCV for each Yhat for 1, 2, 3, etc number of components
-            # and compute explained variance
-            for ind, Yhat in enumerate(self.valYpredList):
-                diffY = self.arrY_input - Yhat
-                PRESSCV_indVar = np.sum(np.square(diffY), axis=0)
-                self.PRESSdict_indVar[ind+1] = PRESSCV_indVar
-
-            # Now store all PRESSCV values into an array. Then compute MSECV and
-            # RMSECV.
-            self.PRESSCVarr_indVar = np.array(list(self.PRESSdict_indVar.values()))
-            self.MSECVarr_indVar = self.PRESSCVarr_indVar / np.shape(self.arrY_input)[0]
-            self.RMSECVarr_indVar = np.sqrt(self.MSECVarr_indVar)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute explained variance for each variable in Y using the
-            # MSECV for each variable. Also collect PRESS, MSECV, RMSECV in
-            # their respective dictionaries for each variable.  Keys represent
-            # now variables and NOT components as above with
-            # self.PRESSdict_indVar
-            self.cumValExplVarYarr_indVar = np.zeros(np.shape(self.MSECVarr_indVar))
-            MSECV_0_indVar = self.MSECVarr_indVar[0,:]
-
-            for ind, MSECV_indVar in enumerate(self.MSECVarr_indVar):
-                explVar = (MSECV_0_indVar - MSECV_indVar) / MSECV_0_indVar * 100
-                self.cumValExplVarYarr_indVar[ind] = explVar
-
-            self.PRESSCV_indVar = {}
-            self.MSECV_indVar = {}
-            self.RMSECV_indVar = {}
-            self.cumValExplVarY_indVar = {}
-
-            for ind in range(np.shape(self.PRESSCVarr_indVar)[1]):
-                self.PRESSCV_indVar[ind] = self.PRESSCVarr_indVar[:,ind]
-                self.MSECV_indVar[ind] = self.MSECVarr_indVar[:,ind]
-                self.RMSECV_indVar[ind] = self.RMSECVarr_indVar[:,ind]
-                self.cumValExplVarY_indVar[ind] = self.cumValExplVarYarr_indVar[:,ind]
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total PRESSCV across all variables in a dictionary.
-            self.PRESSCV_total_dict = {}
-            self.PRESSCV_total_list = np.sum(self.PRESSCVarr_indVar, axis=1)
-
-            for ind, PRESSCV in enumerate(self.PRESSCV_total_list):
-                self.PRESSCV_total_dict[ind] = PRESSCV
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total MSECV across all variables in a dictionary. Also,
-            # compute total validated explained variance in Y.
-            self.MSECV_total_dict = {}
-            self.MSECV_total_list = np.sum(self.MSECVarr_indVar, axis=1) / np.shape(self.arrY_input)[1]
-            MSECV_0 = self.MSECV_total_list[0]
-
-            # Compute total validated explained variance in Y
-            self.YcumValExplVarList = []
-            if not self.Ystand:
-                for ind, MSECV in enumerate(self.MSECV_total_list):
-                    perc = (MSECV_0 - MSECV) / MSECV_0 * 100
-                    self.MSECV_total_dict[ind] = MSECV
-                    self.YcumValExplVarList.append(perc)
-            else:
-                self.YcumValExplVarArr = np.average(self.cumValExplVarYarr_indVar, axis=1)
-                self.YcumValExplVarList = list(self.YcumValExplVarArr)
-
-            # Construct list with total validated explained variance in Y in
-            # each component
-            self.YvalExplVarList = []
-            for ind, item in enumerate(self.YcumValExplVarList):
-                if ind == len(self.YcumValExplVarList)-1:
-                    break
-                explVarComp = self.YcumValExplVarList[ind+1] - self.YcumValExplVarList[ind]
-                self.YvalExplVarList.append(explVarComp)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute total RMSECV and store values in a dictionary and list.
-            self.RMSECV_total_dict = {}
-            self.RMSECV_total_list = np.sqrt(self.MSECV_total_list)
-
-            for ind, RMSECV in enumerate(self.RMSECV_total_list):
-                self.RMSECV_total_dict[ind] = RMSECV
-            # -----------------------------------------------------------------
-
-
+            # The PRESSCV (PRediction Error Sum of Squares) of X and Y were
+            # accumulated segment by segment. The validated statistics are
+            # computed from them when first requested.
 
 
     def modelSettings(self):
@@ -991,6 +563,13 @@ class nipalsPCR:
         self.settings = {}
         self.settings['numComp'] = self.numPC
         self.settings['Xstand'] = self.Xstand
+        self.settings['algorithm'] = self.algorithm
+        self.settings['algorithmOptions'] = self.algorithmOptions
+        self.settings['cvEngine'] = self.cvEngine
+        self.settings['warmStart'] = self.warmStart
+        self.settings['cvPredictions'] = self.cvPredictions
+        self.settings['cvRetention'] = self.cvRetention
+        self.settings['n_jobs'] = self.n_jobs
         self.settings['arrX'] = self.arrX_input
         self.settings['analysed arrX'] = self.arrX
         self.settings['arrY'] = self.arrY_input
@@ -1030,21 +609,11 @@ class nipalsPCR:
         correlation loadings for component 2, etc.
         """
 
-        # Creates empty matrix for correlation loadings
-        arr_corrLoadings = np.zeros((np.shape(self.arrT)[1], np.shape(self.arrP)[0]), float)
-
-        # Compute correlation loadings:
-        # For each component in score matrix
-        for PC in range(np.shape(self.arrT)[1]):
-            PCscores = self.arrT[:, PC]
-
-            # For each variable/attribute in original matrix (not meancentered)
-            for var in range(np.shape(self.arrX)[1]):
-                origVar = self.arrX[:, var]
-                corrs = np.corrcoef(PCscores, origVar)
-                arr_corrLoadings[PC, var] = corrs[0,1]
-
-        self.arr_corrLoadings = np.transpose(arr_corrLoadings)
+        # Computed once from one product of the normalised scores and data,
+        # see engines.corrLoadings
+        if self.arr_corrLoadings is None:
+            self.arr_corrLoadings = eng.corrLoadings(self.arrT, self.arrX)
+            self.arr_corrLoadings.flags.writeable = False
 
         return self.arr_corrLoadings
 
@@ -1053,6 +622,8 @@ class nipalsPCR:
         """
         Returns a dictionary holding the residual arrays for array X after
         each computed component. Dictionary key represents order of component.
+        The residuals are computed when accessed, see
+        :class:`hoggorm.results.ComponentResiduals`.
         """
         return self.X_residualsDict
 
@@ -1063,7 +634,7 @@ class nipalsPCR:
         each component. First number in list is for component 1, second number
         for component 2, etc.
         """
-        return self.XcalExplVarList
+        return list(self.calStatsX.explVar)
 
 
     def X_cumCalExplVar_indVar(self):
@@ -1073,7 +644,7 @@ class nipalsPCR:
         components, second row represents one component, third row represents
         two components, etc. Columns represent variables.
         """
-        return self.cumCalExplVarXarr_indVar
+        return self.calStatsX.cumExplVar_indVar
 
 
     def X_cumCalExplVar(self):
@@ -1081,7 +652,7 @@ class nipalsPCR:
         Returns a list holding the cumulative calibrated explained variance
         for array X after each component.
         """
-        return self.XcumCalExplVarList
+        return list(self.calStatsX.cumExplVar)
 
 
     def X_predCal(self):
@@ -1090,7 +661,7 @@ class nipalsPCR:
         calibration after each computed component. Dictionary key represents
         order of component.
         """
-        return self.calXpredDict
+        return self.calFitsX.predictions()
 
 
     def X_PRESSE_indVar(self):
@@ -1100,7 +671,7 @@ class nipalsPCR:
         is PRESSE for zero components, second row for component 1, third row
         for component 2, etc.
         """
-        return self.PRESSEarr_indVar_X
+        return self.calStatsX.PRESS_indVar
 
 
     def X_PRESSE(self):
@@ -1110,7 +681,7 @@ class nipalsPCR:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSE_total_list_X
+        return self.calStatsX.PRESS
 
 
     def X_MSEE_indVar(self):
@@ -1120,7 +691,7 @@ class nipalsPCR:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEEarr_indVar_X
+        return self.calStatsX.MSE_indVar
 
 
     def X_MSEE(self):
@@ -1130,7 +701,7 @@ class nipalsPCR:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEE_total_list_X
+        return self.calStatsX.MSE
 
 
     def X_RMSEE_indVar(self):
@@ -1140,7 +711,7 @@ class nipalsPCR:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEEarr_indVar_X
+        return self.calStatsX.RMSE_indVar
 
 
     def X_RMSEE(self):
@@ -1150,7 +721,7 @@ class nipalsPCR:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEE_total_list_X
+        return self.calStatsX.RMSE
 
 
     def X_valExplVar(self):
@@ -1159,7 +730,7 @@ class nipalsPCR:
         each component. First number in list is for component 1, second number
         for component 2, third number for component 3, etc.
         """
-        return self.XvalExplVarList
+        return list(self.valStatsX.explVar)
 
 
     def X_cumValExplVar_indVar(self):
@@ -1169,7 +740,7 @@ class nipalsPCR:
         zero components, second row represents component 1, third row for
         compnent 2, etc. Columns represent variables.
         """
-        return self.cumValExplVarXarr_indVar
+        return self.valStatsX.cumExplVar_indVar
 
 
     def X_cumValExplVar(self):
@@ -1178,15 +749,16 @@ class nipalsPCR:
         for array X after each component. First number represents zero
         components, second number represents component 1, etc.
         """
-        return self.XcumValExplVarList
+        return list(self.valStatsX.cumExplVar)
 
 
     def X_predVal(self):
         """
         Returns dictionary holding arrays of predicted Xhat after each
         component from validation. Dictionary key represents order of
-        component.
+        component. Only available with ``cvPredictions = True``.
         """
+        assert self.valXpredDict is not None, ValueError('validated predictions are only kept with cvPredictions=True')
         return self.valXpredDict
 
 
@@ -1197,7 +769,7 @@ class nipalsPCR:
         row is PRESSCV for zero components, second row for component 1, third
         row for component 2, etc.
         """
-        return self.PRESSCVarr_indVar_X
+        return self.valStatsX.PRESS_indVar
 
 
     def X_PRESSCV(self):
@@ -1207,7 +779,7 @@ class nipalsPCR:
         PRESSCV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSCV_total_list_X
+        return self.valStatsX.PRESS
 
 
     def X_MSECV_indVar(self):
@@ -1216,7 +788,7 @@ class nipalsPCR:
         cross validation. First row is MSECV for zero components, second row
         for component 1, etc.
         """
-        return self.MSECVarr_indVar_X
+        return self.valStatsX.MSE_indVar
 
 
     def X_MSECV(self):
@@ -1226,7 +798,7 @@ class nipalsPCR:
         MSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSECV_total_list_X
+        return self.valStatsX.MSE
 
 
     def X_RMSECV_indVar(self):
@@ -1236,7 +808,7 @@ class nipalsPCR:
         RMSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSECVarr_indVar_X
+        return self.valStatsX.RMSE_indVar
 
 
     def X_RMSECV(self):
@@ -1246,7 +818,7 @@ class nipalsPCR:
         RMSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSECV_total_list_X
+        return self.valStatsX.RMSE
 
 
     def X_scores_predict(self, Xnew, numComp=None):
@@ -1300,21 +872,11 @@ class nipalsPCR:
         correlation loadings for component 2, etc.
         """
 
-        # Creates empty matrix for correlation loadings
-        arr_YcorrLoadings = np.zeros((np.shape(self.arrT)[1], np.shape(self.arrQ)[0]), float)
-
-        # Compute correlation loadings:
-        # For each component in score matrix
-        for PC in range(np.shape(self.arrT)[1]):
-            PCscores = self.arrT[:, PC]
-
-            # For each variable/attribute in original matrix (not meancentered)
-            for var in range(np.shape(self.arrY)[1]):
-                origVar = self.arrY[:, var]
-                corrs = np.corrcoef(PCscores, origVar)
-                arr_YcorrLoadings[PC, var] = corrs[0,1]
-
-        self.arr_YcorrLoadings = np.transpose(arr_YcorrLoadings)
+        # Computed once from one product of the normalised scores and data,
+        # see engines.corrLoadings
+        if self.arr_YcorrLoadings is None:
+            self.arr_YcorrLoadings = eng.corrLoadings(self.arrT, self.arrY)
+            self.arr_YcorrLoadings.flags.writeable = False
 
         return self.arr_YcorrLoadings
 
@@ -1322,16 +884,11 @@ class nipalsPCR:
     def Y_residuals(self):
         """
         Returns a dictionary holding residuals F of array Y after each
-        component. Dictionary key represents order of component.
+        component. Dictionary key represents order of component. The
+        residuals are computed when accessed, see
+        :class:`hoggorm.results.ComponentResiduals`.
         """
-        # Create empty dictionary that will hold residuals
-        Y_residualsDict = {}
-
-        # Fill dictionary with residuals arrays from residuals list
-        for ind, item in enumerate(self.Y_residualsList):
-            Y_residualsDict[ind] = item
-
-        return Y_residualsDict
+        return self.Y_residualsDict
 
 
     def Y_calExplVar(self):
@@ -1340,7 +897,7 @@ class nipalsPCR:
         component. First number in list is for component 1, second number for
         component 2, etc.
         """
-        return self.YcalExplVarList
+        return list(self.calStatsY.explVar)
 
 
     def Y_cumCalExplVar_indVar(self):
@@ -1350,7 +907,7 @@ class nipalsPCR:
         components, second row represents one component, third row represents
         two components, etc. Columns represent variables.
         """
-        return self.cumCalExplVarYarr_indVar
+        return self.calStatsY.cumExplVar_indVar
 
 
     def Y_cumCalExplVar(self):
@@ -1359,7 +916,7 @@ class nipalsPCR:
         for array X after each component. First number represents zero
         components, second number represents component 1, etc.
         """
-        return self.YcumCalExplVarList
+        return list(self.calStatsY.cumExplVar)
 
 
     def Y_predCal(self):
@@ -1368,7 +925,7 @@ class nipalsPCR:
         component from calibration. Dictionary key represents order of
         components.
         """
-        return self.calYpredDict
+        return self.calFitsY.predictions()
 
     def Y_PRESSE_indVar(self):
         """
@@ -1377,7 +934,7 @@ class nipalsPCR:
         PRESSE for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSEarr_indVar
+        return self.calStatsY.PRESS_indVar
 
 
     def Y_PRESSE(self):
@@ -1387,7 +944,7 @@ class nipalsPCR:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSE_total_list
+        return self.calStatsY.PRESS
 
 
     def Y_MSEE_indVar(self):
@@ -1397,7 +954,7 @@ class nipalsPCR:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEEarr_indVar
+        return self.calStatsY.MSE_indVar
 
 
     def Y_MSEE(self):
@@ -1407,7 +964,7 @@ class nipalsPCR:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEE_total_list
+        return self.calStatsY.MSE
 
 
     def Y_RMSEE_indVar(self):
@@ -1417,7 +974,7 @@ class nipalsPCR:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEEarr_indVar
+        return self.calStatsY.RMSE_indVar
 
 
     def Y_RMSEE(self):
@@ -1427,7 +984,7 @@ class nipalsPCR:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEE_total_list
+        return self.calStatsY.RMSE
 
 
     def Y_valExplVar(self):
@@ -1436,7 +993,7 @@ class nipalsPCR:
         each component. First number in list is for component 1, second number
         for component 2, third number for component 3, etc.
         """
-        return self.YvalExplVarList
+        return list(self.valStatsY.explVar)
 
 
     def Y_cumValExplVar_indVar(self):
@@ -1446,7 +1003,7 @@ class nipalsPCR:
         zero components, second row represents component 1, third row for
         compnent 2, etc. Columns represent variables.
         """
-        return self.cumValExplVarYarr_indVar
+        return self.valStatsY.cumExplVar_indVar
 
 
     def Y_cumValExplVar(self):
@@ -1455,15 +1012,16 @@ class nipalsPCR:
         for array X after each component. First number represents zero
         components, second number represents component 1, etc.
         """
-        return self.YcumValExplVarList
+        return list(self.valStatsY.cumExplVar)
 
 
     def Y_predVal(self):
         """
         Returns dictionary holding arrays of predicted Yhat after each
         component from validation. Dictionary key represents order of
-        component.
+        component. Only available with ``cvPredictions = True``.
         """
+        assert self.valYpredDict is not None, ValueError('validated predictions are only kept with cvPredictions=True')
         return self.valYpredDict
 
 
@@ -1474,7 +1032,7 @@ class nipalsPCR:
         PRESSCV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.PRESSCVarr_indVar
+        return self.valStatsY.PRESS_indVar
 
 
     def Y_PRESSCV(self):
@@ -1484,7 +1042,7 @@ class nipalsPCR:
         PRESSCV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.PRESSCV_total_list
+        return self.valStatsY.PRESS
 
 
     def Y_MSECV_indVar(self):
@@ -1494,7 +1052,7 @@ class nipalsPCR:
         MSECV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.MSECVarr_indVar
+        return self.valStatsY.MSE_indVar
 
 
     def Y_MSECV(self):
@@ -1504,7 +1062,7 @@ class nipalsPCR:
         MSECV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.MSECV_total_list
+        return self.valStatsY.MSE
 
 
     def Y_RMSECV_indVar(self):
@@ -1514,7 +1072,7 @@ class nipalsPCR:
         RMSECV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.RMSECVarr_indVar
+        return self.valStatsY.RMSE_indVar
 
 
     def Y_RMSECV(self):
@@ -1524,7 +1082,7 @@ class nipalsPCR:
         RMSECV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.RMSECV_total_list
+        return self.valStatsY.RMSE
 
 
     def regressionCoefficients(self, numComp=1):
@@ -1577,11 +1135,22 @@ class nipalsPCR:
         return Yhat
 
 
+    def freeze(self):
+        """
+        Returns an immutable predictor for new X data, which holds only the
+        means, scales, loadings and regression coefficients. It does not
+        refer to the training data, see hoggorm.predictor.Predictor.
+        """
+        return pred.Predictor(self.Xmeans, self.Xstd if self.Xstand else None, self.arrP,
+                              Ymeans=self.Ymeans, Yscale=self.Ystd if self.Ystand else None, arrQ=self.arrQ)
+
+
     def cvTrainAndTestData(self):
         """
         Returns a list consisting of dictionaries holding training and test
-        sets.
+        sets. Not available with ``cvRetention = "none"``.
         """
+        assert self.cvTrainAndTestDataList is not None, ValueError('training and test sets are not kept with cvRetention="none"')
         return self.cvTrainAndTestDataList
 
 
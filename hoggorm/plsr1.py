@@ -3,9 +3,11 @@
 
 # Import necessary modules
 import numpy as np
-import numpy.linalg as npla
-import hoggorm.statTools as st
 import hoggorm.cross_val as cv
+import hoggorm.engines as eng
+import hoggorm.parallel as parallel
+import hoggorm.results as res
+import hoggorm.predictor as pred
 
 
 
@@ -65,6 +67,73 @@ class nipalsPLS1:
 
             Sequence of lables. Must be same lenght as number of rows in ``arrX`` and ``arrY``. Leaves out objects with same lable.
 
+    algorithm : str, optional
+        Defines how the PLS1 components are computed, both for the model and
+        for the models of each cross validation segment. All choices give the
+        same scores, loadings and loading weights up to floating point error.
+
+        nipals : components are extracted one at a time by NIPALS, deflating X and y (default)
+            ``algorithm = "nipals"``
+
+        kernel : kernel algorithm working on the small cross-product arrays X'X or XX' without deflating X
+            ``algorithm = "kernel"``
+
+        bidiag : Golub-Kahan bidiagonalisation of X, needing only one product with X and one with X' per component
+            ``algorithm = "bidiag"``
+
+    algorithmOptions : dict, optional
+        Settings for the chosen algorithm. For ``algorithm = "kernel"`` this
+        is ``form`` (str, default "auto"): ``"covariance"`` uses X'X,
+        ``"gram"`` uses XX' and ``"auto"`` uses XX' when there are fewer
+        objects than variables.
+
+        For ``algorithm = "nipals"`` this is ``deflation`` (str, default
+        "explicit"). With ``"implicit"`` the residual matrices are never
+        formed, such that no copy of the pre-processed X is needed during
+        the fit.
+
+    cvEngine : str, optional
+        Defines how the models of the cross validation segments are computed.
+
+        refit : each training set is copied, pre-processed and fitted with the chosen ``algorithm`` (default)
+            ``cvEngine = "refit"``
+
+        downdate : X'X and X'y (or XX') are computed once and the pre-processed cross-products of each training set are derived from them by subtracting the held out objects. The segment models are then computed with kernel PLS1. This gives the same results as ``"refit"`` up to floating point error and makes leave one out cross validation feasible for many objects. Training sets are not copied, so the dictionaries returned by ``cvTrainAndTestData`` hold the test sets and the boolean ``train index`` only.
+            ``cvEngine = "downdate"``
+
+    n_jobs : int, optional
+        Number of processes used for computing the models of the cross
+        validation segments. With 1 all segments are computed in the current
+        process. With -1 all CPUs are used, with -2 all but one, etc. If not
+        provided, the number of workers of the execution context is used,
+        which by default is 1 (see ``hoggorm.executionContext``). Results
+        are assembled in segment order and are identical to those of a
+        serial run.
+
+    cvPredictions : boolean, optional
+        Whether the validated predictions of X and Y are kept (default
+        True). The validated statistics are accumulated as each cross
+        validation segment finishes and do not need them. With False,
+        ``X_predVal`` and ``Y_predVal`` are not available and memory use
+        for validation is of the order of numComp x p instead of
+        numComp x n x p.
+
+    cvRetention : str, optional
+        What is kept of the cross validation segments.
+
+            ``cvRetention = "full"``
+            Copies of the training and test sets returned by
+            ``cvTrainAndTestData`` and the segment models (scores, loadings and loading weights) in
+            ``val_arrTlist``, ``val_arrPlist``, etc. (default).
+
+            ``cvRetention = "indices"``
+            Only the index arrays of the segments. ``cvTrainAndTestData``
+            extracts the training and test sets from the input data when
+            an element is requested. The segment models are not kept.
+
+            ``cvRetention = "none"``
+            Nothing, ``cvTrainAndTestData`` is not available.
+
 
     RETURNS
     -------
@@ -96,6 +165,9 @@ class nipalsPLS1:
     >>> model = ho.nipalsPLS1(arrX=my_X_data, vecy=my_y_data, cvType=["loo"])
     >>> model = ho.nipalsPLS1(arrX=my_X_data, vecy=my_y_data, cvType=["KFold", 7])
     >>> model = ho.nipalsPLS1(arrX=my_X_data, vecy=my_y_data, cvType=["lolo", [1, 2, 3, 4, 5, 6, 7, 1, 2, 3, 4, 5, 6, 7]]])
+    >>> model = ho.nipalsPLS1(arrX=my_X_data, vecy=my_y_data, algorithm="kernel")
+    >>> model = ho.nipalsPLS1(arrX=my_X_data, vecy=my_y_data, cvType=["loo"], cvEngine="downdate")
+    >>> model = ho.nipalsPLS1(arrX=my_X_data, vecy=my_y_data, cvType=["loo"], n_jobs=-1)
 
     Examples of how to extract results from the PCR model.
 
@@ -107,7 +179,8 @@ class nipalsPLS1:
 
     """
 
-    def __init__(self, arrX, vecy, numComp=3, Xstand=False, Ystand=False, cvType=["loo"]):
+    @parallel.honourContext
+    def __init__(self, arrX, vecy, numComp=3, Xstand=False, Ystand=False, cvType=["loo"], algorithm="nipals", algorithmOptions=None, cvEngine="refit", n_jobs=None, cvPredictions=True, cvRetention="full"):
         """
         On initialisation check how X and y are to be pre-processed (which
         mode is used). Then check whether number of PC's chosen by user is OK.
@@ -126,6 +199,29 @@ class nipalsPLS1:
         # Check whether cvType is provided. If NOT, then no cross validation
         # is carried out.
         self.cvType = cvType
+
+
+        # Check which algorithm is to be used for computing the components.
+        assert algorithm in eng.PLS1_ALGORITHMS, ValueError('algorithm must be one of ' + str(eng.PLS1_ALGORITHMS))
+        self.algorithm = algorithm
+        if algorithmOptions is None:
+            self.algorithmOptions = {}
+        else:
+            self.algorithmOptions = dict(algorithmOptions)
+
+        assert cvEngine in eng.PLS1_CV_ENGINES, ValueError('cvEngine must be one of ' + str(eng.PLS1_CV_ENGINES))
+        self.cvEngine = cvEngine
+
+        # Keep the validated predictions
+        self.cvPredictions = cvPredictions
+
+        # What to keep of the CV segments
+        assert cvRetention in res.CV_RETENTION, ValueError('cvRetention must be one of ' + str(res.CV_RETENTION))
+        self.cvRetention = cvRetention
+
+        # Number of processes used for cross validation
+        self.n_jobs = parallel.resolveJobs(n_jobs)
+        parallel.numWorkers(self.n_jobs)
         
         
         # Depict the number of components that are possible to compute based
@@ -153,9 +249,6 @@ class nipalsPLS1:
         # components that can be computed.
         segSizes = []
         for train_index, test_index in cvComb:
-            x_train, x_test = cv.split(train_index, test_index, self.arrX_input)
-            y_train, y_test = cv.split(train_index, test_index, self.vecy_input)
-            
             segSizes.append(numObj - sum(train_index))
         
         
@@ -203,295 +296,46 @@ class nipalsPLS1:
             self.vecy = self.vecy_input - vecyMean
 
 
-        # Before PLS1 NIPALS algorithm starts initiate dictionaries and lists
-        # in which results are stored.
-        self.x_scoresList = []
-        self.x_loadingsList = []
-        self.y_scoresList = []
-        self.y_loadingsList = []
-        self.x_loadingWeightsList = []
-        self.coeffList = []
-        self.Y_residualsList = [self.vecy]
-        self.X_residualsList = [self.arrX]
-
-
         # ===============================================================================
-        #        Here PLS1 NIPALS algorithm starts
+        #        Here PLS1 algorithm starts
         # ===============================================================================
-        X_new = self.arrX.copy()
-        y_new = self.vecy.copy()
-
-        # Compute j number of components
-        for j in range(self.numPC):
-
-            # Module 7: STEP 1
-            w_num = np.dot(np.transpose(X_new), y_new)
-            w_denom = npla.norm(w_num)
-            w = w_num / w_denom
-
-            # Module 7: STEP 2
-            t = np.dot(X_new, w)
-
-            # Module 7: STEP 3
-            # NOTE: c_hat (in Module 7 paper) = q (here in code) ==> Yloadings
-            q_num = np.dot(np.transpose(t), y_new)
-            q_denom = np.dot(np.transpose(t), t)
-            q = q_num / q_denom
-
-            # Module 7: STEP 4
-            p_num = np.dot(np.transpose(X_new), t)
-            p_denom = np.dot(np.transpose(t), t)
-            p = p_num / p_denom
-
-            # Module 7: STEP 5
-            X_old = X_new.copy()
-            X_new = X_old - np.dot(t, np.transpose(p))
-
-            y_old = y_new.copy()
-            y_new = y_old - t*q
+        self.arrT, self.arrW, self.arrP, self.arrQ = eng.fitPLS1(self.arrX, self.vecy, self.numPC, self.algorithm, **self.algorithmOptions)
 
-            # Collect vectors t, p, u, q, w and
-            self.x_scoresList.append(t.reshape(-1))
-            self.x_loadingsList.append(p.reshape(-1))
-            self.y_loadingsList.append(q.reshape(-1))
-            self.x_loadingWeightsList.append(w.reshape(-1))
+        # Regression coefficients for all numbers of components
+        self.arrB = eng.pls1Coefficients(self.arrW, self.arrP, self.arrQ)
 
-            # Collect residuals
-            self.Y_residualsList.append(y_new)
-            self.X_residualsList.append(X_new)
+        # Residuals after each component are computed from T, P and Q when
+        # requested
+        self.X_residualsDict = res.ComponentResiduals(self.arrX, self.arrT, self.arrP)
+        self.Y_residualsDict = res.ComponentResiduals(self.vecy, self.arrT, self.arrQ)
 
-
-        # Construct T, P, U, Q and W from lists of vectors
-        self.arrT = np.array(np.transpose(self.x_scoresList))
-        self.arrP = np.array(np.transpose(self.x_loadingsList))
-        self.arrQ = np.array(np.transpose(self.y_loadingsList))
-        self.arrW = np.array(np.transpose(self.x_loadingWeightsList))
+        # Correlation loadings are computed when first requested
+        self.arr_XcorrLoadings = None
+        self.arr_ycorrLoadings = None
 
 
 
         # ========== COMPUTATIONS FOR X ==========
         # ---------------------------------------------------------------------
-        # Create a list holding arrays of Xhat predicted calibration after each
-        # component. Xhat is computed with Xhat = T*P'
-        self.calXpredList = []
-
-        # Compute Xhat for 1 and more components (cumulatively).
-        for ind in range(1,self.numPC+1):
-
-            part_arrT = self.arrT[:,0:ind]
-            part_arrP = self.arrP[:,0:ind]
-            predXcal = np.dot(part_arrT, np.transpose(part_arrP))
-
-            if self.Xstand:
-                Xhat = (predXcal * Xstd) + Xmeans
-            else:
-                Xhat = predXcal + Xmeans
-            self.calXpredList.append(Xhat)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Construct a dictionary that holds predicted X (Xhat) from calibration
-        # for each number of components.
-        self.calXpredDict = {}
-
-        for ind, item in enumerate(self.calXpredList):
-            self.calXpredDict[ind+1] = item
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect all PRESSE for individual variables in a dictionary.
-        # Keys represent number of component.
-        self.PRESSEdict_indVar_X = {}
-
-        # Compute PRESS for calibration / estimation
-        PRESSE_0_indVar_X = np.sum(np.square(st.center(self.arrX_input)), axis=0)
-        self.PRESSEdict_indVar_X[0] = PRESSE_0_indVar_X
-
-        # Compute PRESS for each Xhat for 1, 2, 3, etc number of components
-        # and compute explained variance
-        for ind, Xhat in enumerate(self.calXpredList):
-            diffX = self.arrX_input - Xhat
-            PRESSE_indVar_X = np.sum(np.square(diffX), axis=0)
-            self.PRESSEdict_indVar_X[ind+1] = PRESSE_indVar_X
-
-        # Now store all PRESSE values into an array. Then compute MSEE and
-        # RMSEE.
-        self.PRESSEarr_indVar_X = np.array(list(self.PRESSEdict_indVar_X.values()))
-        self.MSEEarr_indVar_X = self.PRESSEarr_indVar_X / np.shape(self.arrX_input)[0]
-        self.RMSEEarr_indVar_X = np.sqrt(self.MSEEarr_indVar_X)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute explained variance for each variable in X using the
-        # MSEE for each variable. Also collect PRESSE, MSEE, RMSEE in
-        # their respective dictionaries for each variable. Keys represent
-        # now variables and NOT components as above with
-        # self.PRESSEdict_indVar_X
-        self.cumCalExplVarXarr_indVar = np.zeros(np.shape(self.MSEEarr_indVar_X))
-        MSEE_0_indVar_X = self.MSEEarr_indVar_X[0,:]
-
-        for ind, MSEE_indVar_X in enumerate(self.MSEEarr_indVar_X):
-            explVar = (MSEE_0_indVar_X - MSEE_indVar_X) / MSEE_0_indVar_X * 100
-            self.cumCalExplVarXarr_indVar[ind] = explVar
-
-        self.PRESSE_indVar_X = {}
-        self.MSEE_indVar_X = {}
-        self.RMSEE_indVar_X = {}
-        self.cumCalExplVarX_indVar = {}
-
-        for ind in range(np.shape(self.PRESSEarr_indVar_X)[1]):
-            self.PRESSE_indVar_X[ind] = self.PRESSEarr_indVar_X[:,ind]
-            self.MSEE_indVar_X[ind] = self.MSEEarr_indVar_X[:,ind]
-            self.RMSEE_indVar_X[ind] = self.RMSEEarr_indVar_X[:,ind]
-            self.cumCalExplVarX_indVar[ind] = self.cumCalExplVarXarr_indVar[:,ind]
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect total PRESSE across all variables in a dictionary. Also,
-        # compute total calibrated explained variance in X.
-        self.PRESSE_total_dict_X = {}
-        self.PRESSE_total_list_X = np.sum(self.PRESSEarr_indVar_X, axis=1)
-
-        for ind, PRESSE_X in enumerate(self.PRESSE_total_list_X):
-            self.PRESSE_total_dict_X[ind] = PRESSE_X
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect total MSEE across all variables in a dictionary. Also,
-        # compute total validated explained variance in X.
-        self.MSEE_total_dict_X = {}
-        self.MSEE_total_list_X = np.sum(self.MSEEarr_indVar_X, axis=1) / np.shape(self.arrX_input)[1]
-        MSEE_0_X = self.MSEE_total_list_X[0]
-
-        # Compute total calibrated explained variance in X
-        self.XcumCalExplVarList = []
-        if not self.Xstand:
-            for ind, MSEE_X in enumerate(self.MSEE_total_list_X):
-                perc = (MSEE_0_X - MSEE_X) / MSEE_0_X * 100
-                self.MSEE_total_dict_X[ind] = MSEE_X
-                self.XcumCalExplVarList.append(perc)
-        else:
-            self.XcumCalExplVarArr = np.average(self.cumCalExplVarXarr_indVar, axis=1)
-            self.XcumCalExplVarList = list(self.XcumCalExplVarArr)
-
-        # Construct list with total validated explained variance in X
-        self.XcalExplVarList = []
-        for ind, item in enumerate(self.XcumCalExplVarList):
-            if ind == len(self.XcumCalExplVarList)-1:
-                break
-            explVarComp = self.XcumCalExplVarList[ind+1] - self.XcumCalExplVarList[ind]
-            self.XcalExplVarList.append(explVarComp)
-
-        # Construct a dictionary that holds predicted X (Xhat) from calibration
-        # for each number of components.
-        self.calXpredDict = {}
-        for ind, item in enumerate(self.calXpredList):
-            self.calXpredDict[ind+1] = item
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute total RMSEE and store values in a dictionary and list.
-        self.RMSEE_total_dict_X = {}
-        self.RMSEE_total_list_X = np.sqrt(self.MSEE_total_list_X)
-
-        for ind, RMSEE_X in enumerate(self.RMSEE_total_list_X):
-            self.RMSEE_total_dict_X[ind] = RMSEE_X
+        # Predicted X (Xhat) from calibration and the statistics for 0, 1,
+        # 2, etc number of components are computed when first requested, see
+        # results.CalibratedFits and results.ErrorStatistics.
+        self.calFitsX = res.CalibratedFits(self.arrX_input, self.arrT, self.arrP,
+                                           scale=Xstd if self.Xstand else None, offset=Xmeans)
+        self.calStatsX = res.ErrorStatistics(self.numPC, np.shape(self.arrX_input), standardised=self.Xstand,
+                                             source=self.calFitsX.press)
         # ---------------------------------------------------------------------
 
 
-
         # ========== COMPUTATIONS FOR y ============
-        # --------------------------------------------------------------------
-        # Create a list holding arrays of yhat predicted calibration after each
-        # component. yhat is computed with Yhat = T*Q'
-        self.calYpredList = []
-
-        for ind in range(1, self.numPC+1):
-
-            x_scores = self.arrT[:,0:ind]
-            y_loadings = self.arrQ[:,0:ind]
-
-            # Depending on whether Y was standardised or not compute Yhat
-            # accordingly.
-            if self.ystand:
-                yhat_stand = np.dot(x_scores, np.transpose(y_loadings))
-                yhat = (yhat_stand * yStd.reshape(1,-1)) + vecyMean.reshape(1,-1)
-            else:
-                yhat = np.dot(x_scores, np.transpose(y_loadings)) + vecyMean
-            self.calYpredList.append(yhat)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Construct a dictionary that holds predicted Y (Yhat) from calibration
-        # for each number of components.
-        self.calYpredDict = {}
-        for ind, item in enumerate(self.calYpredList):
-            self.calYpredDict[ind+1] = item
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect PRESSE for each PC in a dictionary.
-        # Keys represent number of component.
-        self.PRESSE_total_dict = {}
-        self.MSEE_total_dict = {}
-
-        # Compute PRESS and MSEE for calibration / estimation with zero
-        # components
-        PRESSE_0 = np.sum(np.square(st.center(self.vecy_input)))
-        self.PRESSE_total_dict[0] = PRESSE_0
-        MSEE_0 = PRESSE_0 / np.shape(self.vecy_input)[0]
-        self.MSEE_total_dict[0] = MSEE_0
-
-        # Compute PRESS and MSEE for each Yhat for 1, 2, 3, etc number of
-        # components and compute explained variance
-        for ind, yhat in enumerate(self.calYpredList):
-            diffy = self.vecy_input - yhat
-            PRESSE = np.sum(np.square(diffy))
-            self.PRESSE_total_dict[ind+1] = PRESSE
-            self.MSEE_total_dict[ind+1] = PRESSE / np.shape(self.vecy_input)[0]
-
-
-        # Compute total calibrated explained variance in Y
-        self.MSEE_total_list = self.MSEE_total_dict.values()
-
-        self.YcumCalExplVarList = []
-        for ind, MSEE in enumerate(self.MSEE_total_list):
-            perc = (MSEE_0 - MSEE) / MSEE_0 * 100
-            self.YcumCalExplVarList.append(perc)
-
-        # Construct list with total validated explained variance in Y
-        self.YcalExplVarList = []
-        for ind, item in enumerate(self.YcumCalExplVarList):
-            if ind == len(self.YcumCalExplVarList)-1:
-                break
-            explVarComp = self.YcumCalExplVarList[ind+1] - self.YcumCalExplVarList[ind]
-            self.YcalExplVarList.append(explVarComp)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute total RMSEP and store values in a dictionary and list.
-        self.RMSEE_total_dict = {}
-        self.RMSEE_total_list = np.sqrt(list(self.MSEE_total_list))
-
-
-        for ind, RMSEE in enumerate(self.RMSEE_total_list):
-            self.RMSEE_total_dict[ind] = RMSEE
         # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        self.PRESSEarr = np.array(list(self.PRESSE_total_dict.values()))
-        self.MSEEarr = np.array(list(self.MSEE_total_dict.values()))
-        self.RMSEEarr = np.array(list(self.RMSEE_total_dict.values()))
+        # Predicted Y (yhat) from calibration and the statistics for 0, 1,
+        # 2, etc number of components are computed when first requested, see
+        # results.CalibratedFits and results.ErrorStatistics.
+        self.calFitsY = res.CalibratedFits(self.vecy_input, self.arrT, self.arrQ,
+                                           scale=yStd.reshape(1,-1) if self.ystand else None, offset=vecyMean)
+        self.calStatsY = res.ErrorStatistics(self.numPC, np.shape(self.vecy_input), standardised=False,
+                                             source=self.calFitsY.press)
         # ---------------------------------------------------------------------
 
 
@@ -518,131 +362,77 @@ class nipalsPLS1:
                 pass
 
 
-            # Collect predicted y (i.e. yhat) for each CV segment in a
-            # dictionary according to numer of PC
-            self.valYpredDict = {}
-            for ind in range(1, self.numPC+1):
-                self.valYpredDict[ind] = np.zeros(np.shape(self.vecy_input))
-
-            # Construct a dictionary that holds predicted X (Xhat) from
-            # validation for each number of components.
-            self.valXpredDict = {}
-            for ind in range(1, self.numPC+1):
-                self.valXpredDict[ind] = np.zeros(np.shape(self.arrX_input))
-
-
-            # Collect train and test set in dictionaries for each PC and put
-            # them in this list.
-            self.cvTrainAndTestDataList = []
+            # Accumulate the validation errors of each CV segment in the
+            # validated statistics. Predicted y and X (i.e. yhat and Xhat) are
+            # collected in dictionaries according to number of PC if
+            # requested.
+            self.valStatsY = res.ErrorStatistics(self.numPC, np.shape(self.vecy_input), standardised=False)
+            self.valErrorsY = res.ValidationErrors(self.vecy_input, self.numPC, keep=self.cvPredictions,
+                                                   press=self.valStatsY.accumulator)
+            self.valYpredDict = self.valErrorsY.preds
+            self.valStatsX = res.ErrorStatistics(self.numPC, np.shape(self.arrX_input), standardised=self.Xstand)
+            self.valErrorsX = res.ValidationErrors(self.arrX_input, self.numPC, keep=self.cvPredictions,
+                                                   press=self.valStatsX.accumulator)
+            self.valXpredDict = self.valErrorsX.preds
 
 
             # Collect: validation X scores T, validation X loadings P,
             # validation Y scores U, validation Y loadings Q,
             # validation X loading weights W and scores regression coefficients C
-            # in lists for each PC
-            self.val_arrTlist = []
-            self.val_arrPlist = []
-            self.val_arrUlist = []
-            self.val_arrQlist = []
-            self.val_arrWlist = []
-            all_ytm = np.zeros(np.shape(self.vecy_input))
-            all_xtm = np.zeros(np.shape(self.arrX_input))
-
-
-            # First devide into combinations of training and test sets
-            for train_index, test_index in cvComb:
-                x_train, x_test = cv.split(train_index, test_index, self.arrX_input)
-                y_train, y_test = cv.split(train_index, test_index, self.vecy_input)
-
-                subDict = {}
-                subDict['x train'] = x_train
-                subDict['x test'] = x_test
-                subDict['y train'] = y_train
-                subDict['y test'] = y_test
-                self.cvTrainAndTestDataList.append(subDict)
-
-
-                # Collect X scores and Y loadings vectors from each iterations step
-                val_x_scoresList = []
-                val_x_loadingsList = []
-                # val_y_scoresList = []
-                val_y_loadingsList = []
-                val_x_loadingWeightsList = []
-
-
-                # Standardise X if requested by user, otherwise center X.
-                if self.Xstand:
-                    x_train_means = np.average(x_train, axis=0)
-                    x_train_std = np.std(x_train, axis=0, ddof=1)
-                    X_new = (x_train - x_train_means) / x_train_std
-                else:
-                    x_train_means = np.average(x_train, axis=0)
-                    X_new = x_train - x_train_means
-
-                # Standardise y if requested by user, otherwise center y.
-                if self.ystand:
-                    y_train_means = np.average(y_train)
-                    y_train_std = np.std(y_train, ddof=1)
-                    y_new = (y_train - y_train_means) / y_train_std
+            # in lists for each PC, if the segment models are kept
+            keepModels = self.cvRetention == "full"
+            self.val_arrTlist = [] if keepModels else None
+            self.val_arrPlist = [] if keepModels else None
+            self.val_arrUlist = [] if keepModels else None
+            self.val_arrQlist = [] if keepModels else None
+            self.val_arrWlist = [] if keepModels else None
+
+            # With downdating, the cross-products of the full data are
+            # computed once before looping over the segments.
+            if self.cvEngine == "downdate":
+                if self.algorithm == "kernel":
+                    downdater = eng.PLS1Downdate(self.arrX_input, self.vecy_input, **self.algorithmOptions)
                 else:
-                    y_train_means = np.average(y_train)
-                    y_new = y_train - y_train_means
-
-
-                # Compute j number of components
-                for j in range(self.numPC):
-
-                    # Module 7: STEP 1
-                    w_num = np.dot(np.transpose(X_new), y_new)
-                    w_denom = npla.norm(w_num)
-                    w = w_num / w_denom
-
-                    # Module 7: STEP 2
-                    t = np.dot(X_new, w)
-
-                    # Module 7: STEP 3
-                    q_num = np.dot(np.transpose(t), y_new)
-                    q_denom = np.dot(np.transpose(t), t)
-                    q = q_num / q_denom
-
-                    # Module 7: STEP 4
-                    p_num = np.dot(np.transpose(X_new), t)
-                    p_denom = np.dot(np.transpose(t), t)
-                    p = p_num / p_denom
-
-                    # Module 7: STEP 5
-                    X_old = X_new.copy()
-                    X_new = X_old - np.dot(t, np.transpose(p))
-
-                    y_old = y_new.copy()
-                    y_new = y_old - t*q
-
-                    # Collect vectors t, p, u, q, w and
-                    val_x_scoresList.append(t.reshape(-1))
-                    val_x_loadingsList.append(p.reshape(-1))
-                    val_y_loadingsList.append(q.reshape(-1))
-                    val_x_loadingWeightsList.append(w.reshape(-1))
-
-
-                # Construct T, P, U, Q and W from lists of vectors
-                val_arrT = np.array(np.transpose(val_x_scoresList))
-                val_arrP = np.array(np.transpose(val_x_loadingsList))
-                val_arrQ = np.array(np.transpose(val_y_loadingsList))
-                val_arrW = np.array(np.transpose(val_x_loadingWeightsList))
-
-                self.val_arrTlist.append(val_arrT)
-                self.val_arrPlist.append(val_arrP)
-                self.val_arrQlist.append(val_arrQ)
-                self.val_arrWlist.append(val_arrW)
+                    downdater = eng.PLS1Downdate(self.arrX_input, self.vecy_input)
+            else:
+                downdater = None
+
+
+            # First devide into combinations of training and test sets. The
+            # PLS1 models of the training sets are computed in segment order,
+            # possibly in parallel, before the results are assembled below.
+            # With downdating, training scores are not computed.
+            segments = list(cvComb)
+            segModels = parallel.mapSegments(eng.pls1Segment, segments, n_jobs=self.n_jobs,
+                                             arrX=self.arrX_input, vecy=self.vecy_input,
+                                             numComp=self.numPC, Xstand=self.Xstand,
+                                             ystand=self.ystand, algorithm=self.algorithm,
+                                             algorithmOptions=self.algorithmOptions,
+                                             downdater=downdater)
+
+            # Train and test sets of each segment. Training sets are not
+            # copied with downdating.
+            segmentData = res.SegmentData(segments, [('x', self.arrX_input), ('y', self.vecy_input)],
+                                          train=[] if self.cvEngine == "downdate" else None)
+
+            for (train_index, test_index), segModel in zip(segments, segModels):
+                x_train_means, x_train_std, y_train_means, y_train_std, \
+                    val_arrT, val_arrW, val_arrP, val_arrQ = segModel
+                x_test = self.arrX_input[test_index]
+
+                if keepModels:
+                    self.val_arrTlist.append(val_arrT)
+                    self.val_arrPlist.append(val_arrP)
+                    self.val_arrQlist.append(val_arrQ)
+                    self.val_arrWlist.append(val_arrW)
 
                 # Give vector y_train_mean the correct dimension in
                 # numpy, so matrix multiplication will be possible
                 # i.e from dimension (x,) to (1,x)
                 ytm = y_train_means.reshape(1,-1)
                 xtm = x_train_means.reshape(1,-1)
-                for ind_test in range(np.shape(y_test)[0]):
-                    all_ytm[test_index,] = ytm
-                    all_xtm[test_index,] = xtm
+                self.valErrorsY.add(0, test_index, ytm)
+                self.valErrorsX.add(0, test_index, xtm)
 
 
 
@@ -666,210 +456,50 @@ class nipalsPLS1:
                     x_old = x_new
                     x_new = x_old - np.dot(t,np.transpose(p))
 
-                    # Generate a vector t that gets longer by one element with
-                    # each PC
+                    # Collect the scores of all PC's
                     t_list.append(t)
-                    t_vec = np.hstack(t_list)
+                t_vec = np.hstack(t_list)
 
-                    # Get relevant part of Q for specific number of PC's
-                    part_val_arrP = val_arrP[:,0:ind+1]
-                    part_val_arrQ = val_arrQ[0,0:ind+1]
+                # Module 8: Prediction STEP 3
+                # ---------------------------
+                # Predict for one PC, then two, three, etc, adding one PC at
+                # a time
+                cumFits = zip(eng.cumulativeFits(t_vec, val_arrQ), eng.cumulativeFits(t_vec, val_arrP))
+                for ind, (tQ, tP_proc) in enumerate(cumFits):
 
-                    # Module 8: Prediction STEP 3
-                    # ---------------------------
                     # First compute yhat
                     if self.ystand:
-                        tCQ = np.dot(t_vec,part_val_arrQ) * y_train_std.reshape(1,-1)
+                        tCQ = tQ * y_train_std.reshape(1,-1)
                     else:
-                        tCQ = np.dot(t_vec,part_val_arrQ)
+                        tCQ = tQ
 
-                    yhat = np.transpose(ytm + tCQ)
-                    self.valYpredDict[ind+1][test_index,] = yhat
+                    yhat = ytm + tCQ
+                    self.valErrorsY.add(ind+1, test_index, yhat)
 
                     # Then compute Xhat
                     if self.Xstand:
-                        tP = np.dot(t_vec,np.transpose(part_val_arrP)) * x_train_std.reshape(1,-1)
+                        tP = tP_proc * x_train_std.reshape(1,-1)
                     else:
-                        tP = np.dot(t_vec, np.transpose(part_val_arrP))
+                        tP = tP_proc
 
                     xhat = xtm + tP
-                    self.valXpredDict[ind+1][test_index,] = xhat
-
-
-
-
-            # ========== COMPUTATIONS FOR y ============
-            # -----------------------------------------------------------------
-            # Convert vectors from CV segments stored in lists into matrices
-            # for each PC
-            self.valYpredList = list(self.valYpredDict.values())
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect all PRESSCV for individual variables in a dictionary.
-            # Keys represent number of component.
-            self.PRESSCV_total_dict = {}
-            self.MSECV_total_dict = {}
-
-            # Compute PRESS for validation
-            PRESSCV_0 = np.sum(np.square(self.vecy_input-all_ytm), axis=0)
-            self.PRESSCV_total_dict[0] = PRESSCV_0
-            MSECV_0 = PRESSCV_0 / np.shape(self.vecy_input)[0]
-            self.MSECV_total_dict[0] = list(MSECV_0)[0]
-            # -----------------------------------------------------------------
-
-            # -----------------------------------------------------------------
-            # Compute PRESSCV and MSECV for each Yhat for 1, 2, 3, etc number
-            # of components and compute explained variance
-            for ind, yhat in enumerate(self.valYpredList):
-                diffy = self.vecy_input - yhat
-                PRESSCV = np.sum(np.square(diffy))
-                self.PRESSCV_total_dict[ind+1] = PRESSCV
-                self.MSECV_total_dict[ind+1] = PRESSCV / np.shape(self.vecy_input)[0]
-
-            # Compute total validated explained variance in Y
-            self.MSECV_total_list = self.MSECV_total_dict.values()
-
-            self.YcumValExplVarList = []
-            for ind, MSECV in enumerate(self.MSECV_total_list):
-                perc = (MSECV_0 - MSECV) / MSECV_0 * 100
-                self.YcumValExplVarList.append(perc[0])
-
-            # Construct list with total validated explained variance in Y
-            self.YvalExplVarList = []
-            for ind, item in enumerate(self.YcumValExplVarList):
-                if ind == len(self.YcumValExplVarList)-1:
-                    break
-                explVarComp = self.YcumValExplVarList[ind+1] - self.YcumValExplVarList[ind]
-                self.YvalExplVarList.append(explVarComp)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute total RMSECV and store values in a dictionary and list.
-            self.RMSECV_total_dict = {}
-            self.RMSECV_total_list = np.sqrt(list(self.MSECV_total_list))
-
-            for ind, RMSECV in enumerate(self.RMSECV_total_list):
-                self.RMSECV_total_dict[ind] = RMSECV
-            # -----------------------------------------------------------------
-
-            # -----------------------------------------------------------------
-            self.PRESSCVarr = np.array(list(self.PRESSCV_total_dict.values()))
-            self.MSECVarr = np.array(list(self.MSECV_total_dict.values()))
-            self.RMSECVarr = np.array(list(self.RMSECV_total_dict.values()))
-            # -----------------------------------------------------------------
-
-
-
-
-            # ========== COMPUTATIONS FOR X ============
-            # -----------------------------------------------------------------
-            # Convert vectors from CV segments stored in lists into matrices
-            # for each PC
-            self.valXpredList = self.valXpredDict.values()
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect all PRESSCV for individual variables in X in a dictionary.
-            # Keys represent number of component.
-            self.PRESSCVdict_indVar_X = {}
-
-            # First compute PRESSCV for zero components
-            PRESSCV_0_indVar_X = np.sum(np.square(self.arrX_input-all_xtm), axis=0)
-            self.PRESSCVdict_indVar_X[0] = PRESSCV_0_indVar_X
-
-            # Compute PRESS for each Xhat for 1, 2, 3, etc number of components
-            # and compute explained variance
-            for ind, Xhat in enumerate(self.valXpredList):
-                diffX = self.arrX_input - Xhat
-                PRESSCV_indVar_X = np.sum(np.square(diffX), axis=0)
-                self.PRESSCVdict_indVar_X[ind+1] = PRESSCV_indVar_X
-
-            # Now store all PRESSE values into an array. Then compute MSEE and
-            # RMSEE.
-            self.PRESSCVarr_indVar_X = np.array(list(self.PRESSCVdict_indVar_X.values()))
-            self.MSECVarr_indVar_X = self.PRESSCVarr_indVar_X / np.shape(self.arrX_input)[0]
-            self.RMSECVarr_indVar_X = np.sqrt(self.MSECVarr_indVar_X)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute explained variance for each variable in X using the
-            # MSEP for each variable. Also collect PRESS, MSECV, RMSECV in
-            # their respective dictionaries for each variable. Keys represent
-            # now variables and NOT components as above with
-            # self.PRESSdict_indVar
-            self.cumValExplVarXarr_indVar = np.zeros(np.shape(self.MSECVarr_indVar_X))
-            MSECV_0_indVar_X = self.MSECVarr_indVar_X[0,:]
-
-            for ind, MSECV_indVar_X in enumerate(self.MSECVarr_indVar_X):
-                explVar = (MSECV_0_indVar_X - MSECV_indVar_X) / MSECV_0_indVar_X * 100
-                self.cumValExplVarXarr_indVar[ind] = explVar
-
-            self.PRESSCV_indVar_X = {}
-            self.MSECV_indVar_X = {}
-            self.RMSECV_indVar_X = {}
-            self.cumValExplVarX_indVar = {}
-
-            for ind in range(np.shape(self.PRESSCVarr_indVar_X)[1]):
-                self.PRESSCV_indVar_X[ind] = self.PRESSCVarr_indVar_X[:,ind]
-                self.MSECV_indVar_X[ind] = self.MSECVarr_indVar_X[:,ind]
-                self.RMSECV_indVar_X[ind] = self.RMSECVarr_indVar_X[:,ind]
-                self.cumValExplVarX_indVar[ind] = self.cumValExplVarXarr_indVar[:,ind]
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total PRESSCV across all variables in a dictionary.
-            self.PRESSCV_total_dict_X = {}
-            self.PRESSCV_total_list_X = np.sum(self.PRESSCVarr_indVar_X, axis=1)
-
-            for ind, PRESSCV_X in enumerate(self.PRESSCV_total_list_X):
-                self.PRESSCV_total_dict_X[ind] = PRESSCV_X
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total MSECV across all variables in a dictionary. Also,
-            # compute total validated explained variance in X.
-            self.MSECV_total_dict_X = {}
-            self.MSECV_total_list_X = np.sum(self.MSECVarr_indVar_X, axis=1) / np.shape(self.arrX_input)[1]
-            MSECV_0_X = self.MSECV_total_list_X[0]
-
-            # Compute total validated explained variance in X
-            self.XcumValExplVarList = []
-            if not self.Xstand:
-                for ind, MSECV_X in enumerate(self.MSECV_total_list_X):
-                    perc = (MSECV_0_X - MSECV_X) / MSECV_0_X * 100
-                    self.MSECV_total_dict_X[ind] = MSECV_X
-                    self.XcumValExplVarList.append(perc)
+                    self.valErrorsX.add(ind+1, test_index, xhat)
+
+            # Keep the training and test sets of the segments, either as
+            # copies or as index arrays they are extracted from on request.
+            if self.cvRetention == "full":
+                self.cvTrainAndTestDataList = list(segmentData)
+            elif self.cvRetention == "indices":
+                self.cvTrainAndTestDataList = segmentData
             else:
-                self.XcumValExplVarArr = np.average(self.cumValExplVarXarr_indVar, axis=1)
-                self.XcumValExplVarList = list(self.XcumValExplVarArr)
+                self.cvTrainAndTestDataList = None
 
-            # Construct list with total validated explained variance in X in
-            # each component
-            self.XvalExplVarList = []
-            for ind, item in enumerate(self.XcumValExplVarList):
-                if ind == len(self.XcumValExplVarList)-1:
-                    break
-                explVarComp = self.XcumValExplVarList[ind+1] - self.XcumValExplVarList[ind]
-                self.XvalExplVarList.append(explVarComp)
-            # -----------------------------------------------------------------
 
 
-            # -----------------------------------------------------------------
-            # Compute total RMSECV and store values in a dictionary and list.
-            self.RMSECV_total_dict_X = {}
-            self.RMSECV_total_list_X = np.sqrt(self.MSECV_total_list_X)
-
-            for ind, RMSECV_X in enumerate(self.RMSECV_total_list_X):
-                self.RMSECV_total_dict_X[ind] = RMSECV_X
-            # -----------------------------------------------------------------
 
+            # The PRESSCV (PRediction Error Sum of Squares) of X and Y were
+            # accumulated segment by segment. The validated statistics are
+            # computed from them when first requested.
 
 
     def modelSettings(self):
@@ -885,6 +515,12 @@ class nipalsPLS1:
         settingsDict['Xstand'] = self.Xstand
         settingsDict['ystand'] = self.ystand
         settingsDict['cv type'] = self.cvType
+        settingsDict['algorithm'] = self.algorithm
+        settingsDict['algorithmOptions'] = self.algorithmOptions
+        settingsDict['cvEngine'] = self.cvEngine
+        settingsDict['n_jobs'] = self.n_jobs
+        settingsDict['cvPredictions'] = self.cvPredictions
+        settingsDict['cvRetention'] = self.cvRetention
 
         return settingsDict
 
@@ -927,21 +563,11 @@ class nipalsPLS1:
         correlation loadings for component 2, etc.
         """
 
-        # Creates empty matrix for correlation loadings
-        arr_XcorrLoadings = np.zeros((np.shape(self.arrT)[1], np.shape(self.arrP)[0]), float)
-
-        # Compute correlation loadings:
-        # For each component in score matrix
-        for PC in range(np.shape(self.arrT)[1]):
-            PCscores = self.arrT[:, PC]
-
-            # For each variable/attribute in original matrix (not meancentered)
-            for var in range(np.shape(self.arrX)[1]):
-                origVar = self.arrX[:, var]
-                corrs = np.corrcoef(PCscores, origVar)
-                arr_XcorrLoadings[PC, var] = corrs[0,1]
-
-        self.arr_XcorrLoadings = np.transpose(arr_XcorrLoadings)
+        # Computed once from one product of the normalised scores and data,
+        # see engines.corrLoadings
+        if self.arr_XcorrLoadings is None:
+            self.arr_XcorrLoadings = eng.corrLoadings(self.arrT, self.arrX)
+            self.arr_XcorrLoadings.flags.writeable = False
 
         return self.arr_XcorrLoadings
 
@@ -951,14 +577,7 @@ class nipalsPLS1:
         Returns a dictionary holding the residual arrays for array X after
         each computed component. Dictionary key represents order of component.
         """
-        # Create empty dictionary that will hold residuals
-        X_residualsDict = {}
-
-        # Fill dictionary with residuals arrays from residuals list
-        for ind, item in enumerate(self.X_residualsList):
-            X_residualsDict[ind] = item
-
-        return X_residualsDict
+        return self.X_residualsDict
 
 
     def X_calExplVar(self):
@@ -967,7 +586,7 @@ class nipalsPLS1:
         each component. First number in list is for component 1, second number
         for component 2, etc.
         """
-        return self.XcalExplVarList
+        return list(self.calStatsX.explVar)
 
 
     def X_cumCalExplVar_indVar(self):
@@ -977,7 +596,7 @@ class nipalsPLS1:
         components, second row represents one component, third row represents
         two components, etc. Columns represent variables.
         """
-        return self.cumCalExplVarXarr_indVar
+        return self.calStatsX.cumExplVar_indVar
 
 
     def X_cumCalExplVar(self):
@@ -985,7 +604,7 @@ class nipalsPLS1:
         Returns a list holding the cumulative calibrated explained variance
         for array X after each component.
         """
-        return self.XcumCalExplVarList
+        return list(self.calStatsX.cumExplVar)
 
 
     def X_predCal(self):
@@ -994,7 +613,7 @@ class nipalsPLS1:
         calibration after each computed component. Dictionary key represents
         order of component.
         """
-        return self.calXpredDict
+        return self.calFitsX.predictions()
 
 
     def X_PRESSE_indVar(self):
@@ -1004,7 +623,7 @@ class nipalsPLS1:
         is PRESSE for zero components, second row for component 1, third row
         for component 2, etc.
         """
-        return self.PRESSEarr_indVar_X
+        return self.calStatsX.PRESS_indVar
 
 
     def X_PRESSE(self):
@@ -1014,7 +633,7 @@ class nipalsPLS1:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSE_total_list_X
+        return self.calStatsX.PRESS
 
 
     def X_MSEE_indVar(self):
@@ -1024,7 +643,7 @@ class nipalsPLS1:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEEarr_indVar_X
+        return self.calStatsX.MSE_indVar
 
 
     def X_MSEE(self):
@@ -1034,7 +653,7 @@ class nipalsPLS1:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEE_total_list_X
+        return self.calStatsX.MSE
 
 
     def X_RMSEE_indVar(self):
@@ -1044,7 +663,7 @@ class nipalsPLS1:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEEarr_indVar_X
+        return self.calStatsX.RMSE_indVar
 
 
     def X_RMSEE(self):
@@ -1054,7 +673,7 @@ class nipalsPLS1:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEE_total_list_X
+        return self.calStatsX.RMSE
 
 
     def X_valExplVar(self):
@@ -1063,7 +682,7 @@ class nipalsPLS1:
         each component. First number in list is for component 1, second number
         for component 2, third number for component 3, etc.
         """
-        return self.XvalExplVarList
+        return list(self.valStatsX.explVar)
 
 
     def X_cumValExplVar_indVar(self):
@@ -1073,7 +692,7 @@ class nipalsPLS1:
         zero components, second row represents component 1, third row for
         compnent 2, etc. Columns represent variables.
         """
-        return self.cumValExplVarXarr_indVar
+        return self.valStatsX.cumExplVar_indVar
 
 
     def X_cumValExplVar(self):
@@ -1082,15 +701,16 @@ class nipalsPLS1:
         for array X after each component. First number represents zero
         components, second number represents component 1, etc.
         """
-        return self.XcumValExplVarList
+        return list(self.valStatsX.cumExplVar)
 
 
     def X_predVal(self):
         """
         Returns dictionary holding arrays of predicted Xhat after each
         component from validation. Dictionary key represents order of
-        component.
+        component. Only available with ``cvPredictions = True``.
         """
+        assert self.valXpredDict is not None, ValueError('validated predictions are only kept with cvPredictions=True')
         return self.valXpredDict
 
 
@@ -1101,7 +721,7 @@ class nipalsPLS1:
         row is PRESSCV for zero components, second row for component 1, third
         row for component 2, etc.
         """
-        return self.PRESSCVarr_indVar_X
+        return self.valStatsX.PRESS_indVar
 
 
     def X_PRESSCV(self):
@@ -1111,7 +731,7 @@ class nipalsPLS1:
         PRESSCV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSCV_total_list_X
+        return self.valStatsX.PRESS
 
 
     def X_MSECV_indVar(self):
@@ -1120,7 +740,7 @@ class nipalsPLS1:
         cross validation. First row is MSECV for zero components, second row
         for component 1, etc.
         """
-        return self.MSECVarr_indVar_X
+        return self.valStatsX.MSE_indVar
 
 
     def X_MSECV(self):
@@ -1130,7 +750,7 @@ class nipalsPLS1:
         MSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSECV_total_list_X
+        return self.valStatsX.MSE
 
 
     def X_RMSECV_indVar(self):
@@ -1140,7 +760,7 @@ class nipalsPLS1:
         RMSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSECVarr_indVar_X
+        return self.valStatsX.RMSE_indVar
 
 
     def X_RMSECV(self):
@@ -1150,7 +770,7 @@ class nipalsPLS1:
         RMSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSECV_total_list_X
+        return self.valStatsX.RMSE
 
 
     def X_scores_predict(self, Xnew, numComp=None):
@@ -1207,21 +827,11 @@ class nipalsPLS1:
         component 2, etc.
         """
 
-        # Creates empty matrix for correlation loadings
-        arr_ycorrLoadings = np.zeros((np.shape(self.arrT)[1], np.shape(self.arrQ)[0]), float)
-
-        # Compute correlation loadings:
-        # For each PC in score matrix
-        for PC in range(np.shape(self.arrT)[1]):
-            PCscores = self.arrT[:, PC]
-
-            # For each variable/attribute in original matrix (not meancentered)
-            for var in range(np.shape(self.vecy)[1]):
-                origVar = self.vecy[:, var]
-                corrs = np.corrcoef(PCscores, origVar)
-                arr_ycorrLoadings[PC, var] = corrs[0,1]
-
-        self.arr_ycorrLoadings = np.transpose(arr_ycorrLoadings)
+        # Computed once from one product of the normalised scores and data,
+        # see engines.corrLoadings
+        if self.arr_ycorrLoadings is None:
+            self.arr_ycorrLoadings = eng.corrLoadings(self.arrT, self.vecy)
+            self.arr_ycorrLoadings.flags.writeable = False
 
         return self.arr_ycorrLoadings
 
@@ -1231,10 +841,7 @@ class nipalsPLS1:
         Returns list of arrays holding residuals of vector y after each
         component.
         """
-        Y_residualsDict = {}
-        for ind, item in enumerate(self.Y_residualsList):
-            Y_residualsDict[ind] = item
-        return Y_residualsDict
+        return self.Y_residualsDict
 
 
     def Y_calExplVar(self):
@@ -1242,7 +849,7 @@ class nipalsPLS1:
         Returns list holding calibrated explained variance for each component
         in vector y.
         """
-        return self.YcalExplVarList
+        return list(self.calStatsY.explVar)
 
 
     def Y_cumCalExplVar(self):
@@ -1251,7 +858,7 @@ class nipalsPLS1:
         each component. First number represent zero components, second number
         one component, etc.
         """
-        return self.YcumCalExplVarList
+        return list(self.calStatsY.cumExplVar)
 
 
     def Y_predCal(self):
@@ -1259,7 +866,7 @@ class nipalsPLS1:
         Returns dictionary holding arrays of predicted yhat after each component
         from calibration. Dictionary key represents order of components.
         """
-        return self.calYpredDict
+        return self.calFitsY.predictions()
 
 
     def Y_PRESSE(self):
@@ -1268,7 +875,7 @@ class nipalsPLS1:
         after each computed component. First row is PRESSE for zero components,
         second row component 1, third row for component 2, etc.
         """
-        return self.PRESSEarr
+        return self.calStatsY.PRESS
 
 
     def Y_MSEE(self):
@@ -1277,7 +884,7 @@ class nipalsPLS1:
         calibration after each component. First row holds MSEE for zero
         components, second row component 1, third row for component 2, etc.
         """
-        return self.MSEEarr
+        return self.calStatsY.MSE
 
 
     def Y_RMSEE(self):
@@ -1286,7 +893,7 @@ class nipalsPLS1:
         after each computed component. First row is RMSEE for zero
         components, second row component 1, third row for component 2, etc.
         """
-        return self.RMSEEarr
+        return self.calStatsY.RMSE
 
 
     def Y_valExplVar(self):
@@ -1294,7 +901,7 @@ class nipalsPLS1:
         Returns list holding validated explained variance for each component in
         vector y.
         """
-        return self.YvalExplVarList
+        return list(self.valStatsY.explVar)
 
 
     def Y_cumValExplVar(self):
@@ -1302,14 +909,16 @@ class nipalsPLS1:
         Returns list holding cumulative validated explained variance in
         vector y.
         """
-        return self.YcumValExplVarList
+        return list(self.valStatsY.cumExplVar)
 
 
     def Y_predVal(self):
         """
         Returns dictionary holding arrays of predicted yhat after each
         component from validation. Dictionary key represents order of component.
+        Only available with ``cvPredictions = True``.
         """
+        assert self.valYpredDict is not None, ValueError('validated predictions are only kept with cvPredictions=True')
         return self.valYpredDict
 
 
@@ -1320,7 +929,7 @@ class nipalsPLS1:
         zero components, second row component 1, third row for component 2,
         etc.
         """
-        return self.PRESSCVarr
+        return self.valStatsY.PRESS
 
 
     def Y_MSECV(self):
@@ -1329,7 +938,7 @@ class nipalsPLS1:
         validation after each computed component. First row is MSECV for
         zero components, second row component 1, third row for component 2, etc.
         """
-        return self.MSECVarr
+        return self.valStatsY.MSE
 
 
     def Y_RMSECV(self):
@@ -1338,7 +947,7 @@ class nipalsPLS1:
         validation after each computed component. First row is RMSECV for zero
         components, second row component 1, third row for component 2, etc.
         """
-        return self.RMSECVarr
+        return self.valStatsY.RMSE
 
 
     def regressionCoefficients(self, numComp=1):
@@ -1349,15 +958,17 @@ class nipalsPLS1:
         assert numComp <= self.numPC, ValueError('Maximum numComp = ' + str(self.numPC))
         assert numComp > -1, ValueError('numComp must be >= 0')
 
-        # B = W*inv(P'W)*Q'
+        # B = W*inv(P'W)*Q', computed for all numbers of components by a
+        # recurrence when the model was fitted.
+        if numComp == 0:
+            coeffs = np.zeros((np.shape(self.arrB)[0], 1))
+        else:
+            coeffs = self.arrB[:, numComp-1:numComp]
+
         if self.ystand:
-            return np.dot(np.dot(self.arrW[:, 0:numComp],
-                                 np.linalg.inv(np.dot(np.transpose(self.arrP[:, 0:numComp]), self.arrW[:, 0:numComp]))),
-                          np.transpose(self.arrQ[:, 0:numComp])) * np.std(self.vecy_input, ddof=1, axis=0).reshape(1, -1)
+            return coeffs * np.std(self.vecy_input, ddof=1, axis=0).reshape(1, -1)
         else:
-            return np.dot(np.dot(self.arrW[:, 0:numComp],
-                                 np.linalg.inv(np.dot(np.transpose(self.arrP[:, 0:numComp]), self.arrW[:, 0:numComp]))),
-                          np.transpose(self.arrQ[:, 0:numComp]))
+            return coeffs.copy()
 
 
     def Y_predict(self, Xnew, numComp=1):
@@ -1380,11 +991,29 @@ class nipalsPLS1:
 
 
 
+    def freeze(self):
+        """
+        Returns an immutable predictor for new X data, which holds only the
+        means, scales, loadings and regression coefficients. It does not
+        refer to the training data, see hoggorm.predictor.Predictor.
+        """
+        Xmeans = np.average(self.arrX_input, axis=0)
+        Xstd = np.std(self.arrX_input, ddof=1, axis=0) if self.Xstand else None
+        yStd = np.std(self.vecy_input, ddof=1) if self.ystand else None
+
+        # Scores of new X data: x_new * W*inv(P'W), with the weights from
+        # the same recurrence as the regression coefficients
+        arrR = eng.pls1Weights(self.arrW, self.arrP)
+
+        return pred.Predictor(Xmeans, Xstd, arrR, Ymeans=np.average(self.vecy_input), Yscale=yStd, arrQ=self.arrQ)
+
+
     def cvTrainAndTestData(self):
         """
         Returns a list consisting of dictionaries holding training and test
-        sets.
+        sets. Not available with ``cvRetention = "none"``.
         """
+        assert self.cvTrainAndTestDataList is not None, ValueError('training and test sets are not kept with cvRetention="none"')
         return self.cvTrainAndTestDataList
 
 
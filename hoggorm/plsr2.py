@@ -2,9 +2,11 @@
 
 # Import necessary modules
 import numpy as np
-import numpy.linalg as npla
-import hoggorm.statTools as st
 import hoggorm.cross_val as cv
+import hoggorm.engines as eng
+import hoggorm.parallel as parallel
+import hoggorm.results as res
+import hoggorm.predictor as pred
 
 
 class nipalsPLS2:
@@ -61,6 +63,69 @@ class nipalsPLS2:
 
             Sequence of lables. Must be same lenght as number of rows in ``arrX`` and ``arrY``. Leaves out objects with same lable.
 
+    algorithm : str, optional
+        Defines how the PLS2 components are computed, both for the model and
+        for the models of each cross validation segment.
+
+        nipals : components are extracted one at a time by NIPALS, iterating the Y scores and deflating X and Y (default)
+            ``algorithm = "nipals"``
+
+        simpls : SIMPLS, deflating only the cross-covariance X'Y with one eigenvector step per component, suited for many responses
+            ``algorithm = "simpls"``
+
+        With one response both algorithms give the same model up to floating
+        point error. With several responses the first component is the same,
+        while later components may differ slightly, since SIMPLS maximises
+        the covariance with the original Y rather than with the deflated Y.
+
+    algorithmOptions : dict, optional
+        Settings for the chosen algorithm. For ``algorithm = "nipals"`` this
+        is ``deflation`` (str, default "explicit"). With ``"implicit"`` the
+        residual matrices are never formed, such that no copies of the
+        pre-processed X and Y are needed during the fit.
+
+    warmStart : boolean, optional
+        If True, NIPALS in each cross validation segment starts from the
+        projection of the training set onto the Y loadings of the model of all
+        objects, instead of from the first column of Y. The segment
+        models are the same up to the convergence threshold and need fewer
+        iterations (about a third fewer on the cheese data of the tests).
+        Only used with ``algorithm = "nipals"``
+        (default False).
+
+    n_jobs : int, optional
+        Number of processes used for computing the models of the cross
+        validation segments. With 1 all segments are computed in the current
+        process. With -1 all CPUs are used, with -2 all but one, etc. If not
+        provided, the number of workers of the execution context is used,
+        which by default is 1 (see ``hoggorm.executionContext``). Results
+        are assembled in segment order and are identical to those of a
+        serial run.
+
+    cvPredictions : boolean, optional
+        Whether the validated predictions of X and Y are kept (default
+        True). The validated statistics are accumulated as each cross
+        validation segment finishes and do not need them. With False,
+        ``X_predVal`` and ``Y_predVal`` are not available and memory use
+        for validation is of the order of numComp x p instead of
+        numComp x n x p.
+
+    cvRetention : str, optional
+        What is kept of the cross validation segments.
+
+            ``cvRetention = "full"``
+            Copies of the training and test sets returned by
+            ``cvTrainAndTestData`` and the segment models (scores, loadings and loading weights) in
+            ``val_arrTlist``, ``val_arrPlist``, etc. (default).
+
+            ``cvRetention = "indices"``
+            Only the index arrays of the segments. ``cvTrainAndTestData``
+            extracts the training and test sets from the input data when
+            an element is requested. The segment models are not kept.
+
+            ``cvRetention = "none"``
+            Nothing, ``cvTrainAndTestData`` is not available.
+
 
     RETURNS
     -------
@@ -91,6 +156,8 @@ class nipalsPLS2:
     >>> model = ho.nipalsPLS2(arrX=my_X_data, arrY=my_Y_data, cvType=["loo"])
     >>> model = ho.nipalsPLS2(arrX=my_X_data, arrY=my_Y_data, cvType=["KFold", 7])
     >>> model = ho.nipalsPLS2(arrX=my_X_data, arrY=my_Y_data, cvType=["lolo", [1, 2, 3, 4, 5, 6, 7, 1, 2, 3, 4, 5, 6, 7]])
+    >>> model = ho.nipalsPLS2(arrX=my_X_data, arrY=my_Y_data, algorithm="simpls")
+    >>> model = ho.nipalsPLS2(arrX=my_X_data, arrY=my_Y_data, cvType=["loo"], n_jobs=-1)
 
     Examples of how to extract results from the PLS2 model.
 
@@ -101,7 +168,8 @@ class nipalsPLS2:
     >>> Y_cumulativeValidatedExplainedVariance_total = model.Y_cumCalExplVar()
     """
 
-    def __init__(self, arrX, arrY, numComp=None, Xstand=False, Ystand=False, cvType=None):
+    @parallel.honourContext
+    def __init__(self, arrX, arrY, numComp=None, Xstand=False, Ystand=False, cvType=None, algorithm="nipals", algorithmOptions=None, warmStart=False, n_jobs=None, cvPredictions=True, cvRetention="full"):
         """
         On initialisation check whether number of PC's chosen by user is given
         and smaller than maximum number of PC's possible.Then check how X and Y
@@ -121,6 +189,29 @@ class nipalsPLS2:
         # Check whether cvType is provided. If NOT, then no cross validation
         # is carried out.
         self.cvType = cvType
+
+
+        # Check which algorithm is to be used for computing the components.
+        assert algorithm in eng.PLS2_ALGORITHMS, ValueError('algorithm must be one of ' + str(eng.PLS2_ALGORITHMS))
+        self.algorithm = algorithm
+        if algorithmOptions is None:
+            self.algorithmOptions = {}
+        else:
+            self.algorithmOptions = dict(algorithmOptions)
+
+        # Warm start NIPALS in the CV segments from the full model
+        self.warmStart = warmStart
+
+        # Keep the validated predictions
+        self.cvPredictions = cvPredictions
+
+        # What to keep of the CV segments
+        assert cvRetention in res.CV_RETENTION, ValueError('cvRetention must be one of ' + str(res.CV_RETENTION))
+        self.cvRetention = cvRetention
+
+        # Number of processes used for cross validation
+        self.n_jobs = parallel.resolveJobs(n_jobs)
+        parallel.numWorkers(self.n_jobs)
         
         
         # Depict the number of components that are possible to compute based
@@ -148,9 +239,6 @@ class nipalsPLS2:
         # components that can be computed.
         segSizes = []
         for train_index, test_index in cvComb:
-            x_train, x_test = cv.split(train_index, test_index, self.arrX_input)
-            y_train, y_test = cv.split(train_index, test_index, self.arrY_input)
-            
             segSizes.append(numObj - sum(train_index))
         
         
@@ -199,368 +287,47 @@ class nipalsPLS2:
             self.arrY = self.arrY_input - Ymeans
 
 
-        # Before PLS2 NIPALS algorithm starts initiate dictionaries and lists
-        # in which results are stored.
-        self.x_scoresList = []
-        self.y_scoresList = []
-        self.x_loadingsList = []
-        self.y_loadingsList = []
-        self.y_loadingsList_alt = []
-        self.x_loadingWeightsList = []
-        self.coeffList = []
-        self.Y_residualsList = [self.arrY]
-        self.X_residualsList = [self.arrX]
-
-
         # ===============================================================================
-        #        Here PLS2 NIPALS algorithm starts
+        #        Here PLS2 algorithm starts
         # ===============================================================================
-        threshold = 1.0e-12
+        self.arrT, self.arrW, self.arrP, self.arrU, self.arrQ, self.arrQ_alt, self.arrC = \
+            eng.fitPLS2(self.arrX, self.arrY, self.numPC, self.algorithm, **self.algorithmOptions)
 
-        X_new = self.arrX
-        Y_new = self.arrY
+        # Residuals after each component are computed from T, P, Q and C when
+        # requested
+        self.X_residualsDict = res.ComponentResiduals(self.arrX, self.arrT, self.arrP)
+        self.Y_residualsDict = res.ComponentResiduals(self.arrY, self.arrT, self.arrQ * np.diag(self.arrC))
 
-        # Compute number of principal components as specified by user
-        for j in range(self.numPC):
-
-            # Module 8: STEP 1
-            if not np.any(Y_new[:, 0]):
-                Y_repl_nonCent = np.arange(np.shape(Y_new)[0])
-                Y_repl = Y_repl_nonCent - np.mean(Y_repl_nonCent)
-                u_new = Y_repl.reshape(-1,1)
-
-            else:
-                u_new = Y_new[:,0].copy().reshape(-1,1)
-
-            # Iterate until Y score vector converges according to threshold
-            runs = 0
-            while 1:
-                runs = runs + 1
-
-                # Module 8: STEP 2
-                w_num = np.dot(np.transpose(X_new), u_new)
-                w_denom = npla.norm(w_num)
-                w = w_num / w_denom
-
-                # Module 8: STEP 3
-                t = np.dot(X_new, w)
-
-                # Module 8: STEP 4
-                q_num = np.dot(np.transpose(Y_new), t)
-                q_denom = npla.norm(q_num)
-                q = q_num / q_denom
-                q_denom_alt = np.dot(np.transpose(t), t)
-                q_alt = q_num / q_denom_alt
-
-                # Module 8: STEP 5
-                u_old = u_new.copy()
-                u_new = np.dot(Y_new, q)
-
-                # Module 8: STEP 6
-                # Stop iteration when difference smaller than threshold or 100
-                # iterations are reached.
-                diff = u_old - u_new
-                SS = np.sum(np.square(diff))
-                if SS <= threshold or runs == 100:
-                    break
-
-            # Module 8: STEP 7
-            c_num = np.dot(np.transpose(t), u_new)
-            c_denom = np.dot(np.transpose(t), t)
-            c = c_num / c_denom
-
-            # Module 8: STEP 8
-            p_num = np.dot(np.transpose(X_new), t)
-            p_denom = np.dot(np.transpose(t), t)
-            p = p_num / p_denom
-
-            # Module 8: STEP 9
-            X_old = X_new.copy()
-            X_new = X_old - np.dot(t, np.transpose(p))
-
-            Y_old = Y_new.copy()
-            Y_new = Y_old - c * np.dot(t, np.transpose(q))
-
-            # Collect vectors t, p, u, q, w and scalar c
-            self.x_scoresList.append(t.reshape(-1))
-            self.x_loadingsList.append(p.reshape(-1))
-            self.y_scoresList.append(u_new.reshape(-1))
-            self.y_loadingsList.append(q.reshape(-1))
-            self.y_loadingsList_alt.append(q_alt.reshape(-1))
-            self.x_loadingWeightsList.append(w.reshape(-1))
-            self.coeffList.append(c.reshape(-1))
-
-            # Collect residuals
-            self.Y_residualsList.append(Y_new)
-            self.X_residualsList.append(X_new)
-
-
-        # Construct T, P, U, Q and W from lists of vectors
-        self.arrT = np.array(np.transpose(self.x_scoresList))
-        self.arrP = np.array(np.transpose(self.x_loadingsList))
-        self.arrU = np.array(np.transpose(self.y_scoresList))
-        self.arrQ = np.array(np.transpose(self.y_loadingsList))
-        self.arrQ_alt = np.array(np.transpose(self.y_loadingsList_alt))
-        self.arrW = np.array(np.transpose(self.x_loadingWeightsList))
-        self.arrC = np.eye(self.numPC) * np.array(np.transpose(self.coeffList))
+        # Correlation loadings are computed when first requested
+        self.arr_XcorrLoadings = None
+        self.arr_YcorrLoadings = None
 
 
 
         # ========== COMPUTATIONS FOR Y ============
         # ---------------------------------------------------------------------
-        # Create a list holding arrays of Yhat predicted calibration after each
-        # component. Yhat is computed with Yhat = T*Chat*Q'
-        self.calYpredList = []
-
-        for ind in range(1, self.numPC+1):
-
-            x_scores = self.arrT[:,0:ind]
-            y_loadings = self.arrQ[:,0:ind]
-            c_regrCoeff = self.arrC[0:ind,0:ind]
-
-            # Depending on whether Y was standardised or not compute Yhat
-            # accordingly.
-            if self.Ystand:
-                Yhat_stand = np.dot(np.dot(x_scores, c_regrCoeff), np.transpose(y_loadings))
-                Yhat = (Yhat_stand * Ystd.reshape(1,-1)) + Ymeans.reshape(1,-1)
-            else:
-                Yhat = np.dot(np.dot(x_scores, c_regrCoeff), np.transpose(y_loadings)) + Ymeans
-            self.calYpredList.append(Yhat)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect all PRESSE for individual variables in a dictionary.
-        # Keys represent number of component.
-        self.PRESSEdict_indVar = {}
-
-        # Compute PRESS for calibration / estimation
-        PRESSE_0_indVar = np.sum(np.square(st.center(self.arrY_input)), axis=0)
-        self.PRESSEdict_indVar[0] = PRESSE_0_indVar
-
-        # Compute PRESS for each Yhat for 1, 2, 3, etc number of components
-        # and compute explained variance
-        for ind, Yhat in enumerate(self.calYpredList):
-            diffY = self.arrY_input - Yhat
-            PRESSE_indVar = np.sum(np.square(diffY), axis=0)
-            self.PRESSEdict_indVar[ind+1] = PRESSE_indVar
-
-        # Now store all PRESSE values into an array. Then compute MSEE and
-        # RMSEE.
-        self.PRESSEarr_indVar = np.array(list(self.PRESSEdict_indVar.values()))
-        self.MSEEarr_indVar = self.PRESSEarr_indVar / np.shape(self.arrY_input)[0]
-        self.RMSEEarr_indVar = np.sqrt(self.MSEEarr_indVar)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute explained variance for each variable in Y using the
-        # MSEP for each variable. Also collect PRESSE, MSEE, RMSEE in
-        # their respective dictionaries for each variable. Keys represent
-        # now variables and NOT components as above with
-        # self.PRESSEdict_indVar
-        self.cumCalExplVarYarr_indVar = np.zeros(np.shape(self.MSEEarr_indVar))
-        MSEE_0_indVar = self.MSEEarr_indVar[0,:]
-
-        for ind, MSEE_indVar in enumerate(self.MSEEarr_indVar):
-            explVar = (MSEE_0_indVar - MSEE_indVar) / MSEE_0_indVar * 100
-            self.cumCalExplVarYarr_indVar[ind] = explVar
-
-        self.PRESSE_indVar = {}
-        self.MSEE_indVar = {}
-        self.RMSEE_indVar = {}
-        self.cumCalExplVarY_indVar = {}
-
-        for ind in range(np.shape(self.PRESSEarr_indVar)[1]):
-            self.PRESSE_indVar[ind] = self.PRESSEarr_indVar[:,ind]
-            self.MSEE_indVar[ind] = self.MSEEarr_indVar[:,ind]
-            self.RMSEE_indVar[ind] = self.RMSEEarr_indVar[:,ind]
-            self.cumCalExplVarY_indVar[ind] = self.cumCalExplVarYarr_indVar[:,ind]
+        # Predicted Y (Yhat) from calibration and the statistics for 0, 1,
+        # 2, etc number of components are computed when first requested, see
+        # results.CalibratedFits and results.ErrorStatistics.
+        self.calFitsY = res.CalibratedFits(self.arrY_input, self.arrT, self.arrQ * np.diag(self.arrC),
+                                           scale=Ystd.reshape(1,-1) if self.Ystand else None, offset=Ymeans.reshape(1,-1))
+        self.calStatsY = res.ErrorStatistics(self.numPC, np.shape(self.arrY_input), standardised=self.Ystand,
+                                             source=self.calFitsY.press)
         # ---------------------------------------------------------------------
 
 
-        # ---------------------------------------------------------------------
-        # Collect total PRESSE across all variables in a dictionary. Also,
-        # compute total calibrated explained variance in Y.
-        self.PRESSE_total_dict = {}
-        self.PRESSE_total_list = np.sum(self.PRESSEarr_indVar, axis=1)
-
-        for ind, PRESSE in enumerate(self.PRESSE_total_list):
-            self.PRESSE_total_dict[ind] = PRESSE
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect total MSEE across all variables in a dictionary. Also,
-        # compute total calibrated explained variance in Y.
-        self.MSEE_total_dict = {}
-        self.MSEE_total_list = np.sum(self.MSEEarr_indVar, axis=1) / np.shape(self.arrY_input)[1]
-        MSEE_0 = self.MSEE_total_list[0]
-
-        # Compute total calibrated explained variance in Y
-        self.YcumCalExplVarList = []
-        if not self.Ystand:
-            for ind, MSEE in enumerate(self.MSEE_total_list):
-                perc = (MSEE_0 - MSEE) / MSEE_0 * 100
-                self.MSEE_total_dict[ind] = MSEE
-                self.YcumCalExplVarList.append(perc)
-        else:
-            self.YcumCalExplVarArr = np.average(self.cumCalExplVarYarr_indVar, axis=1)
-            self.YcumCalExplVarList = list(self.YcumCalExplVarArr)
-
-        # Construct list with total validated explained variance in Y
-        self.YcalExplVarList = []
-        for ind, item in enumerate(self.YcumCalExplVarList):
-            if ind == len(self.YcumCalExplVarList)-1:
-                break
-            explVarComp = self.YcumCalExplVarList[ind+1] - self.YcumCalExplVarList[ind]
-            self.YcalExplVarList.append(explVarComp)
-
-        # Construct a dictionary that holds predicted Y (Yhat) from calibration
-        # for each number of components.
-        self.calYpredDict = {}
-        for ind, item in enumerate(self.calYpredList):
-            self.calYpredDict[ind+1] = item
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute total RMSEP and store values in a dictionary and list.
-        self.RMSEE_total_dict = {}
-        self.RMSEE_total_list = np.sqrt(self.MSEE_total_list)
-
-        for ind, RMSEE in enumerate(self.RMSEE_total_list):
-            self.RMSEE_total_dict[ind] = RMSEE
-        # ---------------------------------------------------------------------
-
-
-
-
         # ========== COMPUTATIONS FOR X ==========
         # ---------------------------------------------------------------------
-        # Create a list holding arrays of Xhat predicted calibration after each
-        # component. Xhat is computed with Xhat = T*P'
-        self.calXpredList = []
-
-        # Compute Xhat for 1 and more components (cumulatively).
-        for ind in range(1,self.numPC+1):
-
-            part_arrT = self.arrT[:,0:ind]
-            part_arrP = self.arrP[:,0:ind]
-            predXcal = np.dot(part_arrT, np.transpose(part_arrP))
-
-            if self.Xstand:
-                Xhat = (predXcal * Xstd) + Xmeans
-            else:
-                Xhat = predXcal + Xmeans
-            self.calXpredList.append(Xhat)
+        # Predicted X (Xhat) from calibration and the statistics for 0, 1,
+        # 2, etc number of components are computed when first requested, see
+        # results.CalibratedFits and results.ErrorStatistics.
+        self.calFitsX = res.CalibratedFits(self.arrX_input, self.arrT, self.arrP,
+                                           scale=Xstd if self.Xstand else None, offset=Xmeans)
+        self.calStatsX = res.ErrorStatistics(self.numPC, np.shape(self.arrX_input), standardised=self.Xstand,
+                                             source=self.calFitsX.press)
         # ---------------------------------------------------------------------
 
 
-        # ---------------------------------------------------------------------
-        # Collect all PRESSE for individual variables in a dictionary.
-        # Keys represent number of component.
-        self.PRESSEdict_indVar_X = {}
-
-        # Compute PRESS for calibration / estimation
-        PRESSE_0_indVar_X = np.sum(np.square(st.center(self.arrX_input)), axis=0)
-        self.PRESSEdict_indVar_X[0] = PRESSE_0_indVar_X
-
-        # Compute PRESS for each Xhat for 1, 2, 3, etc number of components
-        # and compute explained variance
-        for ind, Xhat in enumerate(self.calXpredList):
-            diffX = self.arrX_input - Xhat
-            PRESSE_indVar_X = np.sum(np.square(diffX), axis=0)
-            self.PRESSEdict_indVar_X[ind+1] = PRESSE_indVar_X
-
-        # Now store all PRESSE values into an array. Then compute MSEE and
-        # RMSEE.
-        self.PRESSEarr_indVar_X = np.array(list(self.PRESSEdict_indVar_X.values()))
-        self.MSEEarr_indVar_X = self.PRESSEarr_indVar_X / np.shape(self.arrX_input)[0]
-        self.RMSEEarr_indVar_X = np.sqrt(self.MSEEarr_indVar_X)
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute explained variance for each variable in X using the
-        # MSEP for each variable. Also collect PRESSE, MSEE, RMSEE in
-        # their respective dictionaries for each variable. Keys represent
-        # now variables and NOT components as above with
-        # self.PRESSEdict_indVar_X
-        self.cumCalExplVarXarr_indVar = np.zeros(np.shape(self.MSEEarr_indVar_X))
-        MSEE_0_indVar_X = self.MSEEarr_indVar_X[0,:]
-
-        for ind, MSEE_indVar_X in enumerate(self.MSEEarr_indVar_X):
-            explVar = (MSEE_0_indVar_X - MSEE_indVar_X) / MSEE_0_indVar_X * 100
-            self.cumCalExplVarXarr_indVar[ind] = explVar
-
-        self.PRESSE_indVar_X = {}
-        self.MSEE_indVar_X = {}
-        self.RMSEE_indVar_X = {}
-        self.cumCalExplVarX_indVar = {}
-
-        for ind in range(np.shape(self.PRESSEarr_indVar_X)[1]):
-            self.PRESSE_indVar_X[ind] = self.PRESSEarr_indVar_X[:,ind]
-            self.MSEE_indVar_X[ind] = self.MSEEarr_indVar_X[:,ind]
-            self.RMSEE_indVar_X[ind] = self.RMSEEarr_indVar_X[:,ind]
-            self.cumCalExplVarX_indVar[ind] = self.cumCalExplVarXarr_indVar[:,ind]
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect total PRESSE across all variables in a dictionary. Also,
-        # compute total calibrated explained variance in Y.
-        self.PRESSE_total_dict_X = {}
-        self.PRESSE_total_list_X = np.sum(self.PRESSEarr_indVar_X, axis=1)
-
-        for ind, PRESSE_X in enumerate(self.PRESSE_total_list_X):
-            self.PRESSE_total_dict_X[ind] = PRESSE_X
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Collect total MSEE across all variables in a dictionary. Also,
-        # compute total validated explained variance in X.
-        self.MSEE_total_dict_X = {}
-        self.MSEE_total_list_X = np.sum(self.MSEEarr_indVar_X, axis=1) / np.shape(self.arrX_input)[1]
-        MSEE_0_X = self.MSEE_total_list_X[0]
-
-        # Compute total calibrated explained variance in X
-        self.XcumCalExplVarList = []
-        if not self.Xstand:
-            for ind, MSEE_X in enumerate(self.MSEE_total_list_X):
-                perc = (MSEE_0_X - MSEE_X) / MSEE_0_X * 100
-                self.MSEE_total_dict_X[ind] = MSEE_X
-                self.XcumCalExplVarList.append(perc)
-        else:
-            self.XcumCalExplVarArr = np.average(self.cumCalExplVarXarr_indVar, axis=1)
-            self.XcumCalExplVarList = list(self.XcumCalExplVarArr)
-
-        # Construct list with total validated explained variance in X
-        self.XcalExplVarList = []
-        for ind, item in enumerate(self.XcumCalExplVarList):
-            if ind == len(self.XcumCalExplVarList)-1:
-                break
-            explVarComp = self.XcumCalExplVarList[ind+1] - self.XcumCalExplVarList[ind]
-            self.XcalExplVarList.append(explVarComp)
-
-        # Construct a dictionary that holds predicted X (Xhat) from calibration
-        # for each number of components.
-        self.calXpredDict = {}
-        for ind, item in enumerate(self.calXpredList):
-            self.calXpredDict[ind+1] = item
-        # ---------------------------------------------------------------------
-
-
-        # ---------------------------------------------------------------------
-        # Compute total RMSEE and store values in a dictionary and list.
-        self.RMSEE_total_dict_X = {}
-        self.RMSEE_total_list_X = np.sqrt(self.MSEE_total_list_X)
-
-        for ind, RMSEE_X in enumerate(self.RMSEE_total_list_X):
-            self.RMSEE_total_dict_X[ind] = RMSEE_X
-        # ---------------------------------------------------------------------
-
         # ==============================================================================
         #         Here starts the cross validation process
         # ==============================================================================
@@ -584,82 +351,51 @@ class nipalsPLS2:
                 pass
 
 
-            # Collect predicted y (i.e. yhat) for each CV segment in a
-            # dictionary according to nubmer of PC
-            self.valYpredDict = {}
-            for ind in range(1, self.numPC+1):
-                self.valYpredDict[ind] = np.zeros(np.shape(self.arrY_input))
-
-            # Collect predicted x (i.e. xhat) for each CV segment in a
-            # dictionary according to number of PC
-            self.valXpredDict = {}
-            for ind in range(1, self.numPC+1):
-                self.valXpredDict[ind] = np.zeros(np.shape(self.arrX_input))
-
-
-            # Collect train and test set in dictionaries for each PC and put
-            # them in this list.
-            self.cvTrainAndTestDataList = []
+            # Accumulate the validation errors of each CV segment in the
+            # validated statistics. Predicted y and x (i.e. yhat and xhat) are
+            # collected in dictionaries according to number of PC if
+            # requested.
+            self.valStatsY = res.ErrorStatistics(self.numPC, np.shape(self.arrY_input), standardised=self.Ystand)
+            self.valErrorsY = res.ValidationErrors(self.arrY_input, self.numPC, keep=self.cvPredictions,
+                                                   press=self.valStatsY.accumulator)
+            self.valYpredDict = self.valErrorsY.preds
+            self.valStatsX = res.ErrorStatistics(self.numPC, np.shape(self.arrX_input), standardised=self.Xstand)
+            self.valErrorsX = res.ValidationErrors(self.arrX_input, self.numPC, keep=self.cvPredictions,
+                                                   press=self.valStatsX.accumulator)
+            self.valXpredDict = self.valErrorsX.preds
 
 
             # Collect: validation X scores T, validation X loadings P,
             # validation Y scores U, validation Y loadings Q,
             # validation X loading weights W and scores regression coefficients C
-            # in lists for each PC
-            self.val_arrTlist = []
-            self.val_arrPlist = []
-            self.val_arrUlist = []
-            self.val_arrQlist = []
-            self.val_arrWlist = []
-            self.val_arrClist = []
-            all_ytm = np.zeros(np.shape(self.arrY_input))
-            all_xtm = np.zeros(np.shape(self.arrX_input))
-
-
-            # First devide into combinations of training and test sets
-            for train_index, test_index in cvComb:
-                x_train, x_test = cv.split(train_index, test_index, self.arrX_input)
-                y_train, y_test = cv.split(train_index, test_index, self.arrY_input)
-
-                subDict = {}
-                subDict['x train'] = x_train
-                subDict['x test'] = x_test
-                subDict['y train'] = y_train
-                subDict['y test'] = y_test
-                self.cvTrainAndTestDataList.append(subDict)
-
-
-                # Collect X scores and Y loadings vectors from each iterations step
-                val_x_scoresList = []
-                val_x_loadingsList = []
-                val_y_scoresList = []
-                val_y_loadingsList = []
-                val_x_loadingWeightsList = []
-                val_coeffList = []
-
-
-                # Here the PLS2 algorithm starts (cross validation)
-                # ------------------------------------------------
-                threshold = 1.0e-12
-
-                # For cross validation pre-process data according to user
-                # request
-                if self.Xstand:
-                    x_train_means = np.average(x_train, axis=0)
-                    x_train_std = np.std(x_train, axis=0, ddof=1)
-                    X_new = (x_train - x_train_means) / x_train_std
-                else:
-                    x_train_means = np.average(x_train, axis=0)
-                    X_new = x_train - x_train_means
-
-
-                if self.Ystand:
-                    y_train_means = np.average(y_train, axis=0)
-                    y_train_std = np.std(y_train, axis=0, ddof=1)
-                    Y_new = (y_train - y_train_means) / y_train_std
-                else:
-                    y_train_means = np.average(y_train, axis=0)
-                    Y_new = y_train - y_train_means
+            # in lists for each PC, if the segment models are kept
+            keepModels = self.cvRetention == "full"
+            self.val_arrTlist = [] if keepModels else None
+            self.val_arrPlist = [] if keepModels else None
+            self.val_arrUlist = [] if keepModels else None
+            self.val_arrQlist = [] if keepModels else None
+            self.val_arrWlist = [] if keepModels else None
+            self.val_arrClist = [] if keepModels else None
+
+
+            # First devide into combinations of training and test sets. The
+            # PLS2 models of the training sets are computed in segment order,
+            # possibly in parallel, before the results are assembled below.
+            segments = list(cvComb)
+            segModels = parallel.mapSegments(eng.pls2Segment, segments, n_jobs=self.n_jobs,
+                                             arrX=self.arrX_input, arrY=self.arrY_input,
+                                             numComp=self.numPC, Xstand=self.Xstand,
+                                             Ystand=self.Ystand, algorithm=self.algorithm,
+                                             algorithmOptions=self.algorithmOptions,
+                                             startLoadings=self.arrQ if self.warmStart else None)
+
+            # Train and test sets of each segment
+            segmentData = res.SegmentData(segments, [('x', self.arrX_input), ('y', self.arrY_input)])
+
+            for (train_index, test_index), segModel in zip(segments, segModels):
+                x_train_means, x_train_std, y_train_means, y_train_std, \
+                    val_arrT, val_arrW, val_arrP, val_arrU, val_arrQ, val_arrQ_alt, val_arrC = segModel
+                x_test = self.arrX_input[test_index]
 
 
                 # Give vector y_train_means the correct dimension in
@@ -668,91 +404,16 @@ class nipalsPLS2:
                 ytm = y_train_means.reshape(1,-1)
                 xtm = x_train_means.reshape(1,-1)
 
-                for ind_test in range(np.shape(y_test)[0]):
-                    all_ytm[test_index,] = ytm
-                    all_xtm[test_index,] = xtm
+                self.valErrorsY.add(0, test_index, ytm)
+                self.valErrorsX.add(0, test_index, xtm)
 
-                # Compute number of principal components as specified by user
-                for j in range(self.numPC):
-
-                    # Module 8: STEP 1
-                    if not np.any(Y_new[:, 0]):
-                        Y_repl_nonCent = np.arange(np.shape(Y_new)[0])
-                        Y_repl = Y_repl_nonCent - np.mean(Y_repl_nonCent)
-                        u_new = Y_repl.reshape(-1,1)
-
-                    else:
-                        u_new = Y_new[:,0].copy().reshape(-1,1)
-
-                    # Iterate until Y score vector converges according to threshold
-                    runs = 0
-                    while 1:
-                        runs = runs + 1
-
-                        # Module 8: STEP 2
-                        w_num = np.dot(np.transpose(X_new), u_new)
-                        w_denom = npla.norm(w_num)
-                        w = w_num / w_denom
-
-                        # Module 8: STEP 3
-                        t = np.dot(X_new, w)
-
-                        # Module 8: STEP 4
-                        q_num = np.dot(np.transpose(Y_new), t)
-                        q_denom = npla.norm(q_num)
-                        q = q_num / q_denom
-
-                        # Module 8: STEP 5
-                        u_old = u_new.copy()
-                        u_new = np.dot(Y_new, q)
-
-                        # Module 8: STEP 6
-                        # Stop iteration when difference smaller than threshold or 100
-                        # iterations are reached.
-                        diff = u_old - u_new
-                        SS = np.sum(np.square(diff))
-                        if SS <= threshold or runs == 100:
-                            break
-
-                    # Module 8: STEP 7
-                    c_num = np.dot(np.transpose(t), u_new)
-                    c_denom = np.dot(np.transpose(t), t)
-                    c = c_num / c_denom
-
-                    # Module 8: STEP 8
-                    p_num = np.dot(np.transpose(X_new), t)
-                    p_denom = np.dot(np.transpose(t), t)
-                    p = p_num / p_denom
-
-                    # Module 8: STEP 9
-                    X_old = X_new.copy()
-                    X_new = X_old - np.dot(t, np.transpose(p))
-
-                    Y_old = Y_new.copy()
-                    Y_new = Y_old - c * np.dot(t, np.transpose(q))
-
-                    # Collect vectors t, p, u, q, w and scalar c
-                    val_x_scoresList.append(t.reshape(-1))
-                    val_x_loadingsList.append(p.reshape(-1))
-                    val_y_scoresList.append(u_new.reshape(-1))
-                    val_y_loadingsList.append(q.reshape(-1))
-                    val_x_loadingWeightsList.append(w.reshape(-1))
-                    val_coeffList.append(c.reshape(-1))
-
-                # Construct T, P, U, Q and W from lists of vectors
-                val_arrT = np.array(np.transpose(val_x_scoresList))
-                val_arrP = np.array(np.transpose(val_x_loadingsList))
-                val_arrU = np.array(np.transpose(val_y_scoresList))
-                val_arrQ = np.array(np.transpose(val_y_loadingsList))
-                val_arrW = np.array(np.transpose(val_x_loadingWeightsList))
-                val_arrC = np.eye(self.numPC) * np.array(np.transpose(val_coeffList))
-
-                self.val_arrTlist.append(val_arrT)
-                self.val_arrPlist.append(val_arrP)
-                self.val_arrUlist.append(val_arrU)
-                self.val_arrQlist.append(val_arrQ)
-                self.val_arrWlist.append(val_arrW)
-                self.val_arrClist.append(val_arrC)
+                if keepModels:
+                    self.val_arrTlist.append(val_arrT)
+                    self.val_arrPlist.append(val_arrP)
+                    self.val_arrUlist.append(val_arrU)
+                    self.val_arrQlist.append(val_arrQ)
+                    self.val_arrWlist.append(val_arrW)
+                    self.val_arrClist.append(val_arrC)
 
 
                 # Compute SEP and yhat for PC1 and further
@@ -777,252 +438,52 @@ class nipalsPLS2:
                     x_old = x_new
                     x_new = x_old - np.dot(t,np.transpose(p))
 
-                    # Generate a vector t that gets longer by one element with
-                    # each PC
+                    # Collect the scores of all PC's
                     t_list.append(t)
-                    t_arr = np.hstack(t_list)
+                t_arr = np.hstack(t_list)
 
-                    # Get relevant part of P, C anc Q for specific number of
-                    # PC's
-                    part_val_arrP = val_arrP[:,0:ind+1]
-                    part_val_arrQ = val_arrQ[:,0:ind+1]
-                    part_val_arrC = val_arrC[0:ind+1,0:ind+1]
+                # Module 8: Prediction STEP 3
+                # ---------------------------
+                # Predict for one PC, then two, three, etc, adding one PC at
+                # a time. C is diagonal, so T*C*Q' = T*(Q*C)'
+                cumFits = zip(eng.cumulativeFits(t_arr, val_arrQ * np.diag(val_arrC)),
+                              eng.cumulativeFits(t_arr, val_arrP))
+                for ind, (tCQ_proc, tP_proc) in enumerate(cumFits):
 
-                    # Module 8: Prediction STEP 3
-                    # ---------------------------
                     # First compute yhat
                     if self.Ystand:
-                        tCQ = np.dot(np.dot(t_arr,part_val_arrC),
-                                     np.transpose(part_val_arrQ)) * y_train_std.reshape(1,-1)
+                        tCQ = tCQ_proc * y_train_std.reshape(1,-1)
                     else:
-                        tCQ = np.dot(np.dot(t_arr,part_val_arrC), np.transpose(part_val_arrQ))
+                        tCQ = tCQ_proc
 
                     yhat = ytm + tCQ
-                    self.valYpredDict[ind+1][test_index,] = yhat
+                    self.valErrorsY.add(ind+1, test_index, yhat)
 
                     # Then compute xhat
                     if self.Xstand:
-                        tP = np.dot(t_arr,np.transpose(part_val_arrP)) * x_train_std.reshape(1,-1)
+                        tP = tP_proc * x_train_std.reshape(1,-1)
                     else:
-                        tP = np.dot(t_arr, np.transpose(part_val_arrP))
+                        tP = tP_proc
 
                     xhat = xtm + tP
-                    self.valXpredDict[ind+1][test_index,] = xhat
-
-
-
-
-
-            # ========== Computations for Y ==========
-            # -----------------------------------------------------------------
-            # Compute PRESSCV (PRediction Error Sum of Squares) for cross
-            # validation
-            self.valYpredList = list(self.valYpredDict.values())
-
-            # Collect all PRESS in a dictionary. Keys represent number of
-            # component.
-            self.PRESSdict_indVar = {}
-
-            # First compute PRESSCV for zero components
-            self.PRESSCV_0_indVar = np.sum(np.square(self.arrY_input - all_ytm), axis=0)
-            self.PRESSdict_indVar[0] = self.PRESSCV_0_indVar
-
-            # Compute PRESSCV for each Yhat for 1, 2, 3, etc number of components
-            # and compute explained variance
-            for ind, Yhat in enumerate(self.valYpredList):
-                diffY = self.arrY_input - Yhat
-                PRESSCV_indVar = np.sum(np.square(diffY), axis=0)
-                self.PRESSdict_indVar[ind+1] = PRESSCV_indVar
-
-            # Now store all PRESSCV values into an array. Then compute MSECV and
-            # RMSECV.
-            self.PRESSCVarr_indVar = np.array(list(self.PRESSdict_indVar.values()))
-            self.MSECVarr_indVar = self.PRESSCVarr_indVar / np.shape(self.arrY_input)[0]
-            self.RMSECVarr_indVar = np.sqrt(self.MSECVarr_indVar)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute explained variance for each variable in Y using the
-            # MSEP for each variable. Also collect PRESS, MSECV, RMSECV in
-            # their respective dictionaries for each variable.  Keys represent
-            # now variables and NOT components as above with
-            # self.PRESSdict_indVar
-            self.cumValExplVarYarr_indVar = np.zeros(np.shape(self.MSECVarr_indVar))
-            MSECV_0_indVar = self.MSECVarr_indVar[0,:]
-
-            for ind, MSECV_indVar in enumerate(self.MSECVarr_indVar):
-                explVar = (MSECV_0_indVar - MSECV_indVar) / MSECV_0_indVar * 100
-                self.cumValExplVarYarr_indVar[ind] = explVar
-
-            self.PRESSCV_indVar = {}
-            self.MSECV_indVar = {}
-            self.RMSECV_indVar = {}
-            self.cumValExplVarY_indVar = {}
-
-            for ind in range(np.shape(self.PRESSCVarr_indVar)[1]):
-                self.PRESSCV_indVar[ind] = self.PRESSCVarr_indVar[:,ind]
-                self.MSECV_indVar[ind] = self.MSECVarr_indVar[:,ind]
-                self.RMSECV_indVar[ind] = self.RMSECVarr_indVar[:,ind]
-                self.cumValExplVarY_indVar[ind] = self.cumValExplVarYarr_indVar[:,ind]
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total PRESSCV across all variables in a dictionary.
-            self.PRESSCV_total_dict = {}
-            self.PRESSCV_total_list = np.sum(self.PRESSCVarr_indVar, axis=1)
-
-            for ind, PRESSCV in enumerate(self.PRESSCV_total_list):
-                self.PRESSCV_total_dict[ind] = PRESSCV
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total MSECV across all variables in a dictionary. Also,
-            # compute total validated explained variance in Y.
-            self.MSECV_total_dict = {}
-            self.MSECV_total_list = np.sum(self.MSECVarr_indVar, axis=1) / np.shape(self.arrY_input)[1]
-            MSECV_0 = self.MSECV_total_list[0]
-
-            # Compute total validated explained variance in Y
-            self.YcumValExplVarList = []
-            if not self.Ystand:
-                for ind, MSECV in enumerate(self.MSECV_total_list):
-                    perc = (MSECV_0 - MSECV) / MSECV_0 * 100
-                    self.MSECV_total_dict[ind] = MSECV
-                    self.YcumValExplVarList.append(perc)
-            else:
-                self.YcumValExplVarArr = np.average(self.cumValExplVarYarr_indVar, axis=1)
-                self.YcumValExplVarList = list(self.YcumValExplVarArr)
-
-            # Construct list with total validated explained variance in Y in
-            # each component
-            self.YvalExplVarList = []
-            for ind, item in enumerate(self.YcumValExplVarList):
-                if ind == len(self.YcumValExplVarList)-1:
-                    break
-                explVarComp = self.YcumValExplVarList[ind+1] - self.YcumValExplVarList[ind]
-                self.YvalExplVarList.append(explVarComp)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute total RMSECV and store values in a dictionary and list.
-            self.RMSECV_total_dict = {}
-            self.RMSECV_total_list = np.sqrt(self.MSECV_total_list)
-
-            for ind, RMSECV in enumerate(self.RMSECV_total_list):
-                self.RMSECV_total_dict[ind] = RMSECV
-            # -----------------------------------------------------------------
-
-
-
-
-
-            # ========== Computations for X ==========
-            # -----------------------------------------------------------------
-            # Compute PRESSCV (PRediction Error Sum of Squares) for cross
-            # validation
-            self.valXpredList = self.valXpredDict.values()
-
-            # Collect all PRESS in a dictionary. Keys represent number of
-            # component.
-            self.PRESSdict_indVar_X = {}
-
-            # First compute PRESSCV for zero components
-            self.PRESSCV_0_indVar_X = np.sum(np.square(self.arrX_input - all_xtm), axis=0)
-            self.PRESSdict_indVar_X[0] = self.PRESSCV_0_indVar_X
-
-            # Compute PRESSCV for each Yhat for 1, 2, 3, etc number of
-            # components and compute explained variance
-            for ind, Xhat in enumerate(self.valXpredList):
-                diffX = self.arrX_input - Xhat
-                PRESSCV_indVar_X = np.sum(np.square(diffX), axis=0)
-                self.PRESSdict_indVar_X[ind+1] = PRESSCV_indVar_X
-
-            # Now store all PRESSCV values into an array. Then compute MSECV
-            # and RMSECV.
-            self.PRESSCVarr_indVar_X = np.array(list(self.PRESSdict_indVar_X.values()))
-            self.MSECVarr_indVar_X = self.PRESSCVarr_indVar_X / np.shape(self.arrX_input)[0]
-            self.RMSECVarr_indVar_X = np.sqrt(self.MSECVarr_indVar_X)
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Compute explained variance for each variable in X using the
-            # MSEP for each variable. Also collect PRESS, MSECV, RMSECV in
-            # their respective dictionaries for each variable. Keys represent
-            # now variables and NOT components as above with
-            # self.PRESSdict_indVar
-            self.cumValExplVarXarr_indVar = np.zeros(np.shape(self.MSECVarr_indVar_X))
-            MSECV_0_indVar_X = self.MSECVarr_indVar_X[0,:]
-
-            for ind, MSECV_indVar_X in enumerate(self.MSECVarr_indVar_X):
-                explVar = (MSECV_0_indVar_X - MSECV_indVar_X) / MSECV_0_indVar_X * 100
-                self.cumValExplVarXarr_indVar[ind] = explVar
-
-            self.PRESSCV_indVar_X = {}
-            self.MSECV_indVar_X = {}
-            self.RMSECV_indVar_X = {}
-            self.cumValExplVarX_indVar = {}
-
-            for ind in range(np.shape(self.PRESSCVarr_indVar_X)[1]):
-                self.PRESSCV_indVar_X[ind] = self.PRESSCVarr_indVar_X[:,ind]
-                self.MSECV_indVar_X[ind] = self.MSECVarr_indVar_X[:,ind]
-                self.RMSECV_indVar_X[ind] = self.RMSECVarr_indVar_X[:,ind]
-                self.cumValExplVarX_indVar[ind] = self.cumValExplVarXarr_indVar[:,ind]
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total PRESSCV across all variables in a dictionary.
-            self.PRESSCV_total_dict_X = {}
-            self.PRESSCV_total_list_X = np.sum(self.PRESSCVarr_indVar_X, axis=1)
-
-            for ind, PRESSCV_X in enumerate(self.PRESSCV_total_list_X):
-                self.PRESSCV_total_dict_X[ind] = PRESSCV_X
-            # -----------------------------------------------------------------
-
-
-            # -----------------------------------------------------------------
-            # Collect total MSECV across all variables in a dictionary. Also,
-            # compute total validated explained variance in X.
-            self.MSECV_total_dict_X = {}
-            self.MSECV_total_list_X = np.sum(self.MSECVarr_indVar_X, axis=1) / np.shape(self.arrX_input)[1]
-            MSECV_0_X = self.MSECV_total_list_X[0]
-
-            # Compute total validated explained variance in X
-            self.XcumValExplVarList = []
-            if not self.Xstand:
-                for ind, MSECV_X in enumerate(self.MSECV_total_list_X):
-                    perc = (MSECV_0_X - MSECV_X) / MSECV_0_X * 100
-                    self.MSECV_total_dict_X[ind] = MSECV_X
-                    self.XcumValExplVarList.append(perc)
+                    self.valErrorsX.add(ind+1, test_index, xhat)
+
+            # Keep the training and test sets of the segments, either as
+            # copies or as index arrays they are extracted from on request.
+            if self.cvRetention == "full":
+                self.cvTrainAndTestDataList = list(segmentData)
+            elif self.cvRetention == "indices":
+                self.cvTrainAndTestDataList = segmentData
             else:
-                self.XcumValExplVarArr = np.average(self.cumValExplVarXarr_indVar, axis=1)
-                self.XcumValExplVarList = list(self.XcumValExplVarArr)
+                self.cvTrainAndTestDataList = None
 
-            # Construct list with total validated explained variance in X in
-            # each component
-            self.XvalExplVarList = []
-            for ind, item in enumerate(self.XcumValExplVarList):
-                if ind == len(self.XcumValExplVarList)-1:
-                    break
-                explVarComp = self.XcumValExplVarList[ind+1] - self.XcumValExplVarList[ind]
-                self.XvalExplVarList.append(explVarComp)
-            # -----------------------------------------------------------------
 
 
-            # -----------------------------------------------------------------
-            # Compute total RMSECV and store values in a dictionary and list.
-            self.RMSECV_total_dict_X = {}
-            self.RMSECV_total_list_X = np.sqrt(self.MSECV_total_list_X)
 
-            for ind, RMSECV_X in enumerate(self.RMSECV_total_list_X):
-                self.RMSECV_total_dict_X[ind] = RMSECV_X
-            # -----------------------------------------------------------------
 
+            # The PRESSCV (PRediction Error Sum of Squares) of X and Y were
+            # accumulated segment by segment. The validated statistics are
+            # computed from them when first requested.
 
 
     def modelSettings(self):
@@ -1038,6 +499,12 @@ class nipalsPLS2:
         self.settingsDict['analysed X'] = self.arrX
         self.settingsDict['analysed Y'] = self.arrY
         self.settingsDict['cv type'] = self.cvType
+        self.settingsDict['algorithm'] = self.algorithm
+        self.settingsDict['algorithmOptions'] = self.algorithmOptions
+        self.settingsDict['warmStart'] = self.warmStart
+        self.settingsDict['n_jobs'] = self.n_jobs
+        self.settingsDict['cvPredictions'] = self.cvPredictions
+        self.settingsDict['cvRetention'] = self.cvRetention
         return self.settingsDict
 
 
@@ -1079,21 +546,11 @@ class nipalsPLS2:
         correlation loadings for component 2, etc.
         """
 
-        # Creates empty matrix for correlation loadings
-        arr_XcorrLoadings = np.zeros((np.shape(self.arrT)[1], np.shape(self.arrP)[0]), float)
-
-        # Compute correlation loadings:
-        # For each PC in score matrix
-        for PC in range(np.shape(self.arrT)[1]):
-            PCscores = self.arrT[:, PC]
-
-            # For each variable/attribute in original matrix (not meancentered)
-            for var in range(np.shape(self.arrX)[1]):
-                origVar = self.arrX[:, var]
-                corrs = np.corrcoef(PCscores, origVar)
-                arr_XcorrLoadings[PC, var] = corrs[0,1]
-
-        self.arr_XcorrLoadings = np.transpose(arr_XcorrLoadings)
+        # Computed once from one product of the normalised scores and data,
+        # see engines.corrLoadings
+        if self.arr_XcorrLoadings is None:
+            self.arr_XcorrLoadings = eng.corrLoadings(self.arrT, self.arrX)
+            self.arr_XcorrLoadings.flags.writeable = False
 
         return self.arr_XcorrLoadings
 
@@ -1103,14 +560,7 @@ class nipalsPLS2:
         Returns a dictionary holding the residual arrays for array X after
         each computed component. Dictionary key represents order of component.
         """
-        # Create empty dictionary that will hold residuals
-        X_residualsDict = {}
-
-        # Fill dictionary with residuals arrays from residuals list
-        for ind, item in enumerate(self.X_residualsList):
-            X_residualsDict[ind] = item
-
-        return X_residualsDict
+        return self.X_residualsDict
 
 
     def X_calExplVar(self):
@@ -1119,7 +569,7 @@ class nipalsPLS2:
         each component. First number in list is for component 1, second number
         for component 2, etc.
         """
-        return self.XcalExplVarList
+        return list(self.calStatsX.explVar)
 
 
     def X_cumCalExplVar_indVar(self):
@@ -1129,7 +579,7 @@ class nipalsPLS2:
         components, second row represents one component, third row represents
         two components, etc. Columns represent variables.
         """
-        return self.cumCalExplVarXarr_indVar
+        return self.calStatsX.cumExplVar_indVar
 
 
     def X_cumCalExplVar(self):
@@ -1137,7 +587,7 @@ class nipalsPLS2:
         Returns a list holding the cumulative calibrated explained variance
         for array X after each component.
         """
-        return self.XcumCalExplVarList
+        return list(self.calStatsX.cumExplVar)
 
 
     def X_predCal(self):
@@ -1146,7 +596,7 @@ class nipalsPLS2:
         calibration after each computed component. Dictionary key represents
         order of component.
         """
-        return self.calXpredDict
+        return self.calFitsX.predictions()
 
 
     def X_PRESSE_indVar(self):
@@ -1156,7 +606,7 @@ class nipalsPLS2:
         is PRESSE for zero components, second row for component 1, third row
         for component 2, etc.
         """
-        return self.PRESSEarr_indVar_X
+        return self.calStatsX.PRESS_indVar
 
 
     def X_PRESSE(self):
@@ -1166,7 +616,7 @@ class nipalsPLS2:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSE_total_list_X
+        return self.calStatsX.PRESS
 
 
     def X_MSEE_indVar(self):
@@ -1176,7 +626,7 @@ class nipalsPLS2:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEEarr_indVar_X
+        return self.calStatsX.MSE_indVar
 
 
     def X_MSEE(self):
@@ -1186,7 +636,7 @@ class nipalsPLS2:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEE_total_list_X
+        return self.calStatsX.MSE
 
 
     def X_RMSEE_indVar(self):
@@ -1196,7 +646,7 @@ class nipalsPLS2:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEEarr_indVar_X
+        return self.calStatsX.RMSE_indVar
 
 
     def X_RMSEE(self):
@@ -1206,7 +656,7 @@ class nipalsPLS2:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEE_total_list_X
+        return self.calStatsX.RMSE
 
 
     def X_valExplVar(self):
@@ -1215,7 +665,7 @@ class nipalsPLS2:
         each component. First number in list is for component 1, second number
         for component 2, third number for component 3, etc.
         """
-        return self.XvalExplVarList
+        return list(self.valStatsX.explVar)
 
 
     def X_cumValExplVar_indVar(self):
@@ -1225,7 +675,7 @@ class nipalsPLS2:
         zero components, second row represents component 1, third row for
         compnent 2, etc. Columns represent variables.
         """
-        return self.cumValExplVarXarr_indVar
+        return self.valStatsX.cumExplVar_indVar
 
 
     def X_cumValExplVar(self):
@@ -1234,15 +684,16 @@ class nipalsPLS2:
         for array X after each component. First number represents zero
         components, second number represents component 1, etc.
         """
-        return self.XcumValExplVarList
+        return list(self.valStatsX.cumExplVar)
 
 
     def X_predVal(self):
         """
         Returns dictionary holding arrays of predicted Xhat after each
         component from validation. Dictionary key represents order of
-        component.
+        component. Only available with ``cvPredictions = True``.
         """
+        assert self.valXpredDict is not None, ValueError('validated predictions are only kept with cvPredictions=True')
         return self.valXpredDict
 
 
@@ -1253,7 +704,7 @@ class nipalsPLS2:
         row is PRESSCV for zero components, second row for component 1, third
         row for component 2, etc.
         """
-        return self.PRESSCVarr_indVar_X
+        return self.valStatsX.PRESS_indVar
 
 
     def X_PRESSCV(self):
@@ -1263,7 +714,7 @@ class nipalsPLS2:
         PRESSCV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSCV_total_list_X
+        return self.valStatsX.PRESS
 
 
     def X_MSECV_indVar(self):
@@ -1272,7 +723,7 @@ class nipalsPLS2:
         cross validation. First row is MSECV for zero components, second row
         for component 1, etc.
         """
-        return self.MSECVarr_indVar_X
+        return self.valStatsX.MSE_indVar
 
 
     def X_MSECV(self):
@@ -1282,7 +733,7 @@ class nipalsPLS2:
         MSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSECV_total_list_X
+        return self.valStatsX.MSE
 
 
     def X_RMSECV_indVar(self):
@@ -1292,7 +743,7 @@ class nipalsPLS2:
         RMSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSECVarr_indVar_X
+        return self.valStatsX.RMSE_indVar
 
 
     def X_RMSECV(self):
@@ -1302,7 +753,7 @@ class nipalsPLS2:
         RMSECV for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSECV_total_list_X
+        return self.valStatsX.RMSE
 
 
     def X_scores_predict(self, Xnew, numComp=None):
@@ -1370,21 +821,11 @@ class nipalsPLS2:
         correlation loadings for component 2, etc.
         """
 
-        # Creates empty matrix for correlation loadings
-        arr_YcorrLoadings = np.zeros((np.shape(self.arrT)[1], np.shape(self.arrQ)[0]), float)
-
-        # Compute correlation loadings:
-        # For each PC in score matrix
-        for PC in range(np.shape(self.arrT)[1]):
-            PCscores = self.arrT[:, PC]
-
-            # For each variable/attribute in original matrix (not meancentered)
-            for var in range(np.shape(self.arrY)[1]):
-                origVar = self.arrY[:, var]
-                corrs = np.corrcoef(PCscores, origVar)
-                arr_YcorrLoadings[PC, var] = corrs[0,1]
-
-        self.arr_YcorrLoadings = np.transpose(arr_YcorrLoadings)
+        # Computed once from one product of the normalised scores and data,
+        # see engines.corrLoadings
+        if self.arr_YcorrLoadings is None:
+            self.arr_YcorrLoadings = eng.corrLoadings(self.arrT, self.arrY)
+            self.arr_YcorrLoadings.flags.writeable = False
 
         return self.arr_YcorrLoadings
 
@@ -1394,14 +835,7 @@ class nipalsPLS2:
         Returns a dictionary holding residuals F of array Y after each
         component. Dictionary key represents order of component.
         """
-        # Create empty dictionary that will hold residuals
-        Y_residualsDict = {}
-
-        # Fill dictionary with residuals arrays from residuals list
-        for ind, item in enumerate(self.Y_residualsList):
-            Y_residualsDict[ind] = item
-
-        return Y_residualsDict
+        return self.Y_residualsDict
 
 
     def Y_calExplVar(self):
@@ -1410,7 +844,7 @@ class nipalsPLS2:
         component. First number in list is for component 1, second number for
         component 2, etc.
         """
-        return self.YcalExplVarList
+        return list(self.calStatsY.explVar)
 
 
     def Y_cumCalExplVar_indVar(self):
@@ -1420,7 +854,7 @@ class nipalsPLS2:
         components, second row represents one component, third row represents
         two components, etc. Columns represent variables.
         """
-        return self.cumCalExplVarYarr_indVar
+        return self.calStatsY.cumExplVar_indVar
 
 
     def Y_cumCalExplVar(self):
@@ -1429,7 +863,7 @@ class nipalsPLS2:
         for array X after each component. First number represents zero
         components, second number represents component 1, etc.
         """
-        return self.YcumCalExplVarList
+        return list(self.calStatsY.cumExplVar)
 
 
     def Y_predCal(self):
@@ -1438,7 +872,7 @@ class nipalsPLS2:
         component from calibration. Dictionary key represents order of
         components.
         """
-        return self.calYpredDict
+        return self.calFitsY.predictions()
 
     def Y_PRESSE_indVar(self):
         """
@@ -1447,7 +881,7 @@ class nipalsPLS2:
         PRESSE for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSEarr_indVar
+        return self.calStatsY.PRESS_indVar
 
 
     def Y_PRESSE(self):
@@ -1457,7 +891,7 @@ class nipalsPLS2:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.PRESSE_total_list
+        return self.calStatsY.PRESS
 
 
     def Y_MSEE_indVar(self):
@@ -1467,7 +901,7 @@ class nipalsPLS2:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEEarr_indVar
+        return self.calStatsY.MSE_indVar
 
 
     def Y_MSEE(self):
@@ -1477,7 +911,7 @@ class nipalsPLS2:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.MSEE_total_list
+        return self.calStatsY.MSE
 
 
     def Y_RMSEE_indVar(self):
@@ -1487,7 +921,7 @@ class nipalsPLS2:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEEarr_indVar
+        return self.calStatsY.RMSE_indVar
 
 
     def Y_RMSEE(self):
@@ -1497,7 +931,7 @@ class nipalsPLS2:
         for zero components, second row for component 1, third row for
         component 2, etc.
         """
-        return self.RMSEE_total_list
+        return self.calStatsY.RMSE
 
 
     def Y_valExplVar(self):
@@ -1506,7 +940,7 @@ class nipalsPLS2:
         each component. First number in list is for component 1, second number
         for component 2, third number for component 3, etc.
         """
-        return self.YvalExplVarList
+        return list(self.valStatsY.explVar)
 
 
     def Y_cumValExplVar_indVar(self):
@@ -1516,7 +950,7 @@ class nipalsPLS2:
         zero components, second row represents component 1, third row for
         compnent 2, etc. Columns represent variables.
         """
-        return self.cumValExplVarYarr_indVar
+        return self.valStatsY.cumExplVar_indVar
 
 
     def Y_cumValExplVar(self):
@@ -1525,15 +959,16 @@ class nipalsPLS2:
         for array X after each component. First number represents zero
         components, second number represents component 1, etc.
         """
-        return self.YcumValExplVarList
+        return list(self.valStatsY.cumExplVar)
 
 
     def Y_predVal(self):
         """
         Returns dictionary holding arrays of predicted Yhat after each
         component from validation. Dictionary key represents order of
-        component.
+        component. Only available with ``cvPredictions = True``.
         """
+        assert self.valYpredDict is not None, ValueError('validated predictions are only kept with cvPredictions=True')
         return self.valYpredDict
 
 
@@ -1544,7 +979,7 @@ class nipalsPLS2:
         PRESSCV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.PRESSCVarr_indVar
+        return self.valStatsY.PRESS_indVar
 
 
     def Y_PRESSCV(self):
@@ -1554,7 +989,7 @@ class nipalsPLS2:
         PRESSCV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.PRESSCV_total_list
+        return self.valStatsY.PRESS
 
 
     def Y_MSECV_indVar(self):
@@ -1564,7 +999,7 @@ class nipalsPLS2:
         MSECV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.MSECVarr_indVar
+        return self.valStatsY.MSE_indVar
 
 
     def Y_MSECV(self):
@@ -1574,7 +1009,7 @@ class nipalsPLS2:
         MSECV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.MSECV_total_list
+        return self.valStatsY.MSE
 
 
     def Y_RMSECV_indVar(self):
@@ -1584,7 +1019,7 @@ class nipalsPLS2:
         RMSECV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.RMSECVarr_indVar
+        return self.valStatsY.RMSE_indVar
 
 
     def Y_RMSECV(self):
@@ -1594,7 +1029,7 @@ class nipalsPLS2:
         RMSECV for zero components, second row component 1, third row for
         component 2, etc.
         """
-        return self.RMSECV_total_list
+        return self.valStatsY.RMSE
 
 
     def regressionCoefficients(self, numComp=1):
@@ -1635,11 +1070,29 @@ class nipalsPLS2:
         return np.dot(x_new, self.regressionCoefficients(numComp)) + np.mean(self.arrY_input, axis=0)
 
 
+    def freeze(self):
+        """
+        Returns an immutable predictor for new X data, which holds only the
+        means, scales, loadings and regression coefficients. It does not
+        refer to the training data, see hoggorm.predictor.Predictor.
+        """
+        Xmeans = np.average(self.arrX_input, axis=0)
+        Xstd = np.std(self.arrX_input, ddof=1, axis=0) if self.Xstand else None
+        Ystd = np.std(self.arrY_input, ddof=1, axis=0) if self.Ystand else None
+
+        # Scores of new X data: x_new * W*inv(P'W)
+        arrR = np.dot(self.arrW, np.linalg.inv(np.dot(np.transpose(self.arrP), self.arrW)))
+
+        return pred.Predictor(Xmeans, Xstd, arrR, Ymeans=np.average(self.arrY_input, axis=0), Yscale=Ystd,
+                              arrQ=self.arrQ_alt)
+
+
     def cvTrainAndTestData(self):
         """
         Returns a list consisting of dictionaries holding training and test
-        sets.
+        sets. Not available with ``cvRetention = "none"``.
         """
+        assert self.cvTrainAndTestDataList is not None, ValueError('training and test sets are not kept with cvRetention="none"')
         return self.cvTrainAndTestDataList
 
 
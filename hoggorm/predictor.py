@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Prediction from fitted models without reference to the training data.
+
+``freeze()`` of the model classes returns a ``Predictor`` holding only what
+is needed to score and predict new objects: the means and scales of the
+variables, the X weights that give the scores and the regression
+coefficients for every number of components. The scales are folded into
+the weights and coefficients when the predictor is made, such that new data
+only have to be centred and multiplied by one array.
+
+>>> import hoggorm as ho
+>>> model = ho.nipalsPLS2(arrX=X, arrY=Y, cvType=["loo"])
+>>> predictor = model.freeze()
+>>> Yhat = predictor.Y_predict(Xnew, numComp=3)
+
+A predictor cannot be changed after it is made and its arrays are
+read-only, such that it may be shared between threads.
+"""
+
+# Import necessary modules
+import numpy as np
+import hoggorm.engines as eng
+
+
+def _frozen(arr):
+    """
+    Returns a read-only copy of ``arr``.
+    """
+    arr = np.array(arr, dtype=float)
+    arr.flags.writeable = False
+    return arr
+
+
+class Predictor:
+    """
+    Immutable predictor for new X data, made by ``freeze()`` of a fitted
+    model.
+
+    PARAMETERS
+    ----------
+    Xmeans : numpy array
+        Column means of X.
+
+    Xscale : numpy array or None
+        Column standard deviations of X if X was standardised, else None.
+
+    arrR : numpy array
+        Weights of shape (p, numComp) that give the scores of pre-processed
+        X data, for example P for PCA and W inv(P'W) for PLS. The first
+        ``a`` columns must give the scores of the model with ``a``
+        components.
+
+    Ymeans : numpy array, optional
+        Column means of Y. Without them the predictor only computes scores.
+
+    Yscale : numpy array, optional
+        Column standard deviations of Y if Y was standardised.
+
+    arrQ : numpy array, optional
+        Y loadings of shape (q, numComp), such that T Q' approximates the
+        pre-processed Y.
+    """
+
+    def __init__(self, Xmeans, Xscale, arrR, Ymeans=None, Yscale=None, arrQ=None):
+        d = self.__dict__
+        d['numPC'] = np.shape(arrR)[1]
+        d['Xmeans'] = _frozen(np.ravel(Xmeans))
+        d['Xscale'] = None if Xscale is None else _frozen(np.ravel(Xscale))
+
+        # Weights for centred X data: R / s_x
+        arrR = np.array(arrR, dtype=float)
+        if Xscale is not None:
+            arrR /= self.Xscale[:, np.newaxis]
+        d['scoreWeights'] = _frozen(arrR)
+
+        if Ymeans is None:
+            d['Ymeans'] = d['Yscale'] = d['coefficients'] = None
+            return
+
+        d['Ymeans'] = _frozen(np.ravel(Ymeans))
+        d['Yscale'] = None if Yscale is None else _frozen(np.ravel(Yscale))
+
+        # Coefficients for centred X data, giving centred Y in original
+        # units: R_a Q_a' * s_y for a = 0, 1, ..., numPC. Since the scale of
+        # X is already part of arrR, it need not be applied again.
+        arrQ = np.reshape(arrQ, (-1, self.numPC))
+        coeffs = np.zeros((self.numPC + 1, np.shape(arrR)[0], np.shape(arrQ)[0]))
+        for ind, arrB in enumerate(eng.cumulativeFits(arrR, arrQ)):
+            coeffs[ind+1] = arrB
+        if Yscale is not None:
+            coeffs *= self.Yscale
+        coeffs.flags.writeable = False
+        d['coefficients'] = coeffs
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Predictor is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Predictor is immutable')
+
+    def X_scores_predict(self, Xnew, numComp=None):
+        """
+        Returns array of X scores of new X data. Rows represent objects and
+        columns represent components.
+        """
+        if numComp is None:
+            numComp = self.numPC
+
+        assert numComp <= self.numPC, ValueError('Maximum numComp = ' + str(self.numPC))
+        assert numComp > -1, ValueError('numComp must be >= 0')
+
+        return np.dot(Xnew - self.Xmeans, self.scoreWeights[:, 0:numComp])
+
+    def regressionCoefficients(self, numComp=1):
+        """
+        Returns the regression coefficients of the model with ``numComp``
+        components, for centred X data in original units.
+        """
+        assert self.coefficients is not None, ValueError('predictor of a model without Y')
+        assert numComp <= self.numPC, ValueError('Maximum numComp = ' + str(self.numPC))
+        assert numComp > -1, ValueError('numComp must be >= 0')
+
+        return self.coefficients[numComp]
+
+    def Y_predict(self, Xnew, numComp=1):
+        """
+        Returns predicted Yhat of new X data. Rows represent objects and
+        columns represent Y variables.
+        """
+        return np.dot(Xnew - self.Xmeans, self.regressionCoefficients(numComp)) + self.Ymeans
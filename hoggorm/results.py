@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+Containers for model results that are derived from the scores and loadings
+on request, rather than stored for every number of components or computed
+at fit time.
+"""
+
+# Import necessary modules
+import collections
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:
+    from collections import Mapping, Sequence
+import numpy as np
+import hoggorm.statTools as st
+import hoggorm.cross_val as cv
+import hoggorm.engines as eng
+
+
+# Number of residual arrays kept by each ComponentResiduals. Zero disables
+# caching.
+RESIDUALS_CACHE_SIZE = 2
+
+# What the models keep of the cross validation segments: copies of the
+# training and test sets and the segment models, the index arrays only, or
+# nothing.
+CV_RETENTION = ["full", "indices", "none"]
+
+
+class ComponentResiduals(Mapping):
+    """
+    Read-only dictionary of residual arrays, keyed by number of components.
+    The residuals after ``a`` components
+
+        E_a = arr - (T_a L_a') * scale - offset
+
+    are computed from the scores T and loadings L when requested, such that
+    the model does not hold one array of the size of the data for every
+    component. The most recently used arrays are cached. Returned arrays are
+    read-only.
+
+    PARAMETERS
+    ----------
+    arr : numpy array
+        Array the residuals are computed from, returned for key 0.
+
+    arrT : numpy array
+        Scores of shape (n, numComp).
+
+    arrL : numpy array
+        Loadings of shape (p, numComp), such that T_a L_a' approximates
+        ``arr``.
+
+    first : int, optional
+        Smallest key, 0 (default) or 1.
+
+    scale : numpy array, optional
+        Factor the reconstruction is multiplied with.
+
+    offset : numpy array, optional
+        Term added to the reconstruction.
+
+    cacheSize : int, optional
+        Number of arrays kept, see RESIDUALS_CACHE_SIZE.
+    """
+
+    def __init__(self, arr, arrT, arrL, first=0, scale=None, offset=None, cacheSize=None):
+        self.arr = arr
+        self.arrT = arrT
+        self.arrL = arrL
+        self.first = first
+        self.scale = scale
+        self.offset = offset
+        if cacheSize is None:
+            cacheSize = RESIDUALS_CACHE_SIZE
+        self.cacheSize = cacheSize
+        self._cache = collections.OrderedDict()
+
+    def __len__(self):
+        return np.shape(self.arrT)[1] + 1 - self.first
+
+    def __iter__(self):
+        return iter(range(self.first, np.shape(self.arrT)[1] + 1))
+
+    def __contains__(self, key):
+        return key in range(self.first, np.shape(self.arrT)[1] + 1)
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        if key == 0:
+            # A read-only view, such that the model's array cannot be
+            # changed through it
+            view = self.arr.view()
+            view.flags.writeable = False
+            return view
+
+        fit = np.dot(self.arrT[:, :key], np.transpose(self.arrL[:, :key]))
+        if self.scale is not None:
+            fit = fit * self.scale
+        if self.offset is not None:
+            fit = fit + self.offset
+        res = self.arr - fit.reshape(np.shape(self.arr))
+        res.flags.writeable = False
+
+        if self.cacheSize > 0:
+            self._cache[key] = res
+            while len(self._cache) > self.cacheSize:
+                self._cache.popitem(last=False)
+        return res
+
+    def clearCache(self):
+        """
+        Releases the cached residual arrays.
+        """
+        self._cache.clear()
+
+
+class ValidationErrors:
+    """
+    Accumulates the squared errors of the validated predictions of each
+    variable, for 0 up to ``numComp`` components, as the cross validation
+    segments finish. The sums (PRESSCV) take (numComp + 1) x p memory. The
+    validated predictions themselves, one array of the size of the data for
+    each number of components, are only kept if requested.
+
+    PARAMETERS
+    ----------
+    arrInput : numpy array
+        Data as provided by the user, which the segments predict.
+
+    numComp : int
+        Maximum number of components.
+
+    keep : boolean, optional
+        Whether the validated predictions are kept in ``preds`` (default
+        True). Otherwise ``preds`` is None.
+
+    press : numpy array, optional
+        Zero initialised (numComp + 1) x p array the sums are accumulated
+        in, for example ``ErrorStatistics.accumulator``.
+    """
+
+    def __init__(self, arrInput, numComp, keep=True, press=None):
+        self.arrInput = arrInput
+        if press is None:
+            press = np.zeros((numComp + 1,) + np.shape(arrInput)[1:])
+        self.press = press
+        if keep:
+            self.preds = {}
+            for ind in range(1, numComp + 1):
+                self.preds[ind] = np.zeros(np.shape(arrInput))
+        else:
+            self.preds = None
+
+    def add(self, numComp, test_index, pred):
+        """
+        Adds the predictions ``pred`` of the objects in ``test_index`` by a
+        model with ``numComp`` components. With zero components the
+        prediction is the mean of the training set. ``test_index`` None
+        stands for all objects.
+        """
+        if test_index is None:
+            test_index = slice(None)
+        self.press[numComp] += np.sum(np.square(self.arrInput[test_index] - pred), axis=0)
+        if numComp > 0 and self.preds is not None:
+            self.preds[numComp][test_index,] = pred
+
+    def addColumn(self, var_index, pred):
+        """
+        Adds the predictions ``pred`` of variable ``var_index`` for all
+        objects, as an array of shape (n, numComp) whose column ``a`` holds
+        the predictions with ``a + 1`` components.
+        """
+        errors = self.arrInput[:, var_index:var_index+1] - pred
+        self.press[1:, var_index] += np.sum(np.square(errors), axis=0)
+        if self.preds is not None:
+            for ind in range(np.shape(pred)[1]):
+                self.preds[ind+1][:, var_index] = pred[:, ind]
+
+
+def _row(arrName, ind, doc):
+    """
+    Property returning row ``ind`` of array attribute ``arrName``, after
+    the statistics are computed.
+    """
+    def get(self):
+        self.compute()
+        return getattr(self, arrName)[ind]
+    return property(get, doc=doc)
+
+
+class CalibratedFits:
+    """
+    Calibrated predictions
+
+        hat_a = (T_a L_a') * scale + offset
+
+    of ``arrInput`` for a = 1, 2, ..., numComp and their PRESS, computed
+    when first requested.
+
+    PARAMETERS
+    ----------
+    arrInput : numpy array
+        Data as provided by the user.
+
+    arrT : numpy array
+        Scores of shape (n, numComp).
+
+    arrL : numpy array
+        Loadings of shape (p, numComp).
+
+    scale : numpy array, optional
+        Factor the reconstruction is multiplied with.
+
+    offset : numpy array, optional
+        Term added to the reconstruction.
+    """
+
+    def __init__(self, arrInput, arrT, arrL, scale=None, offset=None):
+        self.arrInput = arrInput
+        self.arrT = arrT
+        self.arrL = arrL
+        self.scale = scale
+        self.offset = offset
+        self.arrPred = None
+        self.predDict = None
+
+    def _fits(self, arrOut=None):
+        """
+        Yields the predictions for 1, 2, ... components. They are written to
+        ``arrOut`` of shape (numComp, n, p) if given, otherwise to one work
+        array that is overwritten each time.
+        """
+        if arrOut is None:
+            work = np.empty(np.shape(self.arrInput))
+        for ind, fit in enumerate(eng.cumulativeFits(self.arrT, self.arrL)):
+            hat = work if arrOut is None else arrOut[ind]
+            if self.scale is not None:
+                np.multiply(fit, self.scale, out=hat)
+                hat += self.offset
+            else:
+                np.add(fit, self.offset, out=hat)
+            yield hat
+
+    def press(self, out):
+        """
+        Writes the PRESS of each variable for 0, 1, ... components to
+        ``out`` of shape (numComp + 1, p). Only one array of the size of
+        the data is held at a time.
+        """
+        np.sum(np.square(st.center(self.arrInput)), axis=0, out=out[0])
+        for ind, hat in enumerate(self._fits()):
+            np.subtract(self.arrInput, hat, out=hat)
+            np.sum(np.square(hat), axis=0, out=out[ind+1])
+
+    def predictions(self):
+        """
+        Returns a dictionary holding the predictions, keyed by number of
+        components. They are views of one array of shape (numComp, n, p).
+        """
+        if self.predDict is None:
+            self.arrPred = np.empty((np.shape(self.arrT)[1],) + np.shape(self.arrInput))
+            for hat in self._fits(self.arrPred):
+                pass
+            self.predDict = {ind+1: hat for ind, hat in enumerate(self.arrPred)}
+        return self.predDict
+
+
+class ErrorStatistics:
+    """
+    Error statistics and explained variances for 0 up to ``numComp``
+    components, held in two contiguous arrays: one for the individual
+    variables and one for the totals across variables. The statistics are
+    read-only views of these arrays.
+
+    Nothing is computed until one of the statistics is first requested.
+    Then the PRESS of each variable is obtained from ``source``, or is
+    taken to be accumulated in ``accumulator`` by then, and
+
+        MSE = PRESS / n,    RMSE = sqrt(MSE),
+        cumExplVar = (MSE_0 - MSE) / MSE_0 * 100
+
+    are derived for each variable and in total. With standardised variables
+    the total cumulative explained variance is the average over the
+    variables.
+
+    PARAMETERS
+    ----------
+    numComp : int
+        Maximum number of components.
+
+    shape : tuple
+        Shape (n, p) of the data the statistics are computed for.
+
+    standardised : boolean, optional
+        Whether the variables were standardised (default False).
+
+    source : function, optional
+        Called with the (numComp + 1) x p PRESS array to fill it in, for
+        example ``CalibratedFits.press``.
+    """
+
+    def __init__(self, numComp, shape, standardised=False, source=None):
+        self.numObj, self.numVar = shape
+        self.standardised = standardised
+        self.source = source
+        self.computed = False
+        self.arr_indVar = np.zeros((4, numComp + 1, self.numVar))
+        self.arr_total = np.zeros((5, numComp + 1))
+
+        # Zero initialised PRESS array, for accumulating validation errors
+        self.accumulator = self.arr_indVar[0]
+
+    PRESS_indVar = _row('arr_indVar', 0, "(numComp + 1) x p array of PRESS.")
+    MSE_indVar = _row('arr_indVar', 1, "(numComp + 1) x p array of MSE.")
+    RMSE_indVar = _row('arr_indVar', 2, "(numComp + 1) x p array of RMSE.")
+    cumExplVar_indVar = _row('arr_indVar', 3, "(numComp + 1) x p array of cumulative explained variance.")
+    PRESS = _row('arr_total', 0, "Total PRESS for 0, 1, ... components.")
+    MSE = _row('arr_total', 1, "Total MSE for 0, 1, ... components.")
+    RMSE = _row('arr_total', 2, "Total RMSE for 0, 1, ... components.")
+    cumExplVar = _row('arr_total', 3, "Total cumulative explained variance for 0, 1, ... components.")
+
+    @property
+    def explVar(self):
+        """
+        Total explained variance of component 1, 2, ...
+        """
+        self.compute()
+        return self.arr_total[4, 1:]
+
+    def compute(self):
+        """
+        Computes all statistics, if not done before, and makes the arrays
+        read-only.
+        """
+        if self.computed:
+            return
+        if self.source is not None:
+            self.source(self.accumulator)
+
+        PRESS_indVar, MSE_indVar, RMSE_indVar, cumExplVar_indVar = self.arr_indVar
+        PRESS, MSE, RMSE, cumExplVar, explVar = self.arr_total
+
+        np.divide(PRESS_indVar, self.numObj, out=MSE_indVar)
+        np.sqrt(MSE_indVar, out=RMSE_indVar)
+        np.subtract(MSE_indVar[0], MSE_indVar, out=cumExplVar_indVar)
+        cumExplVar_indVar /= MSE_indVar[0]
+        cumExplVar_indVar *= 100
+
+        np.sum(PRESS_indVar, axis=1, out=PRESS)
+        np.sum(MSE_indVar, axis=1, out=MSE)
+        MSE /= self.numVar
+        np.sqrt(MSE, out=RMSE)
+        if self.standardised:
+            cumExplVar[:] = np.average(cumExplVar_indVar, axis=1)
+        else:
+            np.subtract(MSE[0], MSE, out=cumExplVar)
+            cumExplVar /= MSE[0]
+            cumExplVar *= 100
+        np.subtract(cumExplVar[1:], cumExplVar[:-1], out=explVar[1:])
+
+        self.arr_indVar.flags.writeable = False
+        self.arr_total.flags.writeable = False
+        self.accumulator = None
+        self.computed = True
+
+
+class SegmentData(Sequence):
+    """
+    Read-only list of dictionaries holding the training and test sets of
+    each cross validation segment. Only the index arrays are stored, the
+    sets are extracted from the input arrays when an element is requested.
+
+    PARAMETERS
+    ----------
+    segments : list
+        Pairs of boolean train and test index arrays as produced by the
+        iterators in hoggorm.cross_val.
+
+    arrays : list
+        Pairs of name and array, for example ``[('x', arrX), ('y', arrY)]``.
+        The sets are returned with keys ``'x train'``, ``'x test'``, etc.
+
+    train : list, optional
+        Names of the arrays whose training sets are returned, by default
+        all of them. If any are left out, the boolean train index is
+        returned with key ``'train index'`` instead.
+    """
+
+    def __init__(self, segments, arrays, train=None):
+        self.segments = list(segments)
+        self.arrays = arrays
+        if train is None:
+            train = [name for name, arr in arrays]
+        self.train = train
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __getitem__(self, ind):
+        if isinstance(ind, slice):
+            return [self[i] for i in range(*ind.indices(len(self)))]
+
+        train_index, test_index = self.segments[ind]
+        subDict = {}
+        if len(self.train) < len(self.arrays):
+            subDict['train index'] = train_index
+        for name, arr in self.arrays:
+            if name in self.train:
+                subDict[name + ' train'], subDict[name + ' test'] = cv.split(train_index, test_index, arr)
+            else:
+                subDict[name + ' test'] = np.asanyarray(arr)[test_index]
+        return subDict
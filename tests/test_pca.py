@@ -14,6 +14,7 @@ import numpy as np
 import pytest
 
 from hoggorm import nipalsPCA as PCA
+from hoggorm import engines as eng
 
 
 # If the following equation is element-wise True, then allclose returns True.
@@ -117,6 +118,167 @@ def pcaref(request, datafolder):
     return (rname, refdat)
 
 
+@pytest.mark.parametrize("algorithm", ["svd", "eig", "gram", "auto"])
+def test_algorithm_equivalence(pcacached, cfldat, algorithm):
+    """
+    Check that decomposition based algorithms reproduce the NIPALS model,
+    including the sign of the components and the cross validation results.
+    """
+    pca = PCA(cfldat, cvType=["loo"], algorithm=algorithm)
+    numComp = 5
+    assert np.allclose(pca.X_scores()[:, :numComp], pcacached.X_scores()[:, :numComp], rtol=rtol, atol=1e-6)
+    assert np.allclose(pca.X_loadings()[:, :numComp], pcacached.X_loadings()[:, :numComp], rtol=rtol, atol=1e-6)
+    assert np.allclose(pca.X_PRESSCV()[:numComp], pcacached.X_PRESSCV()[:numComp], rtol=rtol, atol=atol)
+
+
+@pytest.mark.parametrize("Xstand", [False, True])
+def test_downdate_cv(cfldat, Xstand):
+    """
+    Check that cross validation from the downdated Gram array gives the same
+    validation results as refitting each training set.
+    """
+    refit = PCA(cfldat, numComp=5, Xstand=Xstand, cvType=["KFold", 7], algorithm="svd")
+    downdate = PCA(cfldat, numComp=5, Xstand=Xstand, cvType=["KFold", 7], cvEngine="downdate")
+    assert np.allclose(downdate.X_PRESSCV(), refit.X_PRESSCV(), rtol=rtol, atol=atol)
+    assert np.allclose(downdate.X_predVal()[5], refit.X_predVal()[5], rtol=rtol, atol=atol)
+
+
+def test_ekf_cv(cfldat):
+    """
+    Check element-wise (ekf) cross validation against a direct computation
+    with one SVD per left out row and per left out column.
+    """
+    X = cfldat[:, ::20]
+    numComp = 3
+    pca = PCA(X, numComp=numComp, cvType=["ekf"])
+
+    Xc = X - np.mean(X, axis=0)
+    U, s, Vt = np.linalg.svd(Xc, full_matrices=False)
+    predX = np.zeros((numComp,) + np.shape(X))
+    for i in range(np.shape(X)[0]):
+        s_i, V_i = np.linalg.svd(np.delete(Xc, i, 0), full_matrices=False)[1:]
+        V_i = V_i[:numComp].T * np.sign(np.sum(V_i[:numComp].T * Vt[:numComp].T, axis=0))
+        for j in range(np.shape(X)[1]):
+            U_j, s_j = np.linalg.svd(np.delete(Xc, j, 1), full_matrices=False)[:2]
+            U_j = U_j[:, :numComp] * np.sign(np.sum(U_j[:, :numComp] * U[:, :numComp], axis=0))
+            terms = U_j[i] * np.sqrt(s_j[:numComp]) * V_i[j] * np.sqrt(s_i[:numComp])
+            predX[:, i, j] = np.cumsum(terms)
+
+    PRESSCV = np.sum(np.square(X - np.mean(X, axis=0) - predX), axis=(1, 2))
+    assert np.allclose(pca.X_PRESSCV()[1:], PRESSCV, rtol=rtol, atol=atol)
+    assert np.shape(pca.X_PRESSCV_indVar()) == (numComp + 1, np.shape(X)[1])
+    assert np.allclose(pca.X_predVal()[numComp], predX[-1] + np.mean(X, axis=0), rtol=rtol, atol=atol)
+
+    # The validated statistics are the same without keeping the predictions
+    streamed = PCA(X, numComp=numComp, cvType=["ekf"], cvPredictions=False)
+    assert np.allclose(streamed.X_PRESSCV_indVar(), pca.X_PRESSCV_indVar(), rtol=rtol, atol=atol)
+    assert streamed.valXpredDict is None
+
+
+def test_parallel_cv(pcacached, cfldat):
+    """
+    Check that cross validation in worker processes gives exactly the
+    results of the serial run.
+    """
+    pca = PCA(cfldat, cvType=["loo"], n_jobs=2)
+    assert np.array_equal(pca.X_PRESSCV(), pcacached.X_PRESSCV())
+    assert np.array_equal(pca.X_predVal()[3], pcacached.X_predVal()[3])
+
+
+def test_parallel_cv_memmap(pcacached, cfldat, monkeypatch):
+    """
+    Check that workers reading the data from a memory-mapped file, used
+    where shared memory is not available, give the serial results.
+    """
+    import hoggorm.parallel as parallel
+    monkeypatch.setattr(parallel, "shared_memory", None)
+    pca = PCA(cfldat, cvType=["loo"], n_jobs=2)
+    assert np.array_equal(pca.X_PRESSCV(), pcacached.X_PRESSCV())
+
+
+def test_execution_context(pcacached, cfldat):
+    """
+    Check that the execution context splits the cores, is picked up by
+    models created within it and is restored on exit.
+    """
+    import hoggorm as ho
+    with ho.executionContext(cores=4, n_jobs=2) as context:
+        assert context == {'n_jobs': 2, 'blasThreads': 2}
+        pca = PCA(cfldat, cvType=["loo"])
+    assert pca.modelSettings()['n_jobs'] == 2
+    assert np.array_equal(pca.X_PRESSCV(), pcacached.X_PRESSCV())
+    assert ho.getExecutionContext() == {'n_jobs': None, 'blasThreads': None}
+
+
+def test_warm_start_cv(pcacached, cfldat):
+    """
+    Check that warm starting NIPALS in the CV segments from the full model
+    gives the cold start results up to the convergence threshold.
+    """
+    pca = PCA(cfldat, cvType=["loo"], warmStart=True)
+    assert np.allclose(pca.X_PRESSCV(), pcacached.X_PRESSCV(), rtol=rtol, atol=atol)
+    assert np.allclose(pca.X_predVal()[4], pcacached.X_predVal()[4], rtol=rtol, atol=1e-4)
+
+
+@pytest.mark.parametrize("options", [{"extrapolation": "aitken"},
+                                     {"extrapolation": "anderson", "start": "maxVariance"},
+                                     {"tol": 1e-9, "reorthogonalise": 5},
+                                     {"deflation": "implicit", "start": "maxVariance"}])
+def test_nipals_options(pcacached, cfldat, options):
+    """
+    Check that the NIPALS convergence controls reproduce the default model.
+    """
+    pca = PCA(cfldat, cvType=["loo"], algorithmOptions=options)
+    assert np.allclose(pca.X_scores(), pcacached.X_scores(), rtol=rtol, atol=1e-3)
+    assert np.allclose(pca.X_loadings(), pcacached.X_loadings(), rtol=rtol, atol=1e-6)
+    assert np.allclose(pca.X_PRESSCV(), pcacached.X_PRESSCV(), rtol=rtol, atol=atol)
+
+
+def test_nipals_max_iter(cfldat):
+    """
+    Check that a component that has not converged within max_iter
+    iterations is reported.
+    """
+    X = cfldat - np.mean(cfldat, axis=0)
+    with pytest.warns(RuntimeWarning):
+        eng.pcaNipals(X, 3, max_iter=1, extrapolation="aitken")
+
+
+def test_streaming_cv(pcacached, cfldat):
+    """
+    Check that the validated statistics accumulated without keeping the
+    validated predictions are those of the default model.
+    """
+    pca = PCA(cfldat, cvType=["loo"], cvPredictions=False)
+    assert np.allclose(pca.X_PRESSCV(), pcacached.X_PRESSCV(), rtol=rtol, atol=atol)
+    assert np.allclose(pca.X_PRESSCV_indVar(), pcacached.X_PRESSCV_indVar(), rtol=rtol, atol=atol)
+    assert pca.valXpredDict is None
+    with pytest.raises(AssertionError):
+        pca.X_predVal()
+
+
+@pytest.mark.parametrize("cvEngine", ["refit", "downdate"])
+def test_cv_retention(pcacached, cfldat, cvEngine):
+    """
+    Check that the training and test sets rebuilt from the segment indices
+    equal the stored copies, and that nothing is kept on request.
+    """
+    full = PCA(cfldat, cvType=["KFold", 4], cvEngine=cvEngine)
+    indices = PCA(cfldat, cvType=["KFold", 4], cvEngine=cvEngine, cvRetention="indices")
+    assert len(indices.cvTrainAndTestData()) == len(full.cvTrainAndTestData())
+    for fullDict, indDict in zip(full.cvTrainAndTestData(), indices.cvTrainAndTestData()):
+        assert list(indDict) == list(fullDict)
+        for key in fullDict:
+            assert np.array_equal(indDict[key], fullDict[key]), key
+    assert indices.val_arrPlist is None
+    assert np.array_equal(indices.X_PRESSCV(), full.X_PRESSCV())
+
+    none = PCA(cfldat, cvType=["loo"], cvRetention="none")
+    assert np.array_equal(none.X_PRESSCV(), pcacached.X_PRESSCV())
+    with pytest.raises(AssertionError):
+        none.cvTrainAndTestData()
+
+
 @pytest.fixture(scope="module")
 def pcacached(cfldat):
     return PCA(cfldat, cvType=["loo"])
@@ -132,3 +294,71 @@ def dump_res(rname, dat):
     dumpfolder = osp.realpath(osp.dirname(__file__))
     dumpfn = "dump_PCA_{}.tsv".format(rname.lower())
     np.savetxt(osp.join(dumpfolder, dumpfn), dat, fmt='%.9e', delimiter='\t')
+
+
+def test_deflate(cfldat):
+    """
+    Check that the in-place, row blocked deflation equals subtracting the
+    outer product.
+    """
+    X = cfldat - np.mean(cfldat, axis=0)
+    T, P = eng.pcaNipals(X, 2)
+    t, p = T[:, :1], P[:, :1]
+    X_new = X.copy()
+    eng.deflate(X_new, t, p, scale=2.0, block=5)
+    assert np.array_equal(X_new, X - 2.0 * np.dot(t, p.T))
+
+
+def test_cumulative_fits(pcacached):
+    """
+    Check that the running sums of rank one terms equal the products of the
+    leading scores and loadings.
+    """
+    T, P = pcacached.arrT, pcacached.arrP
+    for ind, fit in enumerate(eng.cumulativeFits(T, P)):
+        assert np.allclose(fit, np.dot(T[:, :ind+1], P[:, :ind+1].T), rtol=rtol, atol=atol)
+
+
+def test_lazy_statistics(cfldat):
+    """
+    Check that the calibrated predictions and statistics are computed when
+    first requested, and equal the ones of a fully evaluated model.
+    """
+    pca = PCA(arrX=cfldat, numComp=3, cvType=["loo"])
+    assert not pca.calStatsX.computed
+    assert not pca.valStatsX.computed
+    assert pca.calFitsX.predDict is None
+    cumCal = pca.X_cumCalExplVar()
+    assert pca.calStatsX.computed
+    assert pca.calFitsX.predDict is None
+    for ind, hat in pca.X_predCal().items():
+        assert np.allclose(hat, np.dot(pca.arrT[:, :ind], pca.arrP[:, :ind].T) + pca.X_means(), rtol=rtol, atol=atol)
+        assert np.allclose(np.sum(np.square(cfldat - hat)), pca.X_PRESSE()[ind], rtol=rtol, atol=atol)
+    assert cumCal == pca.X_cumCalExplVar()
+    assert pca.X_cumValExplVar()[-1] <= cumCal[-1]
+
+
+def test_corr_loadings(pcacached):
+    """
+    Check the correlation loadings against the correlations of each pair of
+    score vector and variable, and that they are computed only once.
+    """
+    T, X = pcacached.X_scores(), pcacached.arrX_input
+    corrLoadings = pcacached.X_corrLoadings()
+    for var in range(np.shape(X)[1]):
+        for PC in range(np.shape(T)[1]):
+            assert np.isclose(corrLoadings[var, PC], np.corrcoef(T[:, PC], X[:, var])[0, 1], rtol=rtol, atol=atol)
+    assert pcacached.X_corrLoadings() is corrLoadings
+
+
+def test_freeze(cfldat):
+    """
+    Check that the frozen predictor of a standardised model gives the scores
+    of the model and does not predict Y.
+    """
+    pca = PCA(arrX=cfldat, numComp=3, Xstand=True, cvType=["loo"])
+    predictor = pca.freeze()
+    assert np.allclose(predictor.X_scores_predict(cfldat), pca.X_scores(), rtol=rtol, atol=atol)
+    assert predictor.coefficients is None
+    with pytest.raises(AssertionError):
+        predictor.Y_predict(cfldat)
@@ -143,6 +143,76 @@ def pcrref(request, datafolder):
     return (rname, refdat)
 
 
+def test_randomized_algorithm(pcrcached, cfldat, csedat):
+    """
+    Check that the randomized engine is reproducible with a seed and
+    reproduces the leading NIPALS components, including their sign.
+    """
+    opts = {"oversampling": 4, "powerIter": 4, "seed": 42}
+    pcr1 = PCR(arrX=cfldat, arrY=csedat, numComp=3, cvType=["loo"], algorithm="randomized", algorithmOptions=opts)
+    pcr2 = PCR(arrX=cfldat, arrY=csedat, numComp=3, cvType=["loo"], algorithm="randomized", algorithmOptions=opts)
+    assert np.array_equal(pcr1.X_scores(), pcr2.X_scores())
+    assert np.allclose(pcr1.X_scores(), pcrcached.X_scores()[:, :3], rtol=1e-4, atol=1e-6)
+    assert np.allclose(pcr1.Y_loadings(), pcrcached.Y_loadings()[:, :3], rtol=1e-4, atol=1e-6)
+    assert np.allclose(pcr1.Y_PRESSCV(), pcrcached.Y_PRESSCV()[:4], rtol=1e-4)
+
+
+def test_downdate_cv(cfldat, csedat):
+    """
+    Check that cross validation from the downdated Gram array gives the same
+    validation results as refitting each training set.
+    """
+    refit = PCR(arrX=cfldat, arrY=csedat, numComp=5, cvType=["loo"], algorithm="svd")
+    downdate = PCR(arrX=cfldat, arrY=csedat, numComp=5, cvType=["loo"], cvEngine="downdate")
+    assert np.allclose(downdate.X_PRESSCV(), refit.X_PRESSCV(), rtol=rtol, atol=atol)
+    assert np.allclose(downdate.Y_PRESSCV(), refit.Y_PRESSCV(), rtol=rtol, atol=atol)
+    assert np.allclose(downdate.Y_predVal()[5], refit.Y_predVal()[5], rtol=rtol, atol=atol)
+
+
+def test_hatloo_cv(cfldat, csedat):
+    """
+    Check the closed form leave one out results against explicit leave one
+    out least squares regressions on the (fixed) scores of the full model.
+    """
+    pcr = PCR(arrX=cfldat, arrY=csedat, numComp=4, cvType=["loo"], algorithm="svd", cvEngine="hatLOO")
+    # The calibrated fits are not materialised by the closed form residuals
+    assert pcr.calFitsX.predDict is None and pcr.calFitsY.predDict is None
+    T = pcr.X_scores()
+    numObj = np.shape(csedat)[0]
+    for numComp in range(5):
+        Z = np.hstack([np.ones((numObj, 1)), T[:, :numComp]])
+        predY = np.zeros(np.shape(csedat))
+        for i in range(numObj):
+            keep = np.arange(numObj) != i
+            B = np.linalg.lstsq(Z[keep], csedat[keep], rcond=None)[0]
+            predY[i] = np.dot(Z[i], B)
+        assert np.allclose(pcr.Y_PRESSCV()[numComp], np.sum(np.square(csedat - predY)), rtol=rtol, atol=atol)
+        if numComp > 0:
+            assert np.allclose(pcr.Y_predVal()[numComp], predY, rtol=rtol, atol=atol)
+
+
+def test_parallel_cv(pcrcached, cfldat, csedat):
+    """
+    Check that cross validation in worker processes gives exactly the
+    results of the serial run.
+    """
+    pcr = PCR(arrX=cfldat, arrY=csedat, cvType=["loo"], n_jobs=2)
+    assert np.array_equal(pcr.X_PRESSCV(), pcrcached.X_PRESSCV())
+    assert np.array_equal(pcr.Y_PRESSCV(), pcrcached.Y_PRESSCV())
+    assert np.array_equal(pcr.Y_predVal()[3], pcrcached.Y_predVal()[3])
+
+
+def test_freeze(pcrcached, cfldat):
+    """
+    Check that the frozen predictor gives the predictions and scores of the
+    model.
+    """
+    predictor = pcrcached.freeze()
+    for numComp in range(1, pcrcached.numPC + 1):
+        assert np.allclose(predictor.Y_predict(cfldat, numComp), pcrcached.Y_predict(cfldat, numComp), rtol=rtol, atol=atol)
+        assert np.allclose(predictor.X_scores_predict(cfldat, numComp), pcrcached.X_scores()[:, :numComp], rtol=rtol, atol=atol)
+
+
 @pytest.fixture(scope="module")
 def pcrcached(cfldat, csedat):
     return PCR(arrX=cfldat, arrY=csedat, cvType=["loo"])
@@ -141,6 +141,102 @@ def pls1ref(request, datafolder):
     return (rname, refdat)
 
 
+@pytest.mark.parametrize("form", ["covariance", "gram"])
+def test_kernel_algorithm(pls1cached, cfldat, csecol2dat, form):
+    """
+    Check that both forms of the kernel algorithm reproduce the NIPALS model
+    and its cross validation results.
+    """
+    pls1 = PLS1(arrX=cfldat, vecy=csecol2dat, cvType=["loo"], algorithm="kernel", algorithmOptions={"form": form})
+    assert np.allclose(pls1.X_scores(), pls1cached.X_scores(), rtol=rtol, atol=atol)
+    assert np.allclose(pls1.X_loadings(), pls1cached.X_loadings(), rtol=rtol, atol=atol)
+    assert np.allclose(pls1.X_loadingWeights(), pls1cached.X_loadingWeights(), rtol=rtol, atol=atol)
+    assert np.allclose(pls1.Y_loadings(), pls1cached.Y_loadings(), rtol=rtol, atol=atol)
+    assert np.allclose(pls1.Y_MSECV(), pls1cached.Y_MSECV(), rtol=rtol, atol=atol)
+
+
+def test_bidiag_algorithm(pls1cached, cfldat, csecol2dat):
+    """
+    Check that the bidiagonalisation algorithm reproduces the NIPALS model
+    and that the regression coefficients match B = W*inv(P'W)*Q'.
+    """
+    pls1 = PLS1(arrX=cfldat, vecy=csecol2dat, cvType=["loo"], algorithm="bidiag")
+    for fn in ["X_scores", "X_loadings", "X_loadingWeights", "Y_loadings", "Y_MSECV"]:
+        assert np.allclose(getattr(pls1, fn)(), getattr(pls1cached, fn)(), rtol=rtol, atol=atol), fn
+
+    W = pls1cached.X_loadingWeights()
+    P = pls1cached.X_loadings()
+    Q = pls1cached.Y_loadings()
+    for numComp in range(1, pls1cached.numPC + 1):
+        B = np.dot(np.dot(W[:, :numComp], np.linalg.inv(np.dot(P[:, :numComp].T, W[:, :numComp]))), Q[:, :numComp].T)
+        assert np.allclose(pls1.regressionCoefficients(numComp), B, rtol=rtol, atol=atol)
+        assert np.allclose(pls1cached.regressionCoefficients(numComp), B, rtol=rtol, atol=atol)
+
+
+def test_implicit_deflation(pls1cached, cfldat, csecol2dat):
+    """
+    Check that NIPALS without explicit residual matrices gives the same
+    model.
+    """
+    pls1 = PLS1(arrX=cfldat, vecy=csecol2dat, cvType=["loo"], algorithmOptions={"deflation": "implicit"})
+    for fn in ["X_scores", "X_loadings", "X_loadingWeights", "Y_loadings", "Y_MSECV"]:
+        assert np.allclose(getattr(pls1, fn)(), getattr(pls1cached, fn)(), rtol=rtol, atol=atol), fn
+
+
+@pytest.mark.parametrize("form", ["covariance", "gram"])
+def test_downdate_cv(cfldat, csecol2dat, form):
+    """
+    Check that cross validation from downdated cross-products gives the
+    same validation results as refitting each training set.
+    """
+    for Xstand in [False, True]:
+        refit = PLS1(arrX=cfldat, vecy=csecol2dat, Xstand=Xstand, cvType=["KFold", 7])
+        downdate = PLS1(arrX=cfldat, vecy=csecol2dat, Xstand=Xstand, cvType=["KFold", 7],
+                        algorithm="kernel", algorithmOptions={"form": form}, cvEngine="downdate")
+        assert np.allclose(downdate.Y_MSECV(), refit.Y_MSECV(), rtol=rtol, atol=atol)
+        assert np.allclose(downdate.X_MSECV(), refit.X_MSECV(), rtol=rtol, atol=atol)
+
+
+def test_parallel_cv(pls1cached, cfldat, csecol2dat):
+    """
+    Check that cross validation in worker processes gives exactly the
+    results of the serial run.
+    """
+    pls1 = PLS1(arrX=cfldat, vecy=csecol2dat, cvType=["loo"], n_jobs=2)
+    assert np.array_equal(pls1.Y_MSECV(), pls1cached.Y_MSECV())
+    assert np.array_equal(pls1.X_MSECV(), pls1cached.X_MSECV())
+    assert np.array_equal(pls1.Y_predVal()[3], pls1cached.Y_predVal()[3])
+
+
+def test_residuals_read_only(cfldat, csecol2dat):
+    """
+    Check that the residual arrays, including those of zero components,
+    cannot be written to, such that the model data stay intact.
+    """
+    pls1 = PLS1(arrX=cfldat, vecy=csecol2dat, numComp=3)
+    arrX = pls1.arrX.copy()
+    for numComp in range(4):
+        with pytest.raises(ValueError):
+            pls1.X_residuals()[numComp][:] = 0
+    with pytest.raises(ValueError):
+        pls1.Y_residuals()[0][:] = 0
+    assert np.array_equal(pls1.arrX, arrX)
+
+
+def test_freeze(cfldat, csecol2dat):
+    """
+    Check that the frozen predictor of a standardised model gives the
+    predictions and scores of the model.
+    """
+    pls1 = PLS1(arrX=cfldat, vecy=csecol2dat, numComp=4, Xstand=True, Ystand=True, cvType=["loo"])
+    predictor = pls1.freeze()
+    Xstd = np.std(cfldat, ddof=1, axis=0).reshape(-1, 1)
+    for numComp in range(1, 5):
+        assert np.allclose(predictor.Y_predict(cfldat, numComp), pls1.Y_predict(cfldat, numComp), rtol=rtol, atol=atol)
+        assert np.allclose(predictor.regressionCoefficients(numComp) * Xstd, pls1.regressionCoefficients(numComp), rtol=rtol, atol=atol)
+        assert np.allclose(predictor.X_scores_predict(cfldat, numComp), pls1.X_scores()[:, :numComp], rtol=rtol, atol=atol)
+
+
 @pytest.fixture(scope="module")
 def pls1cached(cfldat, csecol2dat):
     return PLS1(arrX=cfldat, vecy=csecol2dat, cvType=["loo"])
@@ -150,6 +150,116 @@ def pls2ref(request, datafolder):
     return (rname, refdat)
 
 
+def test_simpls_algorithm(pls2cached, cfldat, csedat, csecol2dat):
+    """
+    Check that SIMPLS reproduces NIPALS for a single response and the first
+    component for several responses.
+    """
+    pls2 = PLS2(arrX=cfldat, arrY=csedat, cvType=["loo"], algorithm="simpls")
+    assert np.allclose(pls2.X_scores()[:, 0], pls2cached.X_scores()[:, 0], rtol=rtol, atol=atol)
+    assert np.allclose(pls2.X_loadingWeights()[:, 0], pls2cached.X_loadingWeights()[:, 0], rtol=rtol, atol=atol)
+    assert np.allclose(pls2.Y_loadings()[:, 0], pls2cached.Y_loadings()[:, 0], rtol=rtol, atol=atol)
+
+    nipals = PLS2(arrX=cfldat, arrY=csecol2dat, numComp=4, cvType=["loo"])
+    simpls = PLS2(arrX=cfldat, arrY=csecol2dat, numComp=4, cvType=["loo"], algorithm="simpls")
+    for fn in ["X_scores", "X_loadings", "X_loadingWeights", "Y_scores", "Y_loadings", "Y_MSECV"]:
+        assert np.allclose(getattr(simpls, fn)(), getattr(nipals, fn)(), rtol=rtol, atol=atol), fn
+
+
+def test_parallel_cv(pls2cached, cfldat, csedat):
+    """
+    Check that cross validation in worker processes gives exactly the
+    results of the serial run.
+    """
+    pls2 = PLS2(arrX=cfldat, arrY=csedat, cvType=["loo"], n_jobs=2)
+    assert np.array_equal(pls2.Y_PRESSCV(), pls2cached.Y_PRESSCV())
+    assert np.array_equal(pls2.X_PRESSCV(), pls2cached.X_PRESSCV())
+    assert np.array_equal(pls2.Y_predVal()[3], pls2cached.Y_predVal()[3])
+
+
+def test_warm_start_cv(pls2cached, cfldat, csedat):
+    """
+    Check that warm starting NIPALS in the CV segments from the full model
+    gives the cold start results up to the convergence threshold.
+    """
+    pls2 = PLS2(arrX=cfldat, arrY=csedat, cvType=["loo"], warmStart=True)
+    assert np.allclose(pls2.X_PRESSCV(), pls2cached.X_PRESSCV(), rtol=rtol, atol=atol)
+    assert np.allclose(pls2.Y_PRESSCV(), pls2cached.Y_PRESSCV(), rtol=rtol, atol=atol)
+
+
+def test_implicit_deflation(pls2cached, cfldat, csedat):
+    """
+    Check that NIPALS without explicit residual matrices gives the same
+    model.
+    """
+    pls2 = PLS2(arrX=cfldat, arrY=csedat, cvType=["loo"], algorithmOptions={"deflation": "implicit"})
+    for fn in ["X_scores", "X_loadings", "X_loadingWeights", "Y_scores", "Y_loadings", "Y_PRESSCV"]:
+        assert np.allclose(getattr(pls2, fn)(), getattr(pls2cached, fn)(), rtol=rtol, atol=atol), fn
+
+
+def test_lazy_residuals(pls2cached):
+    """
+    Check that the residuals computed on request equal those of explicit
+    deflation and that the cache is bounded.
+    """
+    X_new = pls2cached.arrX
+    Y_new = pls2cached.arrY
+    X_residuals = pls2cached.X_residuals()
+    Y_residuals = pls2cached.Y_residuals()
+    assert list(X_residuals) == list(range(pls2cached.numPC + 1))
+    for j in range(pls2cached.numPC):
+        t = pls2cached.arrT[:, j:j+1]
+        X_new = X_new - np.dot(t, pls2cached.arrP[:, j:j+1].T)
+        Y_new = Y_new - pls2cached.arrC[j, j] * np.dot(t, pls2cached.arrQ[:, j:j+1].T)
+        assert np.allclose(X_residuals[j+1], X_new, rtol=rtol, atol=atol)
+        assert np.allclose(Y_residuals[j+1], Y_new, rtol=rtol, atol=atol)
+    assert len(X_residuals._cache) <= X_residuals.cacheSize
+
+
+def test_streaming_cv(pls2cached, cfldat, csedat):
+    """
+    Check that the validated statistics accumulated without keeping the
+    validated predictions are those of the default model.
+    """
+    pls2 = PLS2(arrX=cfldat, arrY=csedat, cvType=["loo"], cvPredictions=False)
+    for fn in ["X_PRESSCV", "X_PRESSCV_indVar", "Y_PRESSCV", "Y_PRESSCV_indVar", "Y_RMSECV"]:
+        assert np.allclose(getattr(pls2, fn)(), getattr(pls2cached, fn)(), rtol=rtol, atol=atol), fn
+    with pytest.raises(AssertionError):
+        pls2.Y_predVal()
+
+
+def test_statistics_store(pls2cached):
+    """
+    Check that the statistics are read-only views of one array and agree
+    with their definitions.
+    """
+    n = np.shape(pls2cached.arrY_input)[0]
+    for stats in [pls2cached.calStatsY, pls2cached.valStatsX]:
+        assert stats.PRESS_indVar.base is stats.arr_indVar
+        assert not stats.PRESS_indVar.flags.writeable
+        assert np.allclose(stats.MSE_indVar, stats.PRESS_indVar / n, rtol=rtol, atol=atol)
+        assert np.allclose(stats.PRESS, np.sum(stats.PRESS_indVar, axis=1), rtol=rtol, atol=atol)
+        assert np.allclose(stats.explVar, np.diff(stats.cumExplVar), rtol=rtol, atol=atol)
+    assert pls2cached.Y_PRESSE().base is pls2cached.calStatsY.arr_total
+    assert np.array_equal(pls2cached.Y_predCal()[2], pls2cached.calFitsY.arrPred[1])
+
+
+def test_freeze(pls2cached, cfldat):
+    """
+    Check that the frozen predictor gives the predictions and coefficients
+    of the model, and cannot be changed.
+    """
+    predictor = pls2cached.freeze()
+    for numComp in range(1, pls2cached.numPC + 1):
+        assert np.allclose(predictor.Y_predict(cfldat, numComp), pls2cached.Y_predict(cfldat, numComp), rtol=rtol, atol=atol)
+        assert np.allclose(predictor.regressionCoefficients(numComp), pls2cached.regressionCoefficients(numComp), rtol=rtol, atol=atol)
+    assert np.allclose(predictor.Y_predict(cfldat[:2], 0), pls2cached.Y_means(), rtol=rtol, atol=atol)
+    with pytest.raises(AttributeError):
+        predictor.Ymeans = None
+    with pytest.raises(ValueError):
+        predictor.coefficients[1, 0, 0] = 0.0
+
+
 @pytest.fixture(scope="module")
 def pls2cached(cfldat, csedat):
     return PLS2(arrX=cfldat, arrY=csedat, cvType=["loo"])